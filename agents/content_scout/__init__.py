@@ -1,9 +1,10 @@
 # Content Scout Agent module
 from .scout import (
     content_scout_agent,
-    content_scout_adk_agent,
     build_content_scout_adk_agent,
     find_learning_resources,
+    iter_content_scout,
+    search_resources,
 )
 
 __all__ = [
@@ -11,4 +12,15 @@ __all__ = [
     "content_scout_adk_agent",
     "build_content_scout_adk_agent",
     "find_learning_resources",
+    "iter_content_scout",
+    "search_resources",
 ]
+
+
+def __getattr__(name):
+    # Resolved lazily so importing the package doesn't import google-adk.
+    if name == "content_scout_adk_agent":
+        from . import scout
+
+        return scout.content_scout_adk_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,272 @@
+"""Near-duplicate detection for fetched pages (64-bit SimHash)."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.config import Config
+from core.metrics import SCOUT_DUPLICATES
+
+from .schemas import Resource
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+SHINGLE_WORDS = 3
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _rotl(x: np.ndarray, n: int) -> np.ndarray:
+    return (x << np.uint64(n)) | (x >> np.uint64(64 - n))
+
+
+def simhash(text: str, min_words: Optional[int] = None) -> Optional[int]:
+    """
+    64-bit SimHash of ``text`` over 3-word shingles, or None when the text
+    has fewer than ``min_words`` words (default ``Config.DEDUP_MIN_WORDS``)
+    and the signature would be noise.
+
+    Words are hashed once each (blake2b, so signatures are stable across
+    processes and can be stored); shingle hashing and the per-bit vote run
+    as array operations.
+    """
+    min_words = Config.DEDUP_MIN_WORDS if min_words is None else min_words
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < max(min_words, SHINGLE_WORDS):
+        return None
+
+    vocab = {w: _word_hash(w) for w in set(words)}
+    h = np.fromiter((vocab[w] for w in words), dtype=np.uint64, count=len(words))
+    shingles = h[: len(h) - 2] ^ _rotl(h[1 : len(h) - 1], 21) ^ _rotl(h[2:], 42)
+    shingles = shingles * _MIX
+    shingles ^= shingles >> np.uint64(29)
+
+    # (n, 64) matrix of bits, bit k in column k.
+    bits = np.unpackbits(shingles.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(np.packbits(votes, bitorder="little").view("<u8")[0])
+
+
+def hamming_matrix(signatures: Sequence[int]) -> np.ndarray:
+    """Pairwise Hamming distances between 64-bit signatures."""
+    sigs = np.array(signatures, dtype=np.uint64)
+    xor = (sigs[:, None] ^ sigs[None, :]).astype("<u8")
+    bits = np.unpackbits(xor.view(np.uint8).reshape(len(sigs), len(sigs), 8), axis=-1)
+    return bits.sum(axis=-1, dtype=np.int64)
+
+
+def max_distance(similarity: Optional[float] = None) -> int:
+    """Largest Hamming distance that still counts as a near-duplicate."""
+    similarity = Config.DEDUP_SIMILARITY if similarity is None else similarity
+    return int((1.0 - similarity) * 64)
+
+
+def group_near_duplicates(
+    signatures: Sequence[Optional[int]],
+    similarity: Optional[float] = None,
+) -> List[List[int]]:
+    """
+    Group indices whose signatures are within ``similarity`` (default
+    ``Config.DEDUP_SIMILARITY``, as the fraction of equal bits).
+
+    Each group starts with its representative, the lowest index (best search
+    rank); later items join the first representative they are close to, so
+    groups never chain. Items without a signature are singletons.
+    """
+    known = [i for i, s in enumerate(signatures) if s is not None]
+    groups: Dict[int, List[int]] = {i: [i] for i, s in enumerate(signatures) if s is None}
+    if known:
+        close = hamming_matrix([signatures[i] for i in known]) <= max_distance(similarity)
+        reps: List[int] = []
+        for col, i in enumerate(known):
+            rep = next((r for r in reps if close[r, col]), None)
+            if rep is None:
+                reps.append(col)
+                groups[i] = [i]
+            else:
+                groups[known[rep]].append(i)
+    return [groups[i] for i in sorted(groups)]
+
+
+def _to_signed(sig: int) -> int:
+    return sig - (1 << 64) if sig >= 1 << 63 else sig
+
+
+class SignatureIndex:
+    """
+    Disk-backed ``url -> simhash`` map, so a page seen in an earlier request
+    can be matched against this request's results before it is fetched.
+    Entries older than ``max_age`` seconds are ignored.
+    """
+
+    def __init__(self, path: str, max_age: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " url TEXT PRIMARY KEY,"
+            " signature INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, int]:
+        urls = list(dict.fromkeys(urls))
+        cutoff = time.time() - self.max_age
+        found: Dict[str, int] = {}
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                part = urls[start : start + 500]
+                rows = self._conn.execute(
+                    "SELECT url, signature FROM signatures"
+                    f" WHERE updated_at >= ? AND url IN ({','.join('?' * len(part))})",
+                    (cutoff, *part),
+                ).fetchall()
+                found.update((url, sig & ((1 << 64) - 1)) for url, sig in rows)
+        return found
+
+    def put_many(self, signatures: Dict[str, int]) -> None:
+        if not signatures:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signatures (url, signature, updated_at) VALUES (?, ?, ?)",
+                [(url, _to_signed(sig), now) for url, sig in signatures.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_SIGNATURE_INDEX: Optional[SignatureIndex] = None
+_SIGNATURE_INDEX_LOCK = threading.Lock()
+
+
+def get_signature_index() -> Optional[SignatureIndex]:
+    """
+    Return the process-wide signature index at ``Config.DEDUP_INDEX_PATH``,
+    or None when no path is configured.
+    """
+    global _SIGNATURE_INDEX
+    if _SIGNATURE_INDEX is None and Config.DEDUP_INDEX_PATH:
+        with _SIGNATURE_INDEX_LOCK:
+            if _SIGNATURE_INDEX is None:
+                _SIGNATURE_INDEX = SignatureIndex(
+                    Config.DEDUP_INDEX_PATH, max_age=Config.DEDUP_INDEX_MAX_AGE
+                )
+    return _SIGNATURE_INDEX
+
+
+def set_signature_index(index: Optional[SignatureIndex]) -> None:
+    """Swap or (with None) reset the process-wide index, e.g. for tests."""
+    global _SIGNATURE_INDEX
+    with _SIGNATURE_INDEX_LOCK:
+        _SIGNATURE_INDEX = index
+
+
+def copy_enrichment(r: Resource, rep: Resource, with_text: bool = False) -> Resource:
+    """
+    Give ``r`` the summary of its near-duplicate ``rep`` (and, for pages that
+    were never fetched, its text and language).
+    """
+    if with_text:
+        r.raw_text = rep.raw_text
+        r.language = rep.language
+        if not r.title:
+            r.title = rep.title
+    r.short_summary = rep.short_summary
+    r.estimated_level = rep.estimated_level
+    r.content_type = rep.content_type
+    r.duplicate_of = rep.url
+    SCOUT_DUPLICATES.inc(source="index" if with_text else "content")
+    return r
+
+
+class DuplicateTracker:
+    """
+    Near-duplicate bookkeeping for one ``iter_enriched`` run.
+
+    ``followers`` are resources the persistent index already knows to be
+    near-duplicates of a better-ranked result in the same list; they wait for
+    that result instead of being fetched. Pages whose fetched text turns out
+    to match one already being summarized ``claim`` that representative and
+    wait for its summary. Every resource's ``Future`` must be ``resolve``d,
+    with None when it produced nothing, so waiters fall back to doing the
+    work themselves.
+    """
+
+    def __init__(
+        self,
+        resources: List[Resource],
+        index: Optional[SignatureIndex] = None,
+        similarity: Optional[float] = None,
+    ):
+        self.resources = resources
+        self.index = index
+        self.limit = max_distance(similarity)
+        self._futures = [Future() for _ in resources]
+        self._claimed: List[int] = []
+        self.signatures: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        self.followers: Dict[int, int] = {}
+        if index is not None:
+            known = index.get_many(r.url for r in resources)
+            at = [i for i, r in enumerate(resources) if r.url in known]
+            for group in group_near_duplicates([known[resources[i].url] for i in at], similarity):
+                for member in group[1:]:
+                    self.followers[at[member]] = at[group[0]]
+
+    def order(self) -> List[int]:
+        """Run order: representatives first, so a follower never waits on unstarted work."""
+        return [i for i in range(len(self.resources)) if i not in self.followers] + sorted(
+            self.followers
+        )
+
+    def signature(self, i: int) -> Optional[int]:
+        """Signature of resource ``i``'s fetched text, remembered in the index."""
+        r = self.resources[i]
+        sig = simhash(r.raw_text or "")
+        if sig is not None:
+            self.signatures[i] = sig
+            if self.index is not None:
+                self.index.put_many({r.url: sig})
+        return sig
+
+    def claim(self, i: int, sig: Optional[int]) -> Optional[int]:
+        """
+        Index of an earlier claimant within the threshold of ``sig``, or None
+        after registering ``i`` as a representative itself.
+        """
+        with self._lock:
+            if sig is not None:
+                for j in self._claimed:
+                    if bin(self.signatures[j] ^ sig).count("1") <= self.limit:
+                        return j
+                self._claimed.append(i)
+            return None
+
+    def wait(self, i: int, timeout: Optional[float] = None) -> Optional[Resource]:
+        """Resource ``i`` once it is done, or None if it failed or ``timeout`` passed."""
+        try:
+            return self._futures[i].result(timeout=timeout)
+        except Exception:
+            return None
+
+    def resolve(self, i: int, result: Optional[Resource]) -> None:
+        if not self._futures[i].done():
+            self._futures[i].set_result(result)
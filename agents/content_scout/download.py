@@ -0,0 +1,159 @@
+"""Bounded, sniffed page downloads for ``fetch_and_clean``."""
+
+import codecs
+import re
+from typing import Optional
+
+from core.config import Config
+
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 1024
+
+# Types we hand to the HTML extractor; an empty Content-Type is left to sniffing.
+TEXT_TYPES = (
+    "text/html",
+    "application/xhtml+xml",
+    "text/xml",
+    "application/xml",
+    "text/plain",
+)
+
+_MAGIC = (
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "zip"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x1f\x8b", "gzip"),
+    (b"OggS", "ogg"),
+    (b"ID3", "mp3"),
+    (b"\x1aE\xdf\xa3", "webm"),
+    (b"Rar!", "rar"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+    (b"\xd0\xcf\x11\xe0", "ms-office"),
+    (b"wOFF", "woff"),
+    (b"wOF2", "woff2"),
+    (b"\x7fELF", "elf"),
+    (b"MZ", "exe"),
+)
+
+_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:\-]+)""", re.I)
+
+
+class SkippedPage(Exception):
+    """
+    The response is not something we can extract text from. ``kind`` is a
+    short label for metrics ("content_type" or "binary").
+    """
+
+    def __init__(self, kind: str, reason: str):
+        super().__init__(reason)
+        self.kind = kind
+
+
+class Page:
+    def __init__(self, body: bytes, text: str, encoding: str, truncated: bool):
+        self.body = body
+        self.text = text
+        self.encoding = encoding
+        self.truncated = truncated
+
+
+def sniff_binary(head: bytes) -> Optional[str]:
+    """Name of the binary format ``head`` starts with, or None for text."""
+    for magic, kind in _MAGIC:
+        if head.startswith(magic):
+            return kind
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"RIFF" and head[8:12] in (b"WEBP", b"AVI ", b"WAVE"):
+        return head[8:12].strip().decode("ascii").lower()
+    if b"\x00" in head and not head.startswith(_UTF16_BOMS):
+        return "binary"
+    return None
+
+
+def _valid_codec(name) -> Optional[str]:
+    if isinstance(name, bytes):
+        name = name.decode("ascii", "ignore")
+    try:
+        return codecs.lookup(name.strip()).name if name else None
+    except LookupError:
+        return None
+
+
+def resolve_charset(content_type: str, head: bytes) -> str:
+    """
+    Charset for the body: a byte-order mark wins, then the Content-Type
+    ``charset`` parameter, then ``<meta charset>`` in the first bytes,
+    then UTF-8.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith(_UTF16_BOMS):
+        return "utf-16"
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            codec = _valid_codec(value.strip().strip("\"'"))
+            if codec:
+                return codec
+    match = _META_CHARSET_RE.search(head[:4096])
+    if match:
+        codec = _valid_codec(match.group(1))
+        if codec:
+            return codec
+    return "utf-8"
+
+
+def read_page(resp, max_bytes: Optional[int] = None) -> Page:
+    """
+    Stream a ``stream=True`` response into a ``Page``.
+
+    Non-text Content-Types are refused before any body is read, and binary
+    payloads are recognized from their first bytes; both raise
+    ``SkippedPage``. At most ``max_bytes`` (default ``Config.FETCH_MAX_BYTES``)
+    are read, the rest of the body is never downloaded, and text is decoded
+    chunk by chunk as it arrives.
+    """
+    limit = max_bytes or Config.FETCH_MAX_BYTES
+    content_type = resp.headers.get("Content-Type") or ""
+    mime = content_type.split(";")[0].strip().lower()
+    if mime and mime not in TEXT_TYPES:
+        raise SkippedPage("content_type", f"unsupported content type {mime}")
+
+    chunks = resp.iter_content(CHUNK_SIZE)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_BYTES:
+            break
+    kind = sniff_binary(head[:SNIFF_BYTES])
+    if kind is not None:
+        raise SkippedPage("binary", f"binary body ({kind})")
+
+    encoding = resolve_charset(content_type, head)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    body, text = [], []
+    size = 0
+    truncated = False
+
+    def _take(chunk: bytes) -> bool:
+        nonlocal size, truncated
+        if size + len(chunk) > limit:
+            chunk = chunk[: limit - size]
+            truncated = True
+        body.append(chunk)
+        text.append(decoder.decode(chunk))
+        size += len(chunk)
+        return not truncated
+
+    if _take(head):
+        for chunk in chunks:
+            if not _take(chunk):
+                break
+    text.append(decoder.decode(b"", final=True))
+    return Page(b"".join(body), "".join(text), encoding, truncated)
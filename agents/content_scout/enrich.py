@@ -0,0 +1,384 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.ratelimit import ENRICH, current_priority, priority_scope
+from core.resilience import deadline_scope, time_left
+
+from .schemas import Resource
+
+if TYPE_CHECKING:
+    from .dedup import DuplicateTracker
+
+logger = logging.getLogger(__name__)
+
+FetchFn = Callable[[str], dict]
+FetchVideoFn = Callable[[str, Optional[List[str]]], dict]
+SummarizeFn = Callable[[str, str, str, str], Tuple[str, str, str]]
+BatchSummarizeFn = Callable[[List[str], str, str, str], List[Tuple[str, str, str]]]
+
+
+def is_youtube_url(url: str) -> bool:
+    return "youtube.com" in url or "youtu.be" in url
+
+
+def fetch_resource(
+    r: Resource,
+    language: str,
+    fetch: FetchFn,
+    fetch_video: FetchVideoFn,
+) -> Optional[Resource]:
+    """
+    Fetch page text (or transcript) for one resource and store it in place.
+
+    Returns the resource, or None if nothing usable could be fetched.
+    """
+    page = (
+        fetch_video(r.url, [language, "en"])
+        if r.type == "video" or is_youtube_url(r.url)
+        else fetch(r.url)
+    )
+    if not page["ok"] or not page["text"]:
+        return None
+
+    # fill in any missing title
+    if not r.title:
+        r.title = page["title"] or r.title
+
+    r.raw_text = page["text"]
+    r.language = page["language"]
+    return r
+
+
+def needs_summary(r: Resource) -> bool:
+    # only summarize English pages in v1
+    return not (r.language and not r.language.startswith("en"))
+
+
+def apply_summary(r: Resource, summary: Tuple[str, str, str]) -> Resource:
+    r.short_summary, r.estimated_level, r.content_type = summary
+    return r
+
+
+def enrich_resource(
+    r: Resource,
+    topic: str,
+    language: str,
+    level: str,
+    fetch: FetchFn,
+    fetch_video: FetchVideoFn,
+    summarize: SummarizeFn,
+) -> Optional[Resource]:
+    """
+    Fetch page text (or transcript) for one resource and summarize it in place.
+
+    Returns the resource, or None if nothing usable could be fetched.
+    """
+    if fetch_resource(r, language, fetch, fetch_video) is None:
+        return None
+    if not needs_summary(r):
+        return r
+
+    return apply_summary(
+        r,
+        summarize(
+            text=r.raw_text,
+            topic=topic,
+            target_language=language,
+            level_hint=level,
+        ),
+    )
+
+
+def enrich_deduplicated(
+    i: int,
+    tracker: "DuplicateTracker",
+    topic: str,
+    language: str,
+    level: str,
+    fetch: FetchFn,
+    fetch_video: FetchVideoFn,
+    summarize: SummarizeFn,
+) -> Optional[Resource]:
+    """
+    ``enrich_resource`` for resource ``i`` of ``tracker``, reusing the work of
+    a near-duplicate when there is one: index followers copy their
+    representative without fetching, and pages whose text matches one that
+    is already being summarized copy that summary. If the representative
+    fails, the resource is processed on its own.
+    """
+    from .dedup import copy_enrichment
+
+    r = tracker.resources[i]
+    result = None
+    try:
+        rep_index = tracker.followers.get(i)
+        if rep_index is not None:
+            rep = tracker.wait(rep_index, timeout=time_left())
+            if rep is not None:
+                result = copy_enrichment(r, rep, with_text=True)
+                return result
+
+        if fetch_resource(r, language, fetch, fetch_video) is None:
+            return None
+        sig = tracker.signature(i)
+        if not needs_summary(r):
+            result = r
+            return result
+
+        rep_index = tracker.claim(i, sig)
+        if rep_index is not None:
+            rep = tracker.wait(rep_index, timeout=time_left())
+            if rep is not None and rep.short_summary is not None:
+                result = copy_enrichment(r, rep)
+                return result
+
+        result = apply_summary(
+            r,
+            summarize(
+                text=r.raw_text,
+                topic=topic,
+                target_language=language,
+                level_hint=level,
+            ),
+        )
+        return result
+    finally:
+        tracker.resolve(i, result)
+
+
+def run_bounded(
+    items: List[Resource],
+    work: Callable[[Resource], Optional[Resource]],
+    max_workers: int = 4,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[int, Resource]]:
+    """
+    Run ``work`` over ``items`` on a bounded thread pool and yield
+    ``(index, result)`` pairs in completion order, skipping None results.
+
+    Items that raise, or that are still running ``timeout`` seconds after a
+    worker picked them up, are dropped. With ``max_workers <= 1`` everything
+    runs inline and no deadline is applied.
+
+    Work runs at ``ENRICH`` priority (or lower, inside a background job), so
+    its provider calls queue behind interactive searches.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        for i, item in enumerate(items):
+            try:
+                with priority_scope(ENRICH):
+                    out = work(item)
+            except Exception:
+                logger.exception("Enrichment failed for %s", item.url)
+                continue
+            if out is not None:
+                yield i, out
+        return
+
+    started: Dict[int, float] = {}
+    priority = max(current_priority(), ENRICH)
+
+    def _run(i: int, item: Resource) -> Optional[Resource]:
+        started[i] = time.monotonic()
+        # Pool threads don't inherit context: propagate the priority and the
+        # per-resource deadline so LLM retries and quota waits don't outlive it.
+        with priority_scope(priority), deadline_scope(timeout):
+            return work(item)
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)),
+        thread_name_prefix="scout-enrich",
+    )
+    try:
+        futures: Dict[Future, int] = {
+            executor.submit(_run, i, item): i for i, item in enumerate(items)
+        }
+        pending = set(futures)
+        while pending:
+            tick = None
+            if timeout is not None:
+                now = time.monotonic()
+                running = [
+                    started[futures[f]] + timeout - now
+                    for f in pending
+                    if futures[f] in started
+                ]
+                tick = max(min(running), 0.0) if running else timeout
+
+            done, pending = wait(pending, timeout=tick, return_when=FIRST_COMPLETED)
+
+            for f in done:
+                i = futures[f]
+                try:
+                    out = f.result()
+                except Exception:
+                    logger.exception("Enrichment failed for %s", items[i].url)
+                    continue
+                if out is not None:
+                    yield i, out
+
+            if timeout is not None:
+                now = time.monotonic()
+                for f in list(pending):
+                    i = futures[f]
+                    if i in started and now - started[i] >= timeout:
+                        logger.warning(
+                            "Enrichment of %s exceeded %.1fs; dropping it",
+                            items[i].url,
+                            timeout,
+                        )
+                        f.cancel()
+                        pending.discard(f)
+    finally:
+        # Don't block on stragglers that blew their deadline.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_enriched(
+    resources: List[Resource],
+    topic: str,
+    language: str,
+    level: str,
+    fetch: FetchFn,
+    fetch_video: FetchVideoFn,
+    summarize: SummarizeFn,
+    max_workers: int = 4,
+    resource_timeout: Optional[float] = None,
+    batch_summarize: Optional[BatchSummarizeFn] = None,
+    dedup: bool = False,
+) -> Iterator[Tuple[int, Resource]]:
+    """
+    Enrich resources on a bounded thread pool and yield ``(index, resource)``
+    pairs as soon as each one finishes (completion order, not rank order).
+
+    Resources that fail, or that are still running ``resource_timeout``
+    seconds after their worker picked them up, are dropped.
+
+    With ``batch_summarize`` the pages are fetched concurrently first and
+    then summarized together, so several resources share one LLM call;
+    ``summarize`` is not used in that mode.
+
+    With ``dedup``, near-duplicate pages (mirrors, syndicated copies) are
+    summarized once and the rest get that summary with ``duplicate_of`` set.
+    Pages the signature index (``Config.DEDUP_INDEX_PATH``) already matches
+    to a better-ranked result are not fetched at all.
+    """
+    tracker = None
+    if dedup and len(resources) > 1:
+        # Imported here so plain searches don't pay for numpy.
+        from .dedup import (
+            DuplicateTracker,
+            copy_enrichment,
+            get_signature_index,
+            group_near_duplicates,
+        )
+
+        tracker = DuplicateTracker(resources, get_signature_index())
+
+    if batch_summarize is None:
+        if tracker is None:
+            yield from run_bounded(
+                resources,
+                lambda r: enrich_resource(r, topic, language, level, fetch, fetch_video, summarize),
+                max_workers=max_workers,
+                timeout=resource_timeout,
+            )
+            return
+
+        order = tracker.order()
+        position = {id(resources[i]): i for i in order}
+        for k, r in run_bounded(
+            [resources[i] for i in order],
+            lambda r: enrich_deduplicated(
+                position[id(r)], tracker, topic, language, level, fetch, fetch_video, summarize
+            ),
+            max_workers=max_workers,
+            timeout=resource_timeout,
+        ):
+            yield order[k], r
+        return
+
+    followers = tracker.followers if tracker is not None else {}
+    fetched: Dict[int, Resource] = {}
+    pending: List[Tuple[int, Resource]] = []
+
+    def _fetch(indices: List[int]) -> Iterator[Tuple[int, Resource]]:
+        for k, r in run_bounded(
+            [resources[i] for i in indices],
+            lambda r: fetch_resource(r, language, fetch, fetch_video),
+            max_workers=max_workers,
+            timeout=resource_timeout,
+        ):
+            i = indices[k]
+            fetched[i] = r
+            if tracker is not None:
+                tracker.signature(i)
+            if needs_summary(r):
+                pending.append((i, r))
+            else:
+                yield i, r
+
+    yield from _fetch([i for i in range(len(resources)) if i not in followers])
+    # Followers whose representative could not be fetched are fetched after all.
+    yield from _fetch([i for i, rep in followers.items() if rep not in fetched])
+
+    # Fetches finish in any order; the best-ranked copy must represent its group.
+    pending.sort(key=lambda item: item[0])
+    groups = [[k] for k in range(len(pending))]
+    if tracker is not None and len(pending) > 1:
+        groups = group_near_duplicates([tracker.signatures.get(i) for i, _ in pending])
+
+    if groups:
+        with priority_scope(ENRICH):
+            summaries = batch_summarize(
+                texts=[pending[group[0]][1].raw_text for group in groups],
+                topic=topic,
+                target_language=language,
+                level_hint=level,
+            )
+        for group, summary in zip(groups, summaries):
+            i, rep = pending[group[0]]
+            yield i, apply_summary(rep, summary)
+            for k in group[1:]:
+                yield pending[k][0], copy_enrichment(pending[k][1], rep)
+
+    for i, rep_index in followers.items():
+        if i not in fetched and rep_index in fetched:
+            yield i, copy_enrichment(resources[i], fetched[rep_index], with_text=True)
+
+
+def enrich_resources(
+    resources: List[Resource],
+    topic: str,
+    language: str,
+    level: str,
+    fetch: FetchFn,
+    fetch_video: FetchVideoFn,
+    summarize: SummarizeFn,
+    max_workers: int = 4,
+    resource_timeout: Optional[float] = None,
+    batch_summarize: Optional[BatchSummarizeFn] = None,
+    dedup: bool = False,
+) -> List[Resource]:
+    """
+    Same as ``iter_enriched`` but waits for everything and keeps the
+    original ranking order.
+    """
+    results = dict(
+        iter_enriched(
+            resources,
+            topic,
+            language,
+            level,
+            fetch,
+            fetch_video,
+            summarize,
+            max_workers=max_workers,
+            resource_timeout=resource_timeout,
+            batch_summarize=batch_summarize,
+            dedup=dedup,
+        )
+    )
+    return [results[i] for i in sorted(results)]
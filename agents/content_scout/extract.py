@@ -0,0 +1,182 @@
+import re
+from typing import Dict, Optional, Tuple, Union
+
+from core.config import Config
+
+# Subtrees that never hold main content.
+_DROP_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "form",
+    "button",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+)
+_BLOCK_TAGS = (
+    "p",
+    "div",
+    "section",
+    "article",
+    "main",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "li",
+    "ul",
+    "ol",
+    "pre",
+    "blockquote",
+    "table",
+    "tr",
+    "td",
+    "th",
+    "br",
+    "dd",
+    "dt",
+    "figcaption",
+)
+_NEGATIVE_RE = re.compile(
+    r"comment|sidebar|footer|navbar|menu|share|social|advert|promo|cookie|banner|related|breadcrumb",
+    re.I,
+)
+# Class/id hints that a container is the content itself (readability's list);
+# they win over _NEGATIVE_RE, e.g. "post-content has-social-share".
+_POSITIVE_RE = re.compile(r"article|body|content|entry|hentry|main|page|post|text|blog|story", re.I)
+_WS_RE = re.compile(r"[ \t\r\f\v\xa0]+")
+MIN_TEXT_CHARS = 200
+# Negative containers are only dropped when at least this linky (or tiny).
+MAX_LINK_DENSITY = 0.5
+# If the chosen node holds less than this share of the body's text, the
+# pick is suspect and the caller falls back to readability.
+MIN_BODY_SHARE = 0.2
+
+
+def _link_density(node) -> float:
+    text_len = len(node.text_content())
+    if not text_len:
+        return 1.0
+    link_len = sum(len(a.text_content()) for a in node.iter("a"))
+    return link_len / text_len
+
+
+def _text_len(node) -> int:
+    return len(_WS_RE.sub(" ", node.text_content()).strip())
+
+
+def _class_weight(node) -> float:
+    attrs = f"{node.get('class', '')} {node.get('id', '')}"
+    if not attrs.strip():
+        return 0.0
+    if _POSITIVE_RE.search(attrs):
+        return 25.0
+    if _NEGATIVE_RE.search(attrs):
+        return -25.0
+    return 0.0
+
+
+def _drop_negative_containers(root) -> None:
+    """
+    Remove share bars, menus, link lists and the like: containers whose
+    class/id looks negative (and not positive) and that are mostly links or
+    hold almost no text. Longer negative blocks (e.g. comment threads) stay
+    and are scored down by ``_class_weight`` instead.
+    """
+    for el in list(root.iter("div", "section", "ul", "span")):
+        if el.getparent() is None or _class_weight(el) >= 0:
+            continue
+        if _link_density(el) > MAX_LINK_DENSITY or _text_len(el) < MIN_TEXT_CHARS:
+            el.drop_tree()
+
+
+def _best_candidate(root):
+    """
+    Prefer an explicit <article>/<main> with enough text; otherwise score
+    paragraph parents readability-style and pick the densest, least linky one.
+    """
+    for tag in ("article", "main"):
+        nodes = [n for n in root.iter(tag) if len(n.text_content().strip()) >= MIN_TEXT_CHARS]
+        if nodes:
+            return max(nodes, key=lambda n: len(n.text_content()))
+
+    scores: Dict[object, float] = {}
+    for p in root.iter("p", "pre", "blockquote", "td"):
+        text = p.text_content().strip()
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = p.getparent()
+        if parent is None:
+            continue
+        if parent not in scores:
+            scores[parent] = _class_weight(parent)
+        scores[parent] += score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            if grandparent not in scores:
+                scores[grandparent] = _class_weight(grandparent)
+            scores[grandparent] += score / 2
+
+    if not scores:
+        return None
+    return max(scores, key=lambda n: scores[n] * (1 - _link_density(n)))
+
+
+def _node_text(node) -> str:
+    for el in node.iter(*_BLOCK_TAGS):
+        el.tail = "\n" + (el.tail or "")
+        if el.tag != "br":
+            el.text = "\n" + (el.text or "")
+    lines = (_WS_RE.sub(" ", line).strip() for line in "".join(node.itertext()).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_main_text(
+    html: Union[str, bytes], max_bytes: Optional[int] = None
+) -> Tuple[str, str]:
+    """
+    Single-parse main-content extraction straight from the lxml tree.
+
+    Only the first ``max_bytes`` (default ``Config.EXTRACT_MAX_BYTES``) of the
+    document are parsed. Returns ``(title, text)``; ``text`` is empty when no
+    block of at least ``MIN_TEXT_CHARS`` characters could be found, or when
+    the chosen block holds less than ``MIN_BODY_SHARE`` of the body text, so
+    callers can fall back to readability.
+    """
+    from lxml import etree, html as lxml_html
+
+    limit = max_bytes or Config.EXTRACT_MAX_BYTES
+    # Already-decoded text is re-encoded as UTF-8; raw bytes are left for
+    # lxml to sniff (<meta charset>).
+    encoding = None
+    if isinstance(html, str):
+        html = html.encode("utf-8", errors="replace")
+        encoding = "utf-8"
+    html = html[:limit].replace(b"\x00", b"")
+    if not html.strip():
+        return "", ""
+
+    parser = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, encoding=encoding)
+    root = lxml_html.document_fromstring(html, parser=parser)
+
+    title = (root.findtext(".//title") or "").strip()
+
+    etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
+    body_len = _text_len(root)
+    _drop_negative_containers(root)
+
+    candidate = _best_candidate(root)
+    if candidate is None or _text_len(candidate) < MIN_BODY_SHARE * body_len:
+        return title, ""
+    text = _node_text(candidate)
+    if len(text) < MIN_TEXT_CHARS:
+        return title, ""
+    return title, text
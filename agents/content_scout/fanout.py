@@ -0,0 +1,154 @@
+"""Multi-query search fan-out merged with reciprocal-rank fusion."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from core.ratelimit import bind_priority
+
+from .fetch_youtube import _extract_youtube_video_id
+
+logger = logging.getLogger(__name__)
+
+SearchFn = Callable[[str, int], dict]
+
+# Constant from the RRF paper; damps the weight of the very top ranks.
+RRF_K = 60
+
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "si", "feature"}
+TRACKING_PREFIXES = ("utm_", "_hs", "pk_", "vero_")
+
+LEVEL_SYNONYMS: Dict[str, List[str]] = {
+    "school": ["{topic} for school students", "{topic} class notes"],
+    "beginner": ["introduction to {topic}", "{topic} basics"],
+    "college": ["{topic} lecture notes", "{topic} university course"],
+    "advanced": ["advanced {topic}", "{topic} in depth"],
+}
+
+LANGUAGE_NAMES = {
+    "hi": "Hindi",
+    "bn": "Bengali",
+    "ta": "Tamil",
+    "te": "Telugu",
+    "mr": "Marathi",
+    "gu": "Gujarati",
+    "kn": "Kannada",
+    "ml": "Malayalam",
+    "pa": "Punjabi",
+    "or": "Odia",
+    "ur": "Urdu",
+    "as": "Assamese",
+    "ne": "Nepali",
+}
+
+
+def base_query(topic: str, level: str) -> str:
+    return f"{topic} tutorial for {level} students"
+
+
+def query_variants(topic: str, level: str, language: str = "en", limit: int = 4) -> List[str]:
+    """
+    Up to ``limit`` distinct phrasings, the classic single query first:
+    level synonyms, "examples", "explained" and, for non-English learners,
+    the topic in their language.
+    """
+    candidates = [base_query(topic, level)]
+    name = LANGUAGE_NAMES.get(language.strip().lower())
+    if name:
+        candidates.append(f"{topic} in {name}")
+    synonyms = [s.format(topic=topic) for s in LEVEL_SYNONYMS.get(level.strip().lower(), [])]
+    candidates += synonyms[:1] + [f"{topic} examples", f"{topic} explained"] + synonyms[1:]
+    seen = set()
+    variants = []
+    for q in candidates:
+        if q.lower() not in seen:
+            seen.add(q.lower())
+            variants.append(q)
+    return variants[: max(limit, 1)]
+
+
+def _is_tracking(param: str) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Key under which different spellings of the same page collide: YouTube
+    links reduce to their video id; other URLs drop the scheme, ``www.``,
+    default ports, fragments, tracking parameters and trailing slashes, and
+    sort what is left of the query string.
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.endswith("youtube.com") or host == "youtu.be":
+        video_id = _extract_youtube_video_id(url)
+        if video_id:
+            return f"youtube:{video_id}"
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/") or ""
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not _is_tracking(k))
+    return f"//{host}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def fuse_results(responses: List[dict], num_results: int, k: int = RRF_K) -> dict:
+    """
+    Merge Serper responses into one of the same shape. Organic results and
+    videos are fused separately: each distinct page (by ``canonical_url``)
+    scores ``sum(1 / (k + rank))`` over the responses it appears in, and
+    keeps the first copy seen, preferring an https link. Each list is cut to
+    ``num_results``.
+    """
+    merged: Dict[str, dict] = {}
+    for section in ("organic", "videos"):
+        scores: Dict[str, float] = {}
+        items: Dict[str, dict] = {}
+        for data in responses:
+            for rank, item in enumerate(data.get(section, []), start=1):
+                link = item.get("link")
+                if not link:
+                    continue
+                key = canonical_url(link)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+                kept = items.get(key)
+                if kept is None or (not kept["link"].startswith("https:") and link.startswith("https:")):
+                    items[key] = item
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        merged[section] = [items[key] for key in ranked[:num_results]]
+    return merged
+
+
+def fanout_search(
+    topic: str,
+    level: str,
+    language: str,
+    num_results: int,
+    search: SearchFn,
+    queries: int = 4,
+) -> dict:
+    """
+    Send ``queries`` phrasings of the request concurrently and fuse the
+    results. Variants that fail are logged and left out; the error is only
+    raised if every one of them fails.
+    """
+    variants = query_variants(topic, level, language, limit=queries)
+    if len(variants) == 1:
+        return search(variants[0], num_results)
+
+    with ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="scout-search") as pool:
+        # Searches keep the caller's priority for Serper quota.
+        futures = [pool.submit(bind_priority(search), q, num_results) for q in variants]
+        responses, errors = [], []
+        for q, f in zip(variants, futures):
+            try:
+                responses.append(f.result())
+            except Exception as e:
+                logger.warning("Search variant %r failed: %s", q, e)
+                errors.append(e)
+    if not responses:
+        raise errors[0]
+    return fuse_results(responses, num_results)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+from core.config import Config
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class CachedPage:
+    def __init__(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: str,
+        cleaned: dict,
+        fetched_at: float,
+    ):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_hash = body_hash
+        self.cleaned = cleaned
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        return time.time() - self.fetched_at < max_age
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """
+    Disk-backed cache of fetched pages.
+
+    Each row keeps the validators (ETag / Last-Modified), a hash of the raw
+    body and the zlib-compressed ``fetch_and_clean`` output. Entries younger
+    than ``max_age`` seconds are served without touching the network; older
+    ones are revalidated with a conditional GET.
+
+    At most ``max_entries`` pages are kept: every ``prune_every`` writes the
+    least recently fetched or validated ones beyond that are deleted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age: float = 3600,
+        max_entries: Optional[int] = 10000,
+        prune_every: int = 32,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.prune_every = max(prune_every, 1)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if "body" in columns:
+            # Older caches also stored the raw body, which nothing reads.
+            self._conn.execute("DROP TABLE pages")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " body_hash TEXT NOT NULL,"
+            " cleaned BLOB NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_fetched_at ON pages (fetched_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, cleaned, fetched_at"
+                " FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, digest, cleaned, fetched_at = row
+        return CachedPage(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            body_hash=digest,
+            cleaned=json.loads(zlib.decompress(cleaned)),
+            fetched_at=fetched_at,
+        )
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        cleaned: dict,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages"
+                " (url, etag, last_modified, body_hash, cleaned, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    etag,
+                    last_modified,
+                    body_hash(body),
+                    zlib.compress(json.dumps(cleaned).encode("utf-8")),
+                    time.time(),
+                ),
+            )
+            self._writes += 1
+            if self.max_entries and self._writes % self.prune_every == 0:
+                self._conn.execute(
+                    "DELETE FROM pages WHERE url IN ("
+                    " SELECT url FROM pages ORDER BY fetched_at DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def touch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        Mark an entry as freshly validated (e.g. after a 304), keeping any
+        validators the server did not resend.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?,"
+                " etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified)"
+                " WHERE url = ?",
+                (time.time(), etag, last_modified, url),
+            )
+            self._conn.commit()
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_FETCH_CACHE: Optional[FetchCache] = None
+_FETCH_CACHE_LOCK = threading.Lock()
+
+
+def get_fetch_cache() -> Optional[FetchCache]:
+    """
+    Return the process-wide fetch cache at ``Config.FETCH_CACHE_PATH``, or
+    None when no path is configured.
+    """
+    global _FETCH_CACHE
+    if _FETCH_CACHE is None and Config.FETCH_CACHE_PATH:
+        with _FETCH_CACHE_LOCK:
+            if _FETCH_CACHE is None:
+                _FETCH_CACHE = FetchCache(
+                    Config.FETCH_CACHE_PATH,
+                    max_age=Config.FETCH_CACHE_MAX_AGE,
+                    max_entries=Config.FETCH_CACHE_MAX_ENTRIES,
+                )
+    return _FETCH_CACHE
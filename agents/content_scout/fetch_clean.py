@@ -1,73 +1,87 @@
-import requests
+from typing import Optional, Tuple
 
+from core.config import Config
+from core.http_client import get_http_client
+from core.metrics import FETCH_SKIPPED, FETCH_TRUNCATED, host_of, record_bytes, timed
 
-def fetch_and_clean(url: str, timeout: int = 10) -> dict:
-    """
-    Download the webpage and extract the main readable text.
+from .download import SkippedPage, read_page
+from .extract import extract_main_text
+from .fetch_cache import FetchCache, body_hash, get_fetch_cache
+from .langid import detect_language, html_lang
+from .parse_pool import get_parse_pool
 
-    Returns:
-        {
-            "ok": bool,
-            "title": str,
-            "text": str,
-            "language": str | None,
-            "error": str | None
-        }
+
+def _error(error: str) -> dict:
+    return {
+        "ok": False,
+        "title": "",
+        "text": "",
+        "language": None,
+        "error": error,
+    }
+
+
+def _readability_extract(html: str) -> Tuple[str, str]:
+    """
+    Original two-parse path: readability picks the article, BeautifulSoup
+    flattens it to text. Kept as the fallback for pages the lxml engine
+    can't handle.
     """
     try:
         # Imported lazily to avoid hard failures when optional deps are missing.
         from readability import Document
         from bs4 import BeautifulSoup
-        from langdetect import detect
     except ImportError as exc:
         raise ImportError(
             "readability-lxml, beautifulsoup4, and langdetect are required for fetch_and_clean."
         ) from exc
 
-    try:
-        resp = requests.get(url, timeout=timeout)
-        resp.raise_for_status()
-    except Exception as e:
-        return {
-            "ok": False,
-            "title": "",
-            "text": "",
-            "language": None,
-            "error": str(e),
-        }
+    # Use readability to pull out the main article
+    doc = Document(html)
+    title = doc.title() or ""
+
+    simplified_html = doc.summary()
+    soup = BeautifulSoup(simplified_html, "html.parser")
+    text = soup.get_text(separator="\n")
+
+    # basic cleanup
+    lines = [line.strip() for line in text.splitlines()]
+    return title, "\n".join(line for line in lines if line)
 
+
+def clean_html(
+    html: str, engine: Optional[str] = None, content_language: Optional[str] = None
+) -> dict:
+    """
+    Extract the main readable text from an HTML document.
+
+    ``engine`` (default ``Config.EXTRACT_ENGINE``) is ``"lxml"`` for the
+    single-parse extractor in ``extract.py``, falling back to readability when
+    it finds no main content, or ``"readability"`` to always use the old path.
+
+    The language comes from ``<html lang>`` or the ``content_language``
+    header when declared, and from cached, seeded detection otherwise.
+
+    Returns the same structure as ``fetch_and_clean``.
+    """
     # Requests may include control chars; strip null bytes to avoid lxml errors.
-    html = resp.text.replace("\x00", "")
+    html = html.replace("\x00", "")
+    engine = engine or Config.EXTRACT_ENGINE
 
     try:
-        # Use readability to pull out the main article
-        doc = Document(html)
-        title = doc.title() or ""
-
-        simplified_html = doc.summary()
-        soup = BeautifulSoup(simplified_html, "html.parser")
-        text = soup.get_text(separator="\n")
-
-        # basic cleanup
-        lines = [line.strip() for line in text.splitlines()]
-        text = "\n".join(line for line in lines if line)
-
-        # detect language on a chunk (avoid super-long strings)
-        lang = None
-        sample = text[:2000]
-        if sample:
-            try:
-                lang = detect(sample)
-            except Exception:
-                lang = None
+        with timed("parse"):
+            title, text = "", ""
+            if engine == "lxml":
+                title, text = extract_main_text(html)
+            if not text:
+                fallback_title, text = _readability_extract(html)
+                title = title or fallback_title
+
+        lang = detect_language(text, hints=(html_lang(html), content_language))
+    except ImportError:
+        raise
     except Exception as e:
-        return {
-            "ok": False,
-            "title": "",
-            "text": "",
-            "language": None,
-            "error": f"parse_error: {e}",
-        }
+        return _error(f"parse_error: {e}")
 
     return {
         "ok": True,
@@ -76,3 +90,86 @@ def fetch_and_clean(url: str, timeout: int = 10) -> dict:
         "language": lang,
         "error": None,
     }
+
+
+def fetch_and_clean(
+    url: str, timeout: int = 10, cache: Optional[FetchCache] = None
+) -> dict:
+    """
+    Download the webpage and extract the main readable text.
+
+    When a fetch cache is available (``cache`` or the one configured via
+    ``Config.FETCH_CACHE_PATH``), fresh entries are returned without any
+    network access, stale ones are revalidated with ``If-None-Match`` /
+    ``If-Modified-Since``, and an unchanged body skips parsing entirely.
+
+    With ``Config.PARSE_PROCESSES > 0`` the HTML parse and language detection
+    run in a warm worker process pool instead of the calling thread.
+
+    The body is streamed and capped at ``Config.FETCH_MAX_BYTES``. Non-HTML
+    Content-Types and binary bodies (PDF, images, video, ...) are abandoned
+    before being downloaded and come back with ``error`` set to
+    ``"skipped: <reason>"``.
+
+    Returns:
+        {
+            "ok": bool,
+            "title": str,
+            "text": str,
+            "language": str | None,
+            "error": str | None
+        }
+    """
+    cache = cache if cache is not None else get_fetch_cache()
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and cached.is_fresh(cache.max_age):
+        return cached.cleaned
+
+    headers = cached.conditional_headers() if cached is not None else {}
+    host = host_of(url)
+    try:
+        with timed("fetch", host=host), get_http_client().stream(
+            "GET", url, timeout=timeout, headers=headers
+        ) as resp:
+            if resp.status_code == 304 and cached is not None:
+                cache.touch(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                return cached.cleaned
+            resp.raise_for_status()
+            page = read_page(resp)
+        record_bytes("fetch", len(page.body), host=host)
+    except SkippedPage as e:
+        FETCH_SKIPPED.inc(reason=e.kind, host=host)
+        return _error(f"skipped: {e}")
+    except Exception as e:
+        return _error(str(e))
+    if page.truncated:
+        FETCH_TRUNCATED.inc(host=host)
+
+    if cached is not None and cached.body_hash == body_hash(page.body):
+        result = cached.cleaned
+    else:
+        pool = get_parse_pool()
+        content_language = resp.headers.get("Content-Language")
+        if pool is None:
+            result = clean_html(page.text, content_language=content_language)
+        else:
+            try:
+                with timed("parse_offload", host=host):
+                    result = pool.parse(
+                        page.body,
+                        page.encoding,
+                        content_language=content_language,
+                        timeout=timeout,
+                    )
+            except Exception as e:
+                result = _error(f"parse_error: {e}")
+
+    if cache is not None and result["ok"]:
+        cache.put(
+            url,
+            page.body,
+            result,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+    return result
@@ -2,6 +2,10 @@ import re
 from typing import List, Optional
 from urllib.parse import parse_qs, urlparse
 
+from core.metrics import record_bytes, timed
+
+from .langid import normalize_language
+
 
 def _extract_youtube_video_id(url: str) -> Optional[str]:
     """
@@ -52,7 +56,8 @@ def fetch_youtube_transcript(
     try: 
         languages = languages or ["en"]
         api = YouTubeTranscriptApi()
-        transcript = api.fetch(video_id, languages=languages)
+        with timed("transcript", host="youtube.com"):
+            transcript = api.fetch(video_id, languages=languages)
     except:
         return {
             "ok": False,
@@ -71,7 +76,10 @@ def fetch_youtube_transcript(
             snippets.append(text.strip())
 
     text_body = "\n".join(s for s in snippets if s)
-    lang = getattr(transcript, "language_code", None) or getattr(transcript, "language", None)
+    record_bytes("transcript", len(text_body.encode("utf-8")), host="youtube.com")
+    lang = normalize_language(getattr(transcript, "language_code", None)) or getattr(
+        transcript, "language", None
+    )
 
     return {
         "ok": True,
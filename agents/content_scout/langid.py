@@ -0,0 +1,97 @@
+import hashlib
+import re
+import threading
+from typing import Iterable, Optional
+
+from core.cache import LRUCache
+from core.config import Config
+from core.metrics import timed
+
+SAMPLE_CHARS = 2000
+
+_TAG_RE = re.compile(r"^([A-Za-z]{2,3})(?:[-_][A-Za-z0-9]+)*$")
+_HTML_LANG_RE = re.compile(r"<html\b[^>]*?\blang\s*=\s*[\"']?([A-Za-z]{2,3}(?:[-_][A-Za-z0-9]+)*)", re.I)
+
+_CACHE = LRUCache(max_entries=Config.LANGID_CACHE_SIZE)
+_FACTORY_LOCK = threading.Lock()
+_FACTORY = None
+
+
+def normalize_language(tag: Optional[str]) -> Optional[str]:
+    """
+    Reduce a BCP 47 tag / header value ("en-US", "hi_IN", "en, fr") to its
+    lowercase primary subtag, or None if it doesn't look like a language.
+    """
+    if not tag:
+        return None
+    first = tag.split(",")[0].split(";")[0].strip()
+    match = _TAG_RE.match(first)
+    if not match:
+        return None
+    primary = match.group(1).lower()
+    return None if primary in ("und", "mul", "zxx") else primary
+
+
+def html_lang(html: str) -> Optional[str]:
+    """Cheap lookup of ``<html lang="...">`` in the document head."""
+    match = _HTML_LANG_RE.search(html[:4096])
+    return match.group(1) if match else None
+
+
+def load_profiles():
+    """
+    Load langdetect's language profiles exactly once into a private, seeded
+    factory. langdetect's own lazy global loader isn't thread-safe:
+    concurrent first calls can see a half-loaded factory and return wrong
+    languages.
+    """
+    global _FACTORY
+    if _FACTORY is None:
+        with _FACTORY_LOCK:
+            if _FACTORY is None:
+                from langdetect.detector_factory import PROFILES_DIRECTORY, DetectorFactory
+
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                # Fixed seed: the same text always gets the same answer.
+                factory.set_seed(0)
+                _FACTORY = factory
+    return _FACTORY
+
+
+def _detect(sample: str) -> Optional[str]:
+    detector = load_profiles().create()
+    detector.append(sample)
+    return normalize_language(detector.detect())
+
+
+def detect_language(text: str, hints: Iterable[Optional[str]] = ()) -> Optional[str]:
+    """
+    Identify the language of ``text`` as an ISO 639 code.
+
+    Declared languages in ``hints`` (``<html lang>``, ``Content-Language``,
+    YouTube ``language_code``) are trusted when present. Otherwise a seeded
+    langdetect run over the first ``SAMPLE_CHARS`` characters is used,
+    memoized by content hash.
+    """
+    for hint in hints:
+        lang = normalize_language(hint)
+        if lang:
+            return lang
+
+    sample = text[:SAMPLE_CHARS]
+    if not sample.strip():
+        return None
+
+    key = hashlib.sha1(sample.encode("utf-8", errors="replace")).hexdigest()
+    lang = _CACHE.get(key)
+    if lang is not None:
+        return lang or None
+
+    try:
+        with timed("language_detect"):
+            lang = _detect(sample)
+    except Exception:
+        lang = None
+    _CACHE.set(key, lang or "")
+    return lang
@@ -0,0 +1,93 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from core.config import Config
+
+
+def _init_worker() -> None:
+    """
+    Runs once per worker process: import the parsing stack and load the
+    langdetect language profiles up front so no request pays for it.
+    """
+    from . import extract  # noqa: F401  (imports lxml)
+    from .langid import load_profiles
+
+    load_profiles()
+
+
+def decode_body(body: bytes, encoding: Optional[str]) -> str:
+    return body.decode(encoding or "utf-8", errors="replace")
+
+
+def _parse_in_worker(
+    body: bytes, encoding: Optional[str], content_language: Optional[str]
+) -> dict:
+    from .fetch_clean import clean_html
+
+    return clean_html(decode_body(body, encoding), content_language=content_language)
+
+
+def _noop() -> None:
+    return None
+
+
+class ParsePool:
+    """
+    Warm process pool for the CPU-bound part of ``fetch_and_clean`` (HTML
+    extraction + language detection), so it runs outside the GIL of the
+    threads doing network I/O.
+
+    Raw response bytes go in; the compact ``{"ok", "title", "text",
+    "language", "error"}`` dict comes back.
+    """
+
+    def __init__(self, processes: int = 2):
+        methods = multiprocessing.get_all_start_methods()
+        # Workers must not inherit the parent's threads/locks via fork.
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=context, initializer=_init_worker
+        )
+
+    def warm(self) -> None:
+        """Start every worker now instead of on the first parse."""
+        for f in [self._executor.submit(_noop) for _ in range(self.processes)]:
+            f.result()
+
+    def parse(
+        self,
+        body: bytes,
+        encoding: Optional[str] = None,
+        content_language: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        return self._executor.submit(
+            _parse_in_worker, body, encoding, content_language
+        ).result(timeout=timeout)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_PARSE_POOL: Optional[ParsePool] = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """
+    Return the process-wide parse pool when ``Config.PARSE_PROCESSES > 0``.
+    """
+    global _PARSE_POOL
+    if _PARSE_POOL is None and Config.PARSE_PROCESSES > 0:
+        with _PARSE_POOL_LOCK:
+            if _PARSE_POOL is None:
+                _PARSE_POOL = ParsePool(Config.PARSE_PROCESSES)
+                _PARSE_POOL.warm()
+                atexit.register(_PARSE_POOL.shutdown)
+    return _PARSE_POOL
@@ -0,0 +1,168 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from core.cache import LRUCache, SingleFlight, SQLiteCache, TieredCache
+from core.config import Config
+from core.llm import STUB_SUMMARY
+
+from .enrich import needs_summary
+from .schemas import Resource
+
+_MAX_TRACKED_KEYS = 1000
+
+
+def query_key(
+    topic: str,
+    language: str,
+    level: str,
+    num_results: int,
+    include_videos: bool,
+    enrich: bool,
+    enrich_top_k: int = 0,
+    search_queries: int = 1,
+) -> str:
+    """
+    Normalized cache key for one scout request, e.g.
+    ``"trigonometry basics|en|beginner|8|videos|enrich"`` (``enrich-top3``
+    when only the top three results are enriched, plus ``|queries4`` for a
+    four-query fan-out search).
+    """
+    normalized_topic = re.sub(r"\s+", " ", topic.strip().lower())
+    key = "|".join(
+        [
+            normalized_topic,
+            language.strip().lower(),
+            level.strip().lower(),
+            str(num_results),
+            "videos" if include_videos else "no-videos",
+            (f"enrich-top{enrich_top_k}" if enrich_top_k else "enrich") if enrich else "search",
+        ]
+    )
+    return f"{key}|queries{search_queries}" if search_queries > 1 else key
+
+
+def is_degraded(resources: List[Resource], enriched: int = 0) -> bool:
+    """
+    Whether a result should not be kept for the full TTL: it is empty, or a
+    summary is the LLM stub, or one of the first ``enriched`` resources that
+    should have been summarized has no summary (fetch or summarize failed).
+    Pages skipped on purpose (``needs_summary`` is False) don't count.
+    """
+    if not resources:
+        return True
+    if any(r.short_summary == STUB_SUMMARY for r in resources):
+        return True
+    return any(not r.short_summary and needs_summary(r) for r in resources[:enriched])
+
+
+class QueryCache:
+    """
+    TTL cache of ``content_scout_agent`` results with single-flight
+    coalescing: identical requests arriving while one is being computed wait
+    for it instead of repeating the search/fetch/summarize work.
+
+    Results are stored as ``Resource.model_dump()`` dicts, so every caller
+    gets its own fresh ``Resource`` objects. Degraded results (see
+    ``is_degraded``) are kept only for ``negative_ttl`` seconds, or not at
+    all when it is 0, so a transient outage is not served for hours.
+    """
+
+    def __init__(
+        self, cache: TieredCache, ttl: Optional[float] = None, negative_ttl: float = 0.0
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        self._counters: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    def _count(self, key: str, name: str) -> None:
+        with self._lock:
+            counters = self._counters.get(key)
+            if counters is None:
+                counters = {"hits": 0, "misses": 0, "coalesced": 0}
+                self._counters[key] = counters
+                while len(self._counters) > _MAX_TRACKED_KEYS:
+                    self._counters.popitem(last=False)
+            counters[name] += 1
+            self._counters.move_to_end(key)
+
+    def _store(self, key: str, resources: List[Resource], enriched: int) -> List[dict]:
+        dumped = [r.model_dump() for r in resources]
+        if not is_degraded(resources, enriched):
+            self.cache.set("scout:" + key, dumped, self.ttl)
+        elif self.negative_ttl > 0:
+            self.cache.set("scout:" + key, dumped, self.negative_ttl)
+        return dumped
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], List[Resource]], enriched: int = 0
+    ) -> List[Resource]:
+        """
+        Cached result for ``key``, or ``compute()``'s. ``enriched`` is how many
+        leading resources were meant to get a summary.
+        """
+        cached = self.cache.get("scout:" + key)
+        if cached is not None:
+            self._count(key, "hits")
+            return [Resource(**d) for d in cached]
+
+        def _compute() -> List[dict]:
+            return self._store(key, compute(), enriched)
+
+        dumped, shared = self._flights.do(key, _compute)
+        self._count(key, "coalesced" if shared else "misses")
+        return [Resource(**d) for d in dumped]
+
+    def put(self, key: str, resources: List[Resource], enriched: int = 0) -> None:
+        self._store(key, resources, enriched)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            keys = {k: dict(v) for k, v in self._counters.items()}
+        totals = {"hits": 0, "misses": 0, "coalesced": 0}
+        for counters in keys.values():
+            for name, value in counters.items():
+                totals[name] += value
+        return {"totals": totals, "keys": keys, "tiers": self.cache.stats()}
+
+
+_QUERY_CACHE: Optional[QueryCache] = None
+_QUERY_CACHE_LOCK = threading.Lock()
+
+
+def get_query_cache() -> Optional[QueryCache]:
+    """
+    Return the process-wide query cache configured via
+    ``Config.QUERY_CACHE_*``, or None when it is disabled.
+    """
+    global _QUERY_CACHE
+    if _QUERY_CACHE is None and Config.QUERY_CACHE_SIZE > 0:
+        with _QUERY_CACHE_LOCK:
+            if _QUERY_CACHE is None:
+                disk = None
+                if Config.QUERY_CACHE_PATH:
+                    disk = SQLiteCache(Config.QUERY_CACHE_PATH, ttl=Config.QUERY_CACHE_TTL)
+                _QUERY_CACHE = QueryCache(
+                    TieredCache(
+                        LRUCache(max_entries=Config.QUERY_CACHE_SIZE, ttl=Config.QUERY_CACHE_TTL),
+                        disk,
+                    ),
+                    ttl=Config.QUERY_CACHE_TTL,
+                    negative_ttl=Config.QUERY_CACHE_NEGATIVE_TTL,
+                )
+    return _QUERY_CACHE
+
+
+def set_query_cache(cache: Optional[QueryCache]) -> None:
+    global _QUERY_CACHE
+    with _QUERY_CACHE_LOCK:
+        _QUERY_CACHE = cache
+
+
+def query_cache_stats() -> Dict:
+    cache = get_query_cache()
+    return cache.stats() if cache is not None else {}
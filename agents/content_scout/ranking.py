@@ -0,0 +1,183 @@
+"""Cheap pre-ranking of search results before anything is fetched."""
+
+import re
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import numpy as np
+
+from core.config import Config
+
+from .schemas import Resource
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "how",
+    "what", "is", "are", "by", "vs", "about", "from", "your", "my",
+}
+
+# Added to the score of a host or any of its parent domains / suffixes.
+DOMAIN_PRIORS: Dict[str, float] = {
+    "khanacademy.org": 0.4,
+    "wikipedia.org": 0.3,
+    "developer.mozilla.org": 0.3,
+    "docs.python.org": 0.3,
+    "mathsisfun.com": 0.3,
+    "ncert.nic.in": 0.3,
+    "ocw.mit.edu": 0.3,
+    "nptel.ac.in": 0.3,
+    "britannica.com": 0.2,
+    "geeksforgeeks.org": 0.2,
+    "byjus.com": 0.15,
+    "w3schools.com": 0.15,
+    "edu": 0.2,
+    "ac.in": 0.15,
+    "gov": 0.1,
+    "youtube.com": 0.05,
+    "medium.com": -0.05,
+    "reddit.com": -0.1,
+    "quora.com": -0.3,
+    "pinterest.com": -0.5,
+    "scribd.com": -0.3,
+    "coursehero.com": -0.4,
+    "chegg.com": -0.4,
+}
+
+LEVEL_KEYWORDS: Dict[str, Sequence[str]] = {
+    "school": ("school", "class", "grade", "ncert", "cbse", "kids", "children", "worksheet"),
+    "beginner": ("beginner", "beginners", "introduction", "intro", "basics", "basic", "simple", "easy", "started", "fundamentals"),
+    "college": ("college", "university", "lecture", "course", "undergraduate", "semester", "nptel"),
+    "advanced": ("advanced", "proof", "theorem", "rigorous", "graduate", "research", "deep", "derivation"),
+}
+
+# Unicode blocks of the scripts our learners read, for the language hint.
+SCRIPTS: Dict[str, str] = {
+    "hi": "\u0900-\u097f",
+    "mr": "\u0900-\u097f",
+    "ne": "\u0900-\u097f",
+    "bn": "\u0980-\u09ff",
+    "as": "\u0980-\u09ff",
+    "pa": "\u0a00-\u0a7f",
+    "gu": "\u0a80-\u0aff",
+    "or": "\u0b00-\u0b7f",
+    "ta": "\u0b80-\u0bff",
+    "te": "\u0c00-\u0c7f",
+    "kn": "\u0c80-\u0cff",
+    "ml": "\u0d00-\u0d7f",
+    "ur": "\u0600-\u06ff",
+}
+
+FEATURES = ("search_rank", "domain", "topic_overlap", "level_match", "video", "language")
+_WEIGHTS = np.array([1.0, 1.0, 1.0, 0.3, 0.0, 0.4])
+
+
+def _norm(word: str) -> str:
+    # Crude plural folding so "triangles" matches "triangle".
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def _terms(text: str) -> List[str]:
+    return [_norm(w) for w in _WORD_RE.findall(text.lower())]
+
+
+def domain_prior(url: str) -> float:
+    """Prior for ``url``'s host: the most specific matching entry in ``DOMAIN_PRIORS``."""
+    labels = urlparse(url).netloc.lower().split(":")[0].split(".")
+    for start in range(len(labels)):
+        prior = DOMAIN_PRIORS.get(".".join(labels[start:]))
+        if prior is not None:
+            return prior
+    return 0.0
+
+
+def _language_hint(r: Resource, language: str, script: Optional[re.Pattern]) -> float:
+    parsed = urlparse(r.url)
+    if language in parsed.netloc.lower().split(".")[:1] or language in parsed.path.lower().split("/"):
+        return 1.0
+    if script is not None and script.search(f"{r.title} {r.snippet or ''}"):
+        return 1.0
+    return 0.0
+
+
+def feature_matrix(
+    resources: List[Resource],
+    topic: str,
+    level: str = "beginner",
+    language: str = "en",
+) -> np.ndarray:
+    """
+    ``(len(resources), len(FEATURES))`` matrix of ranking features.
+
+    Text features are built from one presence matrix of candidates x
+    vocabulary (topic terms plus level keywords), so overlap and level match
+    are column reductions rather than per-pair loops.
+    """
+    topic_terms = list(dict.fromkeys(t for t in _terms(topic) if t not in STOPWORDS))
+    level = level.strip().lower()
+    own = [_norm(k) for k in LEVEL_KEYWORDS.get(level, ())]
+    other = [_norm(k) for name, keys in LEVEL_KEYWORDS.items() if name != level for k in keys]
+    vocab = {term: col for col, term in enumerate(dict.fromkeys(topic_terms + own + other))}
+
+    present = np.zeros((len(resources), max(len(vocab), 1)), dtype=bool)
+    for row, r in enumerate(resources):
+        cols = [vocab[t] for t in _terms(f"{r.title} {r.snippet or ''}") if t in vocab]
+        present[row, cols] = True
+
+    def _any(terms: List[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(len(resources))
+        return present[:, [vocab[t] for t in terms]].any(axis=1).astype(float)
+
+    overlap = (
+        present[:, [vocab[t] for t in topic_terms]].mean(axis=1)
+        if topic_terms
+        else np.zeros(len(resources))
+    )
+    own_hit = _any(own)
+    level_match = own_hit - (1.0 - own_hit) * _any(other)
+
+    language = language.strip().lower()
+    script = re.compile(f"[{SCRIPTS[language]}]") if language in SCRIPTS else None
+    language_hint = (
+        np.array([_language_hint(r, language, script) for r in resources])
+        if language != "en"
+        else np.zeros(len(resources))
+    )
+
+    return np.column_stack(
+        [
+            np.array([r.score for r in resources], dtype=float),
+            np.array([domain_prior(r.url) for r in resources]),
+            overlap,
+            level_match,
+            np.array([r.type == "video" for r in resources], dtype=float),
+            language_hint,
+        ]
+    )
+
+
+def rank_resources(
+    resources: List[Resource],
+    topic: str,
+    level: str = "beginner",
+    language: str = "en",
+    video_preference: Optional[float] = None,
+) -> List[Resource]:
+    """
+    Score every candidate at once and return them best first, with
+    ``Resource.score`` set to the new score. Ties keep search order.
+
+    ``video_preference`` (default ``Config.SCOUT_VIDEO_PREFERENCE``) is added
+    to videos' scores; negative values favour articles.
+    """
+    if not resources:
+        return []
+    weights = _WEIGHTS.copy()
+    weights[FEATURES.index("video")] = (
+        Config.SCOUT_VIDEO_PREFERENCE if video_preference is None else video_preference
+    )
+    scores = feature_matrix(resources, topic, level, language) @ weights
+    for r, score in zip(resources, scores):
+        r.score = round(float(score), 4)
+    return [resources[i] for i in np.argsort(-scores, kind="stable")]
@@ -11,7 +11,9 @@ class Resource(BaseModel):
     estimated_level: Optional[str] = None
     short_summary: Optional[str] = None
     score: float = 1.0
+    snippet: Optional[str] = None        # search engine's description of the hit
 
     # New fields for agent 2:
     raw_text: Optional[str] = None       # cleaned page text or transcript
     content_type: Optional[str] = None   # e.g. explanation / tutorial / docs
+    duplicate_of: Optional[str] = None   # url whose summary was reused (near-duplicate page)
@@ -1,23 +1,101 @@
-from typing import Callable, List, Optional, Tuple
+import threading
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple
 
-try:
+if TYPE_CHECKING:
     from google.adk.agents import Agent
-except ImportError as _adk_err:  # optional dependency for ADK users
-    Agent = None
-    _ADK_IMPORT_ERROR = _adk_err
-else:
-    _ADK_IMPORT_ERROR = None
 
+from core.config import Config
+
+from .enrich import (
+    BatchSummarizeFn,
+    FetchFn,
+    FetchVideoFn,
+    SummarizeFn,
+    enrich_resources,
+    iter_enriched,
+)
+from .fanout import base_query, fanout_search
 from .fetch_clean import fetch_and_clean
 from .fetch_youtube import fetch_youtube_transcript
+from .query_cache import get_query_cache, query_key
 from .schemas import Resource
 from .search_google import map_serper_to_resources, raw_web_search
-from .summarize import summarize_and_classify
+from .summarize import summarize_and_classify, summarize_batch
 
 SearchFn = Callable[[str, int], dict]
-FetchFn = Callable[[str], dict]
-FetchVideoFn = Callable[[str, Optional[List[str]]], dict]
-SummarizeFn = Callable[[str, str, str, str], Tuple[str, str, str]]
+
+
+def search_resources(
+    topic: str,
+    level: str = "beginner",
+    num_results: int = 8,
+    search_fn: Optional[SearchFn] = None,
+    include_videos: bool = True,
+    language: str = "en",
+    search_queries: Optional[int] = None,
+) -> List[Resource]:
+    """
+    Agent 1 only: run the web search and map results to ``Resource`` objects.
+
+    With ``search_queries`` > 1 (default ``Config.SCOUT_SEARCH_QUERIES``)
+    that many phrasings are searched concurrently and merged by
+    ``fanout_search``. With ``Config.SCOUT_RERANK`` the hits are re-ordered
+    by ``rank_resources`` (domain, topic overlap, level and language hints).
+    """
+    search = search_fn or raw_web_search
+    queries = _search_queries(search_queries)
+
+    if queries > 1:
+        data = fanout_search(topic, level, language, num_results, search, queries)
+    else:
+        data = search(base_query(topic, level), num_results)
+
+    resources = map_serper_to_resources(data)
+    if not include_videos:
+        resources = [r for r in resources if r.type != "video"]
+    if Config.SCOUT_RERANK:
+        # Imported here so importing the package doesn't pay for numpy.
+        from .ranking import rank_resources
+
+        resources = rank_resources(resources, topic, level, language)
+    return resources
+
+
+def _search_queries(search_queries: Optional[int]) -> int:
+    return Config.SCOUT_SEARCH_QUERIES if search_queries is None else max(search_queries, 1)
+
+
+def _top_k(enrich_top_k: Optional[int]) -> int:
+    return Config.SCOUT_ENRICH_TOP_K if enrich_top_k is None else max(enrich_top_k, 0)
+
+
+def _enrich_options(
+    fetch_fn: Optional[FetchFn],
+    fetch_video_fn: Optional[FetchVideoFn],
+    summarize_fn: Optional[SummarizeFn],
+    max_workers: Optional[int],
+    resource_timeout: Optional[float],
+    batch_summarize_fn: Optional[BatchSummarizeFn] = None,
+    batch_summaries: Optional[bool] = None,
+) -> dict:
+    if batch_summaries is None:
+        # An injected per-item summarizer wins over the default batch one.
+        batch_summaries = Config.SCOUT_BATCH_SUMMARIES and (
+            summarize_fn is None or batch_summarize_fn is not None
+        )
+    return {
+        "batch_summarize": (
+            (batch_summarize_fn or summarize_batch) if batch_summaries else None
+        ),
+        "fetch": fetch_fn or fetch_and_clean,
+        "fetch_video": fetch_video_fn or fetch_youtube_transcript,
+        "summarize": summarize_fn or summarize_and_classify,
+        "max_workers": Config.SCOUT_MAX_WORKERS if max_workers is None else max_workers,
+        "resource_timeout": (
+            Config.SCOUT_RESOURCE_TIMEOUT if resource_timeout is None else resource_timeout
+        ),
+        "dedup": Config.SCOUT_DEDUP,
+    }
 
 
 def content_scout_agent(
@@ -31,66 +109,138 @@ def content_scout_agent(
     fetch_video_fn: Optional[FetchVideoFn] = None,
     summarize_fn: Optional[SummarizeFn] = None,
     include_videos: bool = True,
+    max_workers: Optional[int] = None,
+    resource_timeout: Optional[float] = None,
+    batch_summaries: Optional[bool] = None,
+    batch_summarize_fn: Optional[BatchSummarizeFn] = None,
+    use_cache: bool = True,
+    enrich_top_k: Optional[int] = None,
+    search_queries: Optional[int] = None,
 ) -> List[Resource]:
     """
     Agent 1 + (optionally) Agent 2.
 
     - If enrich=False: only search, return URLs + basic metadata.
     - If enrich=True: also fetch page text, detect language, summarize, classify.
-    """
-    search = search_fn or raw_web_search
-    fetch = fetch_fn or fetch_and_clean
-    fetch_video = fetch_video_fn or fetch_youtube_transcript
-    summarize = summarize_fn or summarize_and_classify
 
-    query = f"{topic} tutorial for {level} students"
-    data = search(query, num_results)
+    Enrichment runs on a pool of ``max_workers`` threads (default
+    ``Config.SCOUT_MAX_WORKERS``) and results keep their search ranking order.
+    A resource still being processed ``resource_timeout`` seconds after it
+    started (default ``Config.SCOUT_RESOURCE_TIMEOUT``) is dropped.
 
-    resources = map_serper_to_resources(data)
-    if not include_videos:
-        resources = [r for r in resources if r.type != "video"]
+    With ``batch_summaries`` (default ``Config.SCOUT_BATCH_SUMMARIES``, unless
+    a per-item ``summarize_fn`` is injected) fetched pages are summarized
+    several per LLM call via ``summarize_batch``. Near-duplicate pages share
+    one summary unless ``Config.SCOUT_DEDUP`` is off.
 
-    if not enrich:
-        return resources
+    With ``enrich_top_k`` (default ``Config.SCOUT_ENRICH_TOP_K``; 0 means
+    all) only the best-ranked K results are fetched and summarized; the rest
+    follow them unenriched, in rank order. ``search_queries`` > 1 fans the
+    search out over several phrasings (see ``search_resources``).
+
+    Results are cached per normalized (topic, language, level, num_results,
+    include_videos, enrich, enrich_top_k, search_queries) for ``Config.QUERY_CACHE_TTL`` seconds
+    (empty or partly unsummarized results only for ``Config.QUERY_CACHE_NEGATIVE_TTL``), and
+    identical concurrent requests share one computation. The cache is skipped
+    when ``use_cache`` is False or any search/fetch/summarize hook is injected.
+    """
 
-    enriched: List[Resource] = []
+    top_k = _top_k(enrich_top_k)
+    queries = _search_queries(search_queries)
 
-    for r in resources:
-        is_youtube = "youtube.com" in r.url or "youtu.be" in r.url
-        page = (
-            fetch_video(r.url, [language, "en"])
-            if r.type == "video" or is_youtube
-            else fetch(r.url)
+    def _compute() -> List[Resource]:
+        resources = search_resources(
+            topic, level, num_results, search_fn, include_videos, language, queries
         )
-        if not page["ok"] or not page["text"]:
-            continue
 
-        # fill in any missing title
-        if not r.title:
-            r.title = page["title"] or r.title
+        if not enrich:
+            return resources
 
-        r.raw_text = page["text"]
-        r.language = page["language"]
+        rest = resources[top_k:] if top_k else []
+        return enrich_resources(
+            resources[:top_k] if top_k else resources,
+            topic=topic,
+            language=language,
+            level=level,
+            **_enrich_options(
+                fetch_fn,
+                fetch_video_fn,
+                summarize_fn,
+                max_workers,
+                resource_timeout,
+                batch_summarize_fn,
+                batch_summaries,
+            ),
+        ) + rest
 
-        # only summarize English pages in v1
-        if r.language and not r.language.startswith("en"):
-            enriched.append(r)
-            continue
+    hooks = (search_fn, fetch_fn, fetch_video_fn, summarize_fn, batch_summarize_fn)
+    cache = get_query_cache() if use_cache and all(h is None for h in hooks) else None
+    if cache is None:
+        return _compute()
 
-        short_summary, est_level, content_type = summarize(
-            text=page["text"],
-            topic=topic,
-            target_language=language,
-            level_hint=level,
-        )
+    key = query_key(
+        topic, language, level, num_results, include_videos, enrich, top_k if enrich else 0, queries
+    )
+    enriched = (top_k or num_results) if enrich else 0
+    return cache.get_or_compute(key, _compute, enriched=enriched)
+
+
+def iter_content_scout(
+    topic: str,
+    language: str = "en",
+    level: str = "beginner",
+    num_results: int = 8,
+    search_fn: Optional[SearchFn] = None,
+    fetch_fn: Optional[FetchFn] = None,
+    fetch_video_fn: Optional[FetchVideoFn] = None,
+    summarize_fn: Optional[SummarizeFn] = None,
+    include_videos: bool = True,
+    max_workers: Optional[int] = None,
+    resource_timeout: Optional[float] = None,
+    batch_summaries: Optional[bool] = None,
+    batch_summarize_fn: Optional[BatchSummarizeFn] = None,
+    enrich_top_k: Optional[int] = None,
+    search_queries: Optional[int] = None,
+) -> Iterator[Tuple[str, dict]]:
+    """
+    Streaming form of ``content_scout_agent(enrich=True)``.
 
-        r.short_summary = short_summary
-        r.estimated_level = est_level
-        r.content_type = content_type
+    Yields ``(event, payload)`` pairs:
+    - ``("results", {"resources": [...]})`` right after the search returns,
+    - ``("resource", {"index": i, "resource": {...}})`` as each resource
+      finishes enrichment (completion order; ``index`` is its search rank),
+    - ``("done", {"count": n})`` at the end.
 
-        enriched.append(r)
+    In batch-summary mode the summarized resources arrive together once
+    their batch completes. With ``enrich_top_k`` only that many of the
+    ranked results are enriched (see ``content_scout_agent``).
+    """
+    resources = search_resources(
+        topic, level, num_results, search_fn, include_videos, language, search_queries
+    )
+    yield "results", {"resources": [r.model_dump() for r in resources]}
 
-    return enriched
+    top_k = _top_k(enrich_top_k)
+    count = 0
+    for i, r in iter_enriched(
+        resources[:top_k] if top_k else resources,
+        topic=topic,
+        language=language,
+        level=level,
+        **_enrich_options(
+            fetch_fn,
+            fetch_video_fn,
+            summarize_fn,
+            max_workers,
+            resource_timeout,
+            batch_summarize_fn,
+            batch_summaries,
+        ),
+    ):
+        count += 1
+        yield "resource", {"index": i, "resource": r.model_dump()}
+
+    yield "done", {"count": count}
 
 
 def find_learning_resources(
@@ -118,11 +268,14 @@ def build_content_scout_adk_agent(
     Build an ADK Agent that can field natural language requests and call the
     Serper-powered search tool.
     """
-    if Agent is None:
+    try:
+        # Imported here: google-adk is optional and slow to import.
+        from google.adk.agents import Agent
+    except ImportError as exc:
         raise ImportError(
             "google-adk is required for the ADK-enabled content scout. "
             "Install with `pip install google-adk`."
-        ) from _ADK_IMPORT_ERROR
+        ) from exc
 
     return Agent(
         name="content_scout_agent",
@@ -141,7 +294,20 @@ def build_content_scout_adk_agent(
     )
 
 
-# Convenience instance for users who want to import and run directly.
-content_scout_adk_agent: Optional["Agent"] = None
-if Agent is not None:
-    content_scout_adk_agent = build_content_scout_adk_agent()
+_ADK_AGENT_LOCK = threading.Lock()
+
+
+def __getattr__(name):
+    # ``content_scout_adk_agent``: convenience instance for users who want to
+    # import and run directly. Built on first access (None without google-adk)
+    # instead of at import time.
+    if name != "content_scout_adk_agent":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _ADK_AGENT_LOCK:
+        if "content_scout_adk_agent" not in globals():
+            try:
+                agent = build_content_scout_adk_agent()
+            except ImportError:
+                agent = None
+            globals()["content_scout_adk_agent"] = agent
+    return globals()["content_scout_adk_agent"]
@@ -1,14 +1,17 @@
-import os
+import time
 from typing import List, Optional
 
 import requests
-from dotenv import load_dotenv
 
-from .schemas import Resource
+from core.config import Config
+from core.http_client import RETRY_STATUSES, get_http_client
+from core.metrics import host_of, record_bytes, timed
+from core.ratelimit import get_rate_limiter
+from core.resilience import backoff_delay, time_left
 
-load_dotenv()  # loads SERPER_API_KEY from .env
+from .schemas import Resource
 
-SERPER_API_KEY = os.getenv("SERPER_API_KEY")
+SERPER_API_KEY = Config.SERPER_API_KEY  # from the environment / .env via Config
 SERPER_ENDPOINT = "https://google.serper.dev/search"
 
 
@@ -25,9 +28,50 @@ def _require_api_key(api_key: Optional[str]) -> str:
     return api_key
 
 
-def raw_web_search(query: str, num_results: int = 5, api_key: Optional[str] = None) -> dict:
+def _retry_after(response: requests.Response, attempt: int) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return backoff_delay(attempt, Config.HTTP_BACKOFF_FACTOR, 30.0)
+
+
+def _post_search(body: dict, headers: dict, timeout: Optional[float]) -> requests.Response:
+    """
+    POST to Serper, retrying 429/5xx up to ``Config.HTTP_MAX_RETRIES`` times.
+    Every attempt waits for Serper quota again, and no retry is started that
+    would sleep past the caller's deadline.
+    """
+    host = host_of(SERPER_ENDPOINT)
+    attempt = 0
+    while True:
+        get_rate_limiter("serper").acquire()
+        with timed("search", host=host):
+            response = get_http_client().post(
+                SERPER_ENDPOINT, json=body, headers=headers, timeout=timeout
+            )
+        if response.status_code not in RETRY_STATUSES or attempt >= Config.HTTP_MAX_RETRIES:
+            return response
+        delay = _retry_after(response, attempt)
+        left = time_left()
+        if left is not None and left <= delay:
+            return response
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def raw_web_search(
+    query: str,
+    num_results: int = 5,
+    api_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> dict:
     """
     Call Serper search API and return raw JSON response.
+
+    Goes through the shared pooled HTTP client, so it gets keep-alive reuse
+    and the default ``Config.HTTP_TIMEOUT``. Waits for Serper quota before
+    every attempt, at the caller's ``priority_scope``; 429/5xx are retried.
     """
     resolved_key = _require_api_key(api_key or SERPER_API_KEY)
     headers = {
@@ -40,9 +84,11 @@ def raw_web_search(query: str, num_results: int = 5, api_key: Optional[str] = No
         "num": num_results,
     }
 
-    response = requests.post(SERPER_ENDPOINT, json=body, headers=headers)
+    response = _post_search(body, headers, timeout)
     response.raise_for_status()
-    return response.json()
+    data = response.json()
+    record_bytes("search", len(response.content), host=host_of(SERPER_ENDPOINT))
+    return data
 
 
 def get_result_urls(query: str, num_results: int = 5, api_key: Optional[str] = None) -> List[str]:
@@ -80,6 +126,7 @@ def map_serper_to_resources(data: dict, base_score: float = 1.0) -> List[Resourc
                 type="article",
                 source=item.get("source", "web"),
                 score=base_score - i * 0.05,  # slightly lower score for lower rank
+                snippet=item.get("snippet"),
             )
         )
 
@@ -92,6 +139,7 @@ def map_serper_to_resources(data: dict, base_score: float = 1.0) -> List[Resourc
                 type="video",
                 source=item.get("source", "web"),
                 score=base_score - i * 0.05,
+                snippet=item.get("snippet"),
             )
         )
 
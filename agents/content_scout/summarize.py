@@ -1,5 +1,27 @@
-from typing import Tuple
-from core.llm import call_llm_json
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.cache import LRUCache, cache_key
+from core.chunking import chunk_text
+from core.config import Config
+from core.llm import call_llm_json, is_stub_response
+from core.ratelimit import bind_priority
+from core.utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CHAR_LIMIT = 6000
+LEVELS = ["school", "college", "beginner", "advanced"]
+CONTENT_TYPES = [
+    "concept_explanation",
+    "step_by_step_tutorial",
+    "reference_docs",
+    "example_collection",
+]
+
+CallFn = Callable[[str, Optional[str]], Dict]
 
 
 def summarize_and_classify(
@@ -7,16 +29,27 @@ def summarize_and_classify(
     topic: str,
     target_language: str = "en",
     level_hint: str = "beginner",
+    call_fn: Optional[CallFn] = None,
 ) -> Tuple[str, str, str]:
     """
     Returns:
         short_summary (str, English),
         estimated_level (str),
         content_type (str)
+
+    Texts longer than ``SUMMARY_CHAR_LIMIT`` are summarized chunk by chunk
+    and reduced (see ``summarize_long``) instead of being truncated.
     """
+    if len(text) > SUMMARY_CHAR_LIMIT:
+        return summarize_long(
+            text,
+            topic=topic,
+            target_language=target_language,
+            level_hint=level_hint,
+            call_fn=call_fn,
+        )
 
-    # truncate to avoid sending mega-pages
-    trimmed = text[:6000]
+    trimmed = text[:SUMMARY_CHAR_LIMIT]
 
     prompt = f"""
 You are helping to build a learning assistant for non-English-medium students.
@@ -35,10 +68,244 @@ TEXT:
 \"\"\"{trimmed}\"\"\"
 """
 
-    result = call_llm_json(prompt)
+    llm_call = call_fn or call_llm_json
+    result = llm_call(prompt)
 
     short_summary = result.get("short_summary", "").strip()
     estimated_level = result.get("estimated_level", "").strip() or level_hint
     content_type = result.get("content_type", "").strip() or "concept_explanation"
 
     return short_summary, estimated_level, content_type
+
+
+_BATCH_PROMPT = """
+You are helping to build a learning assistant for non-English-medium students.
+
+Below are {count} RESOURCES, each marked with its index. For EACH resource, do three things:
+1. In at most 3 sentences, summarize the main idea in English, focusing on how it can help someone learn the topic: "{topic}".
+2. Estimate the difficulty level as one of: {levels}.
+3. Classify the content type as one of: {content_types}.
+
+Respond ONLY as a JSON object of the form:
+{{"results": [{{"index": <resource index>, "short_summary": "...", "estimated_level": "...", "content_type": "..."}}, ...]}}
+with exactly one entry per resource.
+
+{resources}
+"""
+
+
+def _pack_batches(texts: List[str], token_budget: int) -> List[List[int]]:
+    """
+    Greedily group text indices so each group's trimmed texts fit the budget.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for i, text in enumerate(texts):
+        if len(text) > SUMMARY_CHAR_LIMIT:
+            batches.append([i])  # long texts go through map-reduce on their own
+            continue
+        cost = estimate_tokens(text[:SUMMARY_CHAR_LIMIT])
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_result(result, indices: List[int], level_hint: str) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Validate the model's JSON and return summaries keyed by resource index.
+    Entries that are missing or malformed are simply left out.
+    """
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        return {}
+
+    wanted = set(indices)
+    parsed: Dict[int, Tuple[str, str, str]] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("index"))
+        except (TypeError, ValueError):
+            continue
+        summary = item.get("short_summary")
+        if index not in wanted or not isinstance(summary, str) or not summary.strip():
+            continue
+        estimated_level = str(item.get("estimated_level") or "").strip() or level_hint
+        content_type = str(item.get("content_type") or "").strip() or "concept_explanation"
+        parsed[index] = (summary.strip(), estimated_level, content_type)
+    return parsed
+
+
+def summarize_batch(
+    texts: List[str],
+    topic: str,
+    target_language: str = "en",
+    level_hint: str = "beginner",
+    token_budget: Optional[int] = None,
+    max_workers: int = 4,
+    call_fn: Optional[CallFn] = None,
+) -> List[Tuple[str, str, str]]:
+    """
+    Summarize several texts with as few LLM calls as the token budget allows.
+
+    Texts are packed into prompts of at most ``token_budget`` tokens
+    (default ``Config.SUMMARY_BATCH_TOKEN_BUDGET``) and the model answers with
+    one JSON entry per resource index. Batches run concurrently; any text
+    whose entry is missing or malformed falls back to its own
+    ``summarize_and_classify`` call, also on up to ``max_workers`` threads.
+
+    Texts longer than ``SUMMARY_CHAR_LIMIT`` are not batched; they go through
+    ``summarize_long``.
+
+    Returns one ``(short_summary, estimated_level, content_type)`` per text,
+    in input order.
+    """
+    llm_call = call_fn or call_llm_json
+    budget = token_budget or Config.SUMMARY_BATCH_TOKEN_BUDGET
+    batches = _pack_batches(texts, budget)
+
+    def _run_batch(indices: List[int]) -> Dict[int, Tuple[str, str, str]]:
+        if len(indices) == 1:
+            return {}  # a single text is cheaper through the regular prompt
+        resources = "\n\n".join(
+            f'RESOURCE [{i}]:\n"""{texts[i][:SUMMARY_CHAR_LIMIT]}"""' for i in indices
+        )
+        prompt = _BATCH_PROMPT.format(
+            count=len(indices),
+            topic=topic,
+            levels=json.dumps(LEVELS),
+            content_types=json.dumps(CONTENT_TYPES),
+            resources=resources,
+        )
+        try:
+            return _parse_batch_result(llm_call(prompt), indices, level_hint)
+        except Exception:
+            logger.exception("Batch summarization failed; falling back per item")
+            return {}
+
+    results: Dict[int, Tuple[str, str, str]] = {}
+    if len(batches) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            for parsed in pool.map(bind_priority(_run_batch), batches):
+                results.update(parsed)
+    else:
+        for indices in batches:
+            results.update(_run_batch(indices))
+
+    def _fallback(i: int) -> Tuple[int, Tuple[str, str, str]]:
+        return i, summarize_and_classify(
+            text=texts[i],
+            topic=topic,
+            target_language=target_language,
+            level_hint=level_hint,
+            call_fn=call_fn,
+        )
+
+    missing = [i for i in range(len(texts)) if i not in results]
+    if len(missing) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            results.update(pool.map(bind_priority(_fallback), missing))
+    else:
+        results.update(_fallback(i) for i in missing)
+    return [results[i] for i in range(len(texts))]
+
+
+_CHUNK_CACHE = LRUCache(max_entries=Config.SUMMARY_CHUNK_CACHE_SIZE)
+
+
+def _summarize_chunk(chunk: str, topic: str, llm_call: CallFn) -> str:
+    """
+    Map step: condense one chunk into notes. Cached by (topic, chunk) so an
+    updated page only re-summarizes the chunks that actually changed. Only
+    real ``notes`` from a model are cached; a stub (no LLM, open breaker,
+    failed call) gives empty notes so it is neither reduced nor remembered.
+    """
+    key = cache_key("chunk", topic, chunk)
+    notes = _CHUNK_CACHE.get(key)
+    if notes is not None:
+        return notes
+
+    prompt = f"""
+You are helping to build a learning assistant for non-English-medium students.
+
+The TEXT below is one part of a longer page or video transcript about "{topic}".
+In at most 4 sentences of English, write the key points a learner needs from this part.
+
+Respond ONLY as a JSON object with key "notes".
+
+TEXT:
+\"\"\"{chunk}\"\"\"
+"""
+    result = llm_call(prompt)
+    if is_stub_response(result) or not isinstance(result, dict):
+        return ""
+    notes = str(result.get("notes") or "").strip()
+    if notes:
+        _CHUNK_CACHE.set(key, notes)
+    return notes
+
+
+def summarize_long(
+    text: str,
+    topic: str,
+    target_language: str = "en",
+    level_hint: str = "beginner",
+    chunk_tokens: Optional[int] = None,
+    max_workers: int = 4,
+    call_fn: Optional[CallFn] = None,
+) -> Tuple[str, str, str]:
+    """
+    Map-reduce summary for long pages and transcripts.
+
+    The text is split on paragraph/sentence boundaries into chunks of at most
+    ``chunk_tokens`` (default ``Config.SUMMARY_CHUNK_TOKENS``), each chunk is
+    condensed concurrently, and the notes are reduced into the final
+    ``(short_summary, estimated_level, content_type)``. At most
+    ``Config.SUMMARY_MAX_CHUNKS`` evenly spaced chunks are used.
+    """
+    llm_call = call_fn or call_llm_json
+    chunks = chunk_text(text, chunk_tokens or Config.SUMMARY_CHUNK_TOKENS)
+    limit = Config.SUMMARY_MAX_CHUNKS
+    if len(chunks) > limit:
+        step = len(chunks) / limit
+        chunks = [chunks[int(i * step)] for i in range(limit)]
+
+    if max_workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            summarize_chunk = bind_priority(lambda c: _summarize_chunk(c, topic, llm_call))
+            notes = list(pool.map(summarize_chunk, chunks))
+    else:
+        notes = [_summarize_chunk(c, topic, llm_call) for c in chunks]
+
+    joined = "\n".join(f"- {n}" for n in notes if n)
+    prompt = f"""
+You are helping to build a learning assistant for non-English-medium students.
+
+The NOTES below were taken, part by part, from one long page or video transcript.
+Using them, do three things:
+1. In at most 3 sentences, summarize the main idea in English, focusing on how it can help someone learn the topic: "{topic}".
+2. Estimate the difficulty level as one of: {json.dumps(LEVELS)}.
+3. Classify the content type as one of: {json.dumps(CONTENT_TYPES)}.
+
+Respond ONLY as a JSON object with keys:
+- "short_summary"
+- "estimated_level"
+- "content_type"
+
+NOTES:
+{joined}
+"""
+    result = llm_call(prompt)
+
+    short_summary = (result.get("short_summary") or "").strip()
+    estimated_level = (result.get("estimated_level") or "").strip() or level_hint
+    content_type = (result.get("content_type") or "").strip() or "concept_explanation"
+
+    return short_summary, estimated_level, content_type
@@ -1 +1,14 @@
-# Conversation Agent module (future)
+# Conversation Agent module: local retrieval over enriched resources
+
+from .embeddings import Embedder, HashingEmbedder
+from .retrieval import get_vector_store, index_resources, retrieve
+from .vector_store import VectorStore
+
+__all__ = [
+    "Embedder",
+    "HashingEmbedder",
+    "VectorStore",
+    "get_vector_store",
+    "index_resources",
+    "retrieve",
+]
@@ -0,0 +1,58 @@
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder:
+    """
+    Minimal interface for text embedders used by the vector store.
+
+    ``embed`` returns a float32 matrix of shape ``(len(texts), dim)`` whose
+    rows are L2-normalized (so dot product == cosine similarity).
+    """
+
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic, offline embedder based on the hashing trick.
+
+    Word unigrams and bigrams are hashed into ``dim`` signed buckets, so the
+    same text always maps to the same vector without any model download.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN_RE.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            digests = np.array(
+                [
+                    int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+                    for f in features
+                ],
+                dtype=np.uint64,
+            )
+            buckets = (digests % np.uint64(self.dim)).astype(np.intp)
+            signs = np.where((digests >> np.uint64(63)) == 1, -1.0, 1.0).astype(np.float32)
+            np.add.at(out[row], buckets, signs)
+
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
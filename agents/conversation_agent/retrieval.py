@@ -0,0 +1,56 @@
+import threading
+from typing import Dict, List, Optional
+
+from agents.content_scout.schemas import Resource
+from core.chunking import chunk_text
+from core.config import Config
+
+from .vector_store import VectorStore
+
+_STORE: Optional[VectorStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Return the process-wide store, persisted at ``Config.RAG_INDEX_PATH``
+    (in-memory only when unset).
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = VectorStore(Config.RAG_INDEX_PATH)
+    return _STORE
+
+
+def index_resources(
+    store: VectorStore,
+    resources: List[Resource],
+    chunk_tokens: Optional[int] = None,
+) -> int:
+    """
+    Chunk each resource's ``raw_text`` and add it to the store under its URL.
+    Re-indexing a URL replaces its old chunks. Returns the number of chunks
+    written.
+    """
+    written = 0
+    for r in resources:
+        if not r.raw_text:
+            continue
+        chunks = chunk_text(r.raw_text, chunk_tokens or Config.RAG_CHUNK_TOKENS)
+        written += len(
+            store.add(
+                r.url,
+                chunks,
+                {"url": r.url, "title": r.title, "language": r.language},
+            )
+        )
+    return written
+
+
+def retrieve(store: VectorStore, question: str, k: int = 5) -> List[Dict]:
+    """
+    Top-k chunks for a learner's question, best first.
+    """
+    return store.search(question, k=k)
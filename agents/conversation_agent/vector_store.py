@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .embeddings import Embedder, HashingEmbedder
+
+_INITIAL_CAPACITY = 1024
+
+
+class VectorStore:
+    """
+    Embedded, in-process vector index.
+
+    Vectors live in a float32 matrix (a NumPy memory-mapped file when ``path``
+    is given, a plain array otherwise); chunk metadata lives in SQLite keyed by
+    the matrix row. Search is a single matrix-vector product over the live
+    rows. Deleted rows are tombstoned and reused by later adds.
+    """
+
+    def __init__(self, path: Optional[str] = None, embedder: Optional[Embedder] = None):
+        self.path = path
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self._lock = threading.RLock()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(path, "chunks.sqlite3"), check_same_thread=False)
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            " row INTEGER PRIMARY KEY,"
+            " doc_id TEXT NOT NULL,"
+            " chunk_index INTEGER NOT NULL,"
+            " text TEXT NOT NULL,"
+            " url TEXT,"
+            " title TEXT,"
+            " language TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_doc ON chunks (doc_id)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+        self._check_dim()
+
+        rows = [r for (r,) in self._conn.execute("SELECT row FROM chunks")]
+        capacity = max(_INITIAL_CAPACITY, max(rows) + 1 if rows else 0)
+        self._open_matrix(capacity)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._alive[rows] = True
+
+    def _check_dim(self) -> None:
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'dim'").fetchone()
+        if row is None:
+            self._conn.execute("INSERT INTO store_meta VALUES ('dim', ?)", (str(self.dim),))
+            self._conn.commit()
+        elif int(row[0]) != self.dim:
+            raise ValueError(
+                f"Vector store at {self.path} was built with dim={row[0]}, "
+                f"but the embedder produces dim={self.dim}."
+            )
+
+    def _matrix_file(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    def _open_matrix(self, capacity: int) -> None:
+        if not self.path:
+            old = getattr(self, "_matrix", None)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            if old is not None:
+                matrix[: len(old)] = old
+            self._matrix = matrix
+            return
+
+        filename = self._matrix_file()
+        needed = capacity * self.dim * 4
+        with open(filename, "ab") as fh:
+            if fh.tell() < needed:
+                fh.truncate(needed)
+        if getattr(self, "_matrix", None) is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(filename, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._open_matrix(capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+
+    def _free_rows(self, count: int) -> np.ndarray:
+        free = np.flatnonzero(~self._alive)[:count]
+        if len(free) < count:
+            start = len(self._alive)
+            self._grow(start + count - len(free))
+            free = np.concatenate([free, np.arange(start, start + count - len(free))])
+        return free
+
+    def add(self, doc_id: str, chunks: List[str], metadata: Optional[Dict] = None) -> List[int]:
+        """
+        Embed and index the chunks of one document, replacing any chunks
+        previously stored under the same ``doc_id``. Returns the matrix rows.
+        """
+        metadata = metadata or {}
+        chunks = [c for c in chunks if c and c.strip()]
+        with self._lock:
+            self.delete(doc_id)
+            if not chunks:
+                return []
+            vectors = self.embedder.embed(chunks)
+            rows = self._free_rows(len(chunks))
+            self._matrix[rows] = vectors
+            self._alive[rows] = True
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (row, doc_id, chunk_index, text, url, title, language)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        int(row),
+                        doc_id,
+                        i,
+                        chunk,
+                        metadata.get("url"),
+                        metadata.get("title"),
+                        metadata.get("language"),
+                    )
+                    for i, (row, chunk) in enumerate(zip(rows, chunks))
+                ],
+            )
+            # Vectors reach disk before the rows that point at them are committed.
+            self.flush()
+            self._conn.commit()
+            return [int(r) for r in rows]
+
+    def delete(self, doc_id: str) -> int:
+        """Remove every chunk of ``doc_id``; returns how many were removed."""
+        with self._lock:
+            rows = [r for (r,) in self._conn.execute("SELECT row FROM chunks WHERE doc_id = ?", (doc_id,))]
+            if not rows:
+                return 0
+            self._alive[rows] = False
+            self._matrix[rows] = 0.0
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+            return len(rows)
+
+    def search(self, query: str, k: int = 5) -> List[Dict]:
+        """
+        Top-k cosine search. Returns dicts with ``score``, ``doc_id``,
+        ``chunk_index``, ``text``, ``url``, ``title`` and ``language``.
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive)
+            if not len(live) or k <= 0:
+                return []
+            q = self.embedder.embed([query])[0]
+            scores = self._matrix[live] @ q
+            k = min(k, len(live))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            rows = [int(live[i]) for i in top]
+
+            placeholders = ",".join("?" * len(rows))
+            meta = {
+                r[0]: r
+                for r in self._conn.execute(
+                    "SELECT row, doc_id, chunk_index, text, url, title, language"
+                    f" FROM chunks WHERE row IN ({placeholders})",
+                    rows,
+                )
+            }
+        return [
+            {
+                "score": float(scores[i]),
+                "doc_id": meta[row][1],
+                "chunk_index": meta[row][2],
+                "text": meta[row][3],
+                "url": meta[row][4],
+                "title": meta[row][5],
+                "language": meta[row][6],
+            }
+            for i, row in zip(top, rows)
+        ]
+
+    def __len__(self) -> int:
+        return int(self._alive.sum())
+
+    def flush(self) -> None:
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
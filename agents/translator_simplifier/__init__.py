@@ -1,6 +1,11 @@
 # Translator & Simplifier Agent
 
 from .schemas import SimplifiedContent
-from .translate import translate_and_simplify
+from .translate import translate_and_simplify, translate_and_simplify_stream, translate_many
 
-__all__ = ["SimplifiedContent", "translate_and_simplify"]
+__all__ = [
+    "SimplifiedContent",
+    "translate_and_simplify",
+    "translate_and_simplify_stream",
+    "translate_many",
+]
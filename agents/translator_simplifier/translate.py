@@ -1,36 +1,31 @@
-from typing import Callable, Dict, Optional
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from core.llm import call_llm_json
+from core.config import Config
+from core.llm import call_llm_json, stream_llm_json
+from core.ratelimit import bind_priority
+from core.utils import estimate_tokens
 
 from .schemas import SimplifiedContent
 
 CallFn = Callable[[str, Optional[str]], Dict]
+StreamFn = Callable[[str], Iterator[Dict]]
+Target = Tuple[str, str]  # (language, level)
 
+INPUT_CHAR_LIMIT = 4000
 
-def translate_and_simplify(
-    text: str,
-    target_language: str = "hi",
-    level: str = "school",
-    topic: Optional[str] = None,
-    call_fn: Optional[CallFn] = None,
-) -> SimplifiedContent:
-    """
-    Translate and simplify an English explanation into the target language/level.
-    Returns structured output: explanation, analogy, step_by_step, keywords.
-    """
-    llm_call = call_fn or call_llm_json
+# Models sometimes echo the label: "[2]" or "TARGET [2]" instead of 2.
+_TARGET_RE = re.compile(r"\s*(?:target\s*)?\[?\s*(\d+)\s*\]?\s*", re.I)
+
+logger = logging.getLogger(__name__)
 
-    if not text:
-        return SimplifiedContent(
-            explanation="",
-            analogy=None,
-            step_by_step=[],
-            keywords=[],
-            language=target_language,
-            level=level,
-        )
 
-    prompt = f"""
+def build_prompt(
+    text: str, target_language: str, level: str, topic: Optional[str] = None
+) -> str:
+    return f"""
 You are a teaching assistant helping students who learn in a non-English language.
 Given the INPUT TEXT, translate and simplify it for a student at level "{level}".
 If helpful, add a local analogy and break it into simple steps.
@@ -45,11 +40,11 @@ Respond ONLY as JSON with keys:
 TARGET LANGUAGE: {target_language}
 TOPIC: {topic or "N/A"}
 INPUT TEXT:
-\"\"\"{text[:4000]}\"\"\"
+\"\"\"{text[:INPUT_CHAR_LIMIT]}\"\"\"
 """
 
-    result = llm_call(prompt)
 
+def _to_simplified(result: Dict, target_language: str, level: str) -> SimplifiedContent:
     explanation = (result.get("explanation") or "").strip()
     analogy = (result.get("analogy") or "").strip() or None
     step_by_step = result.get("step_by_step") or []
@@ -71,3 +66,187 @@ INPUT TEXT:
         language=language,
         level=level_out,
     )
+
+
+def translate_and_simplify(
+    text: str,
+    target_language: str = "hi",
+    level: str = "school",
+    topic: Optional[str] = None,
+    call_fn: Optional[CallFn] = None,
+) -> SimplifiedContent:
+    """
+    Translate and simplify an English explanation into the target language/level.
+    Returns structured output: explanation, analogy, step_by_step, keywords.
+    """
+    llm_call = call_fn or call_llm_json
+
+    if not text:
+        return SimplifiedContent(
+            explanation="",
+            analogy=None,
+            step_by_step=[],
+            keywords=[],
+            language=target_language,
+            level=level,
+        )
+
+    prompt = build_prompt(text, target_language, level, topic)
+    result = llm_call(prompt)
+
+    return _to_simplified(result, target_language, level)
+
+
+def translate_and_simplify_stream(
+    text: str,
+    target_language: str = "hi",
+    level: str = "school",
+    topic: Optional[str] = None,
+    stream_fn: Optional[StreamFn] = None,
+) -> Iterator[Dict]:
+    """
+    Streaming variant of ``translate_and_simplify``.
+
+    Yields ``field`` events (e.g. ``explanation``) and ``item`` events (each
+    ``step_by_step`` / ``keywords`` entry) as the model produces them, then a
+    final ``{"type": "done", "value": SimplifiedContent}``.
+    """
+    llm_stream = stream_fn or stream_llm_json
+
+    if not text:
+        yield {"type": "done", "value": _to_simplified({}, target_language, level)}
+        return
+
+    for event in llm_stream(build_prompt(text, target_language, level, topic)):
+        if event["type"] == "done":
+            yield {"type": "done", "value": _to_simplified(event["value"], target_language, level)}
+        else:
+            yield event
+
+
+_MULTI_PROMPT = """
+You are a teaching assistant helping students who learn in a non-English language.
+Given the INPUT TEXT, translate and simplify it separately for EACH of the {count} TARGETS
+below, writing in that target's language for a student at that target's level.
+If helpful, add a local analogy and break it into simple steps.
+Respond ONLY as JSON of the form {{"results": [...]}} with one object per target:
+- "target": the target number as a bare integer (2 for TARGET [2])
+- "explanation": translated + simplified text in the target language
+- "analogy": a short relatable analogy (may be empty)
+- "step_by_step": array of 3-6 short bullet steps in the target language
+- "keywords": array of important terms in the target language
+- "language": the target language code
+- "level": the target level string
+
+TARGETS:
+{targets}
+
+TOPIC: {topic}
+INPUT TEXT:
+\"\"\"{text}\"\"\"
+"""
+
+
+def _pack_targets(targets: List[Target], text: str, token_budget: int) -> List[List[int]]:
+    """
+    Split targets into groups whose prompt plus expected output
+    (``Config.TRANSLATE_TARGET_TOKENS`` per target) fit ``token_budget``.
+    """
+    room = token_budget - estimate_tokens(text[:INPUT_CHAR_LIMIT])
+    per_call = max(1, room // Config.TRANSLATE_TARGET_TOKENS)
+    indices = list(range(len(targets)))
+    return [indices[i : i + per_call] for i in range(0, len(indices), per_call)]
+
+
+def _parse_multi_result(result, group: List[int], targets: List[Target]) -> Dict[int, SimplifiedContent]:
+    """
+    Map the model's per-target entries back to target indices. Entries that
+    are missing, malformed or have no explanation are left out.
+    """
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        return {}
+
+    parsed: Dict[int, SimplifiedContent] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        match = _TARGET_RE.fullmatch(str(item.get("target")))
+        if match is None:
+            continue
+        index = int(match.group(1))
+        explanation = item.get("explanation")
+        if index not in group or not isinstance(explanation, str) or not explanation.strip():
+            continue
+        language, level = targets[index]
+        # The target is what was asked for, whatever the model echoes back.
+        parsed[index] = _to_simplified(dict(item, language=language, level=level), language, level)
+    return parsed
+
+
+def translate_many(
+    text: str,
+    targets: Iterable[Target],
+    topic: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    max_workers: int = 4,
+    call_fn: Optional[CallFn] = None,
+) -> Dict[Target, SimplifiedContent]:
+    """
+    Translate and simplify one text for several ``(language, level)`` targets.
+
+    Targets are grouped into as few prompts as ``token_budget`` (default
+    ``Config.TRANSLATE_BATCH_TOKEN_BUDGET``) allows, so the source text is
+    sent once per group instead of once per target. Groups run concurrently;
+    any target whose entry is missing or malformed is retried on its own
+    with ``translate_and_simplify``.
+
+    Returns a dict keyed by ``(language, level)``.
+    """
+    targets = list(dict.fromkeys(targets))
+    if not text or not targets:
+        return {t: translate_and_simplify(text, t[0], t[1], topic, call_fn) for t in targets}
+
+    llm_call = call_fn or call_llm_json
+    budget = token_budget or Config.TRANSLATE_BATCH_TOKEN_BUDGET
+    groups = _pack_targets(targets, text, budget)
+
+    def _run_group(group: List[int]) -> Dict[int, SimplifiedContent]:
+        if len(group) == 1:
+            return {}  # a single target goes through the regular (shared-cache) prompt
+        prompt = _MULTI_PROMPT.format(
+            count=len(group),
+            targets="\n".join(
+                f"TARGET [{i}]: language={targets[i][0]}, level={targets[i][1]}" for i in group
+            ),
+            topic=topic or "N/A",
+            text=text[:INPUT_CHAR_LIMIT],
+        )
+        try:
+            return _parse_multi_result(llm_call(prompt), group, targets)
+        except Exception:
+            logger.exception("Multi-target translation failed; retrying targets individually")
+            return {}
+
+    def _retry(i: int) -> Tuple[int, SimplifiedContent]:
+        language, level = targets[i]
+        return i, translate_and_simplify(text, language, level, topic, call_fn)
+
+    results: Dict[int, SimplifiedContent] = {}
+    workers = min(max_workers, len(groups))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for parsed in pool.map(bind_priority(_run_group), groups):
+                results.update(parsed)
+    else:
+        for group in groups:
+            results.update(_run_group(group))
+
+    missing = [i for i in range(len(targets)) if i not in results]
+    if len(missing) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            results.update(pool.map(bind_priority(_retry), missing))
+    else:
+        results.update(_retry(i) for i in missing)
+
+    return {targets[i]: results[i] for i in range(len(targets))}
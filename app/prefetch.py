@@ -0,0 +1,447 @@
+"""
+Background prefetch: precompute scout results for known syllabus topics.
+
+Jobs (topic, language, level) live in a small SQLite queue. A runner claims
+them, computes search + enrichment + ``translate_and_simplify`` in worker
+processes, and writes the results where the request path looks first:
+
+- the query cache (``Config.QUERY_CACHE_PATH`` disk tier) under the same keys
+  ``content_scout_agent`` uses, for both the search-only and enriched forms;
+- the LLM response cache (``Config.LLM_CACHE_PATH``), so later simplification
+  requests for the same text and target are cache hits;
+- the retrieval index (``Config.RAG_INDEX_PATH``), written by the runner
+  process only so the index has a single writer. Interactive searches reach
+  it through ``queue_for_indexing``, which hands them to the runner.
+
+Finished jobs are re-queued once older than ``Config.PREFETCH_MAX_AGE``.
+
+    python -m app.prefetch enqueue topics.json
+    python -m app.prefetch run
+    python -m app.prefetch status
+
+``topics.json`` maps language -> level -> topics, e.g.
+``{"hi": {"beginner": ["trigonometry", "photosynthesis"]}}``.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from agents.content_scout.query_cache import get_query_cache, query_key
+from agents.content_scout.schemas import Resource
+from agents.content_scout.scout import iter_content_scout
+from agents.conversation_agent.retrieval import get_vector_store, index_resources
+from agents.translator_simplifier.translate import translate_and_simplify
+from core.config import Config
+from core.ratelimit import BACKGROUND, priority_scope, set_background_share
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    language TEXT NOT NULL,
+    level TEXT NOT NULL,
+    num_results INTEGER NOT NULL,
+    include_videos INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_until REAL,
+    finished_at REAL,
+    error TEXT,
+    UNIQUE (topic, language, level, num_results, include_videos)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, not_before);
+"""
+
+
+class JobQueue:
+    """
+    Persistent queue of prefetch jobs, safe to share between processes.
+
+    Each (topic, language, level, num_results, include_videos) has one row:
+    enqueueing it again re-queues a finished or failed job rather than
+    duplicating it. A claimed job holds a lease; if its runner dies the job
+    becomes claimable again once the lease runs out.
+    """
+
+    def __init__(self, path: str, lease: float = 600.0):
+        self.path = path
+        self.lease = lease
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def enqueue(
+        self,
+        topic: str,
+        language: str,
+        level: str,
+        num_results: Optional[int] = None,
+        include_videos: bool = True,
+        refresh: bool = True,
+    ) -> None:
+        """Queue a job; with ``refresh`` False an existing one is left as it is."""
+        num_results = num_results or Config.PREFETCH_NUM_RESULTS
+        with self._lock:
+            if not refresh:
+                self._conn.execute(
+                    """
+                    INSERT INTO jobs (topic, language, level, num_results, include_videos, status)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (topic, language, level, num_results, include_videos) DO NOTHING
+                    """,
+                    (topic, language, level, num_results, int(include_videos), QUEUED),
+                )
+                return
+            self._conn.execute(
+                """
+                INSERT INTO jobs (topic, language, level, num_results, include_videos, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (topic, language, level, num_results, include_videos)
+                DO UPDATE SET status = excluded.status, attempts = 0, not_before = 0, error = NULL
+                WHERE jobs.status IN (?, ?)
+                """,
+                (topic, language, level, num_results, int(include_videos), QUEUED, DONE, FAILED),
+            )
+
+    def claim(self) -> Optional[Dict]:
+        """Take the oldest runnable job (queued, or running with an expired lease)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT id, topic, language, level, num_results, include_videos, attempts
+                    FROM jobs
+                    WHERE (status = ? AND not_before <= ?) OR (status = ? AND lease_until < ?)
+                    ORDER BY not_before, id LIMIT 1
+                    """,
+                    (QUEUED, now, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, lease_until = ? WHERE id = ?",
+                        (RUNNING, now + self.lease, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        keys = ("id", "topic", "language", "level", "num_results", "include_videos", "attempts")
+        job = dict(zip(keys, row))
+        job["include_videos"] = bool(job["include_videos"])
+        return job
+
+    def complete(self, job_id: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, lease_until = NULL, error = NULL WHERE id = ?",
+                (DONE, time.time(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str) -> None:
+        """Retry with exponential backoff up to ``Config.PREFETCH_MAX_ATTEMPTS``."""
+        with self._lock:
+            (attempts,) = self._conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            attempts += 1
+            status = QUEUED if attempts < Config.PREFETCH_MAX_ATTEMPTS else FAILED
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = ?, not_before = ?, lease_until = NULL,
+                    finished_at = ?, error = ?
+                WHERE id = ?
+                """,
+                (status, attempts, time.time() + 60 * 2 ** attempts, time.time(), error, job_id),
+            )
+
+    def requeue_stale(self, max_age: float) -> int:
+        """Re-queue finished jobs older than ``max_age`` seconds."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, not_before = 0 WHERE status = ? AND finished_at < ?",
+                (QUEUED, DONE, time.time() - max_age),
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_QUEUE: Optional[JobQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide queue at ``Config.PREFETCH_QUEUE_PATH``."""
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                _QUEUE = JobQueue(Config.PREFETCH_QUEUE_PATH)
+    return _QUEUE
+
+
+def set_job_queue(queue: Optional[JobQueue]) -> None:
+    """Swap or (with None) reset the process-wide queue, e.g. for tests."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        _QUEUE = queue
+
+
+def queue_for_indexing(
+    topic: str, language: str, level: str, num_results: int, include_videos: bool = True
+) -> None:
+    """
+    Hand an interactive search to the prefetch runner, the retrieval index's
+    single writer, so its pages get indexed too. Jobs that already exist are
+    left alone; the runner refreshes them on its own schedule. Does nothing
+    unless ``Config.RAG_INDEX_PATH`` is set; failures are only logged.
+    """
+    if not Config.RAG_INDEX_PATH:
+        return
+    try:
+        get_job_queue().enqueue(topic, language, level, num_results, include_videos, refresh=False)
+    except Exception:
+        logger.exception("Could not queue %r for retrieval indexing", topic)
+
+
+def enqueue_topics(queue: JobQueue, topics: Dict[str, Dict[str, List[str]]]) -> int:
+    """Queue every topic in a ``{language: {level: [topics]}}`` mapping."""
+    n = 0
+    for language, levels in topics.items():
+        for level, names in levels.items():
+            for topic in names:
+                queue.enqueue(topic, language, level)
+                n += 1
+    return n
+
+
+def compute_job(job: Dict) -> Dict:
+    """
+    Search, enrich and pre-translate one job's topic. Runs in a worker
+    process at background priority and returns plain dicts.
+    """
+    search: List[dict] = []
+    enriched: Dict[int, dict] = {}
+    with priority_scope(BACKGROUND):
+        for event, payload in iter_content_scout(
+            topic=job["topic"],
+            language=job["language"],
+            level=job["level"],
+            num_results=job["num_results"],
+            include_videos=job["include_videos"],
+            enrich_top_k=0,
+        ):
+            if event == "results":
+                search = payload["resources"]
+            elif event == "resource":
+                enriched[payload["index"]] = payload["resource"]
+
+        resources = [enriched[i] for i in sorted(enriched)]
+        translated = 0
+        for r in resources[: Config.PREFETCH_TRANSLATE_TOP]:
+            if r.get("raw_text"):
+                # Only the LLM cache side effect matters here.
+                translate_and_simplify(
+                    r["raw_text"], target_language=job["language"], level=job["level"], topic=job["topic"]
+                )
+                translated += 1
+
+    return {"search": search, "enriched": resources, "translated": translated}
+
+
+def store_results(job: Dict, result: Dict) -> None:
+    """Write a computed job into the query cache and retrieval index."""
+    cache = get_query_cache()
+    if cache is not None:
+        # Everything is enriched here, which also answers top-K requests.
+        entries = [(False, 0, result["search"]), (True, 0, result["enriched"])]
+        if Config.SCOUT_ENRICH_TOP_K:
+            entries.append((True, Config.SCOUT_ENRICH_TOP_K, result["enriched"]))
+        for enrich, top_k, dumped in entries:
+            key = query_key(
+                job["topic"],
+                job["language"],
+                job["level"],
+                job["num_results"],
+                job["include_videos"],
+                enrich,
+                top_k,
+                Config.SCOUT_SEARCH_QUERIES,
+            )
+            enriched = (top_k or job["num_results"]) if enrich else 0
+            cache.put(key, [Resource(**d) for d in dumped], enriched=enriched)
+    if Config.RAG_INDEX_PATH:
+        store = get_vector_store()
+        index_resources(store, [Resource(**d) for d in result["enriched"]])
+        store.flush()
+
+
+def _init_worker(share: float) -> None:
+    # Each worker process has its own limiters, so the background share is
+    # split between them. Inline runs use the limiter's default share.
+    set_background_share(share)
+
+
+class PrefetchRunner:
+    """
+    Claims jobs from ``queue`` and runs up to ``processes`` of them at once
+    on a process pool; ``processes=0`` runs them inline (tests, debugging).
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        processes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        poll_interval: float = 5.0,
+    ):
+        self.queue = queue
+        self.processes = Config.PREFETCH_PROCESSES if processes is None else processes
+        self.max_age = Config.PREFETCH_MAX_AGE if max_age is None else max_age
+        self.refresh_interval = (
+            Config.PREFETCH_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        )
+        self.poll_interval = poll_interval
+        self._last_refresh = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.processes > 0:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(Config.PREFETCH_QUOTA_SHARE / self.processes,),
+            )
+        cache = get_query_cache()
+        if cache is None or cache.cache.disk is None:
+            logger.warning("QUERY_CACHE_PATH not set: prefetched results won't reach the server.")
+
+    def _finish(self, job: Dict, result: Optional[Dict], error: Optional[BaseException]) -> None:
+        if error is None:
+            try:
+                store_results(job, result)
+            except Exception as e:
+                error = e
+        if error is None:
+            self.queue.complete(job["id"])
+            logger.info("Prefetched %s [%s/%s]", job["topic"], job["language"], job["level"])
+        else:
+            self.queue.fail(job["id"], str(error))
+            logger.warning("Prefetch of %s failed: %s", job["topic"], error)
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = time.monotonic()
+            n = self.queue.requeue_stale(self.max_age)
+            if n:
+                logger.info("Re-queued %d stale prefetch jobs", n)
+
+    def run_once(self) -> int:
+        """Run queued jobs until none are runnable. Returns how many ran."""
+        self._maybe_refresh()
+        ran = 0
+        if self._executor is None:
+            while (job := self.queue.claim()) is not None:
+                try:
+                    result, error = compute_job(job), None
+                except Exception as e:
+                    result, error = None, e
+                self._finish(job, result, error)
+                ran += 1
+            return ran
+
+        running: Dict[Future, Dict] = {}
+        while True:
+            while len(running) < self.processes and (job := self.queue.claim()) is not None:
+                running[self._executor.submit(compute_job, job)] = job
+            if not running:
+                return ran
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                self._finish(job, None if future.exception() else future.result(), future.exception())
+                ran += 1
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            if self.run_once() == 0:
+                stop.wait(self.poll_interval)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--queue", default=Config.PREFETCH_QUEUE_PATH, help="SQLite queue file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enqueue = sub.add_parser("enqueue", help="queue topics from a {language: {level: [topics]}} JSON file")
+    enqueue.add_argument("topics")
+    run = sub.add_parser("run", help="process jobs, re-queueing stale ones on a schedule")
+    run.add_argument("--processes", type=int, default=None)
+    run.add_argument("--once", action="store_true", help="exit when the queue is drained")
+    sub.add_parser("status", help="print job counts per status")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    queue = JobQueue(args.queue)
+    try:
+        if args.command == "enqueue":
+            with open(args.topics, encoding="utf-8") as f:
+                print(f"queued {enqueue_topics(queue, json.load(f))} jobs")
+        elif args.command == "run":
+            runner = PrefetchRunner(queue, processes=args.processes)
+            try:
+                if args.once:
+                    runner.run_once()
+                else:
+                    runner.run_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                runner.shutdown()
+        else:
+            print(json.dumps(queue.counts(), indent=2))
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,23 @@
 # FastAPI backend exposing endpoints
 """FastAPI server and API endpoints."""
 
+import json
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from agents.content_scout.query_cache import query_cache_stats
+from agents.content_scout.scout import find_learning_resources, iter_content_scout
+from agents.translator_simplifier import translate_and_simplify_stream
+from app.prefetch import queue_for_indexing
 from core.config import Config
+from core.llm import llm_cache_stats
+from core.metrics import render_prometheus
+from core.ratelimit import rate_limiter_states
+from core.resilience import breaker_states
 
 app = FastAPI(title="Learning Helper API")
 
@@ -21,10 +35,94 @@ def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @app.get("/api/search")
-def search(query: str):
+def search(query: str, language: str = "en", level: str = "beginner", num_results: int = 8):
     """Search for learning resources."""
-    pass
+    return find_learning_resources(
+        topic=query, language=language, level=level, num_results=num_results
+    )
+
+@app.get("/api/search/stream")
+def search_stream(
+    query: str,
+    language: str = "en",
+    level: str = "beginner",
+    num_results: int = 8,
+    include_videos: bool = True,
+    enrich_top_k: Optional[int] = None,
+    search_queries: Optional[int] = None,
+):
+    """
+    Stream search results as Server-Sent Events: raw search hits first,
+    then each enriched resource as soon as it is fetched and summarized.
+    ``enrich_top_k`` limits enrichment to the best-ranked results;
+    ``search_queries`` > 1 searches several phrasings at once.
+
+    The query is also queued for the prefetch runner so its pages reach the
+    retrieval index (see ``queue_for_indexing``).
+    """
+    queue_for_indexing(query, language, level, num_results, include_videos)
+    events = iter_content_scout(
+        topic=query,
+        language=language,
+        level=level,
+        num_results=num_results,
+        include_videos=include_videos,
+        enrich_top_k=enrich_top_k,
+        search_queries=search_queries,
+    )
+    return StreamingResponse(
+        (_sse(event, data) for event, data in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+class SimplifyRequest(BaseModel):
+    text: str
+    target_language: str = "hi"
+    level: str = "school"
+    topic: Optional[str] = None
+
+def _simplify_events(req: SimplifyRequest):
+    for event in translate_and_simplify_stream(
+        req.text, target_language=req.target_language, level=req.level, topic=req.topic
+    ):
+        if event["type"] == "done":
+            yield _sse("done", event["value"].model_dump())
+        else:
+            yield _sse(event["type"], event)
+
+@app.post("/api/simplify/stream")
+def simplify_stream(req: SimplifyRequest):
+    """
+    Stream a translation/simplification as Server-Sent Events: each top-level
+    field and each ``step_by_step`` / ``keywords`` item as soon as the model
+    finishes it, then the complete result as ``done``.
+    """
+    return StreamingResponse(
+        _simplify_events(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/stats/cache")
+def cache_stats():
+    """Hit/miss/coalesced counters for the query and LLM response caches."""
+    return {"query": query_cache_stats(), "llm": llm_cache_stats()}
+
+@app.get("/api/stats/llm")
+def llm_stats():
+    """Circuit breaker state per model and remaining quota / queue depth per provider."""
+    return {"breakers": breaker_states(), "quota": rate_limiter_states()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint for per-stage latency, error, byte and token metrics."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 @app.post("/api/resources")
 def add_resource(resource: dict):
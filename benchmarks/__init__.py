@@ -0,0 +1 @@
+# Offline benchmarks (recorded fixtures + local stand-in server)
@@ -0,0 +1,50 @@
+"""
+Diff two benchmark reports produced by ``benchmarks.run``.
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+import json
+import sys
+from typing import Dict, Iterator, Tuple
+
+# Metrics where a larger number is an improvement.
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def _flatten(prefix: str, value) -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, inner in value.items():
+            yield from _flatten(f"{prefix}.{key}" if prefix else key, inner)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def compare(before: Dict, after: Dict) -> str:
+    old = dict(_flatten("", {"pipelines": before["pipelines"], "peak_rss_kib": before["peak_rss_kib"]}))
+    new = dict(_flatten("", {"pipelines": after["pipelines"], "peak_rss_kib": after["peak_rss_kib"]}))
+
+    lines = [f"{'metric':55} {'before':>12} {'after':>12} {'change':>9}"]
+    for key in sorted(old.keys() & new.keys()):
+        a, b = old[key], new[key]
+        change = (b - a) / a * 100 if a else 0.0
+        better = change > 0 if key.rsplit(".", 1)[-1] in HIGHER_IS_BETTER else change < 0
+        marker = "" if abs(change) < 1 else (" +" if better else " -")
+        lines.append(f"{key:55} {a:12.2f} {b:12.2f} {change:8.1f}%{marker}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    if len(sys.argv) != 3:
+        print(__doc__.strip())
+        return 2
+    with open(sys.argv[1], encoding="utf-8") as fh:
+        before = json.load(fh)
+    with open(sys.argv[2], encoding="utf-8") as fh:
+        after = json.load(fh)
+    print(compare(before, after))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
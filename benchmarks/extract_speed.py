@@ -0,0 +1,72 @@
+"""
+Compare the lxml single-parse extractor with the readability + BeautifulSoup
+path on a corpus of saved pages (default: ``benchmarks/fixtures/pages``).
+
+    python -m benchmarks.extract_speed --repeat 20 [--pages DIR]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.content_scout.extract import extract_main_text
+from agents.content_scout.fetch_clean import _readability_extract
+
+from benchmarks.stub_server import FIXTURES
+
+
+def _time_per_call(fn, html: str, repeat: int) -> float:
+    fn(html)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def run(pages_dir: Path, repeat: int) -> Dict:
+    pages: List[Dict] = []
+    total_fast = total_old = 0.0
+    for path in sorted(pages_dir.glob("*.htm*")):
+        html = path.read_text(encoding="utf-8", errors="replace")
+        fast = _time_per_call(extract_main_text, html, repeat)
+        old = _time_per_call(_readability_extract, html, repeat)
+        _, fast_text = extract_main_text(html)
+        total_fast += fast
+        total_old += old
+        pages.append(
+            {
+                "page": path.name,
+                "bytes": len(html.encode("utf-8")),
+                "lxml_ms": round(fast * 1000, 3),
+                "readability_ms": round(old * 1000, 3),
+                "speedup": round(old / fast, 2) if fast else None,
+                "lxml_found_content": bool(fast_text),
+            }
+        )
+    return {
+        "repeat": repeat,
+        "pages": pages,
+        "total_lxml_ms": round(total_fast * 1000, 3),
+        "total_readability_ms": round(total_old * 1000, 3),
+        "speedup": round(total_old / total_fast, 2) if total_fast else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTML extraction speed comparison")
+    parser.add_argument("--pages", type=Path, default=FIXTURES / "pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.pages, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+"""
+Cold-start import cost of the entry-point modules.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+(the first run warms the bytecode cache and is discarded); the report gives
+the median cumulative import time per module, its slowest dependencies, and
+any module from ``--forbid`` that got imported along the way.
+
+    python -m benchmarks.import_time --repeat 5 --output imports.json
+    python -m benchmarks.import_time --max-ms 800   # exit 1 when over budget
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = ["core.config", "core.llm", "agents.content_scout", "app.server"]
+
+# Heavy optional SDKs that must only load when actually used.
+FORBIDDEN = ["google.adk", "google.genai", "google.generativeai"]
+
+
+def parse_importtime(stderr: str, module: str) -> Dict[str, Dict[str, int]]:
+    """
+    ``-X importtime`` output -> {name: {"self_us", "cumulative_us"}} for
+    ``module`` and everything it imported (interpreter startup is left out).
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        nested = name.startswith("  ")
+        entries.append((name.strip(), nested, int(self_us), int(cumulative_us)))
+
+    # A module's line follows the (indented) lines of what it imported.
+    timings: Dict[str, Dict[str, int]] = {}
+    for i in range(len(entries) - 1, -1, -1):
+        name, nested, self_us, cumulative_us = entries[i]
+        if name == module and not nested:
+            timings[name] = {"self_us": self_us, "cumulative_us": cumulative_us}
+            for name, nested, self_us, cumulative_us in reversed(entries[:i]):
+                if not nested:
+                    break
+                # ``import a.b`` also lists a nested ``a.b``; keep the top-level total.
+                timings.setdefault(name, {"self_us": self_us, "cumulative_us": cumulative_us})
+            break
+    return timings
+
+
+def import_once(module: str) -> Dict[str, Dict[str, int]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr, module)
+
+
+def measure(module: str, repeat: int, top: int, forbid: List[str]) -> Dict:
+    import_once(module)  # warm the bytecode cache
+    runs = [import_once(module) for _ in range(repeat)]
+    last = runs[-1]
+    slowest = sorted(
+        (name for name in last if name != module),
+        key=lambda name: last[name]["cumulative_us"],
+        reverse=True,
+    )[:top]
+    return {
+        "median_ms": round(statistics.median(r[module]["cumulative_us"] for r in runs) / 1000, 1),
+        "modules_imported": len(last),
+        "slowest": {name: round(last[name]["cumulative_us"] / 1000, 1) for name in slowest},
+        "forbidden_imported": sorted(
+            name for name in last if any(name == f or name.startswith(f + ".") for f in forbid)
+        ),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest dependencies to list")
+    parser.add_argument("--forbid", nargs="*", default=FORBIDDEN)
+    parser.add_argument("--max-ms", type=float, help="fail if any module's median exceeds this")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {m: measure(m, args.repeat, args.top, args.forbid) for m in args.modules}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    failed = [m for m, r in report.items() if r["forbidden_imported"]]
+    if args.max_ms is not None:
+        failed += [m for m, r in report.items() if r["median_ms"] > args.max_ms]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
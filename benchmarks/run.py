@@ -0,0 +1,281 @@
+"""
+Offline benchmark for the content scout and translator pipelines.
+
+Recorded Serper results, HTML pages, transcripts and LLM responses are served
+by a local stand-in server (``stub_server.StubServer``) with configurable
+latency and jitter, and driven through the real ``content_scout_agent`` /
+``translate_and_simplify`` code paths. The report is JSON so runs from two
+commits can be diffed with ``python -m benchmarks.compare``.
+
+    python -m benchmarks.run --requests 40 --concurrency 8 \\
+        --page-latency 0.05 --llm-latency 0.2 --jitter 0.02 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import requests
+
+from agents.content_scout import langid, search_google, summarize
+from agents.content_scout.fetch_youtube import _extract_youtube_video_id
+from agents.content_scout.scout import content_scout_agent
+from agents.translator_simplifier.translate import translate_and_simplify, translate_many
+from core.cache import LRUCache
+from core.config import Config
+from core.llm import LLMInterface, _parse_json_response, set_llm, set_llm_cache
+from core.ratelimit import set_rate_limiter
+
+from benchmarks.stub_server import FIXTURES, StubServer
+
+
+class ReplayLLM(LLMInterface):
+    """LLM backend that sends prompts to the stand-in server's ``/llm`` route."""
+
+    model = "replay"
+
+    def __init__(self, base_url: str):
+        self.url = f"{base_url}/llm"
+        self.session = requests.Session()
+
+    def call_json(self, prompt: str, model: Optional[str] = None) -> Dict:
+        resp = self.session.post(self.url, json={"prompt": prompt}, timeout=30)
+        resp.raise_for_status()
+        return _parse_json_response(resp.text)
+
+
+def make_fetch_video(base_url: str) -> Callable:
+    session = requests.Session()
+
+    def fetch_video(url: str, languages: Optional[List[str]] = None) -> dict:
+        video_id = _extract_youtube_video_id(url)
+        resp = session.get(f"{base_url}/transcripts/{video_id}", timeout=10)
+        if resp.status_code != 200:
+            return {"ok": False, "title": "", "text": "", "language": None, "error": "not found"}
+        data = resp.json()
+        return {
+            "ok": True,
+            "title": "",
+            "text": "\n".join(data["snippets"]),
+            "language": data["language_code"],
+            "error": None,
+        }
+
+    return fetch_video
+
+# One resource for a multilingual classroom: four languages at two levels.
+CLASSROOM_TARGETS = [
+    (language, level) for language in ("hi", "ta", "bn", "mr") for level in ("school", "college")
+]
+
+
+@contextmanager
+def cold_caches(caches: List[LRUCache]) -> Iterator[None]:
+    """
+    Turn the in-process memo caches off for the block, so every request
+    pays for chunk summaries and language detection like a first visit.
+    """
+    sizes = [cache.max_entries for cache in caches]
+    for cache in caches:
+        cache.clear()
+        cache.max_entries = 0
+    try:
+        yield
+    finally:
+        for cache, size in zip(caches, sizes):
+            cache.max_entries = size
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure(fn: Callable[[], object], requests_count: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+
+    def one(_):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, i) for i in range(requests_count)]
+        for f in futures:
+            try:
+                latencies.append(f.result())
+            except Exception:
+                errors += 1
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": requests_count,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        },
+    }
+
+
+def measure_allocations(fn: Callable[[], object], samples: int) -> Dict:
+    """
+    Python-level allocations per request, measured sequentially under
+    tracemalloc (kept out of the latency run because tracing is slow).
+    """
+    peaks: List[int] = []
+    blocks: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            before_snapshot = tracemalloc.take_snapshot()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            after_snapshot = tracemalloc.take_snapshot()
+            peaks.append(peak - before)
+            blocks.append(
+                sum(
+                    max(stat.count_diff, 0)
+                    for stat in after_snapshot.compare_to(before_snapshot, "filename")
+                )
+            )
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_alloc_kib_per_request": round(sum(peaks) / len(peaks) / 1024, 1),
+        "retained_blocks_per_request": round(sum(blocks) / len(blocks), 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict:
+    latency = {
+        "search": args.search_latency,
+        "page": args.page_latency,
+        "transcript": args.page_latency,
+        "llm": args.llm_latency,
+    }
+    # Measure the pipelines themselves, not the caches in front of them.
+    Config.FETCH_CACHE_PATH = None
+    if not args.llm_cache:
+        Config.LLM_CACHE_SIZE = 0
+    set_llm_cache(None)
+    # The stub server has no quota; don't let client-side Serper limits pace the run.
+    Config.SERPER_REQUESTS_PER_MIN = 0
+    set_rate_limiter("serper", None)
+    # Repeated requests for the same fixtures would otherwise be served from
+    # the chunk summary and language memos after the warm-up.
+    memo_caches = [] if args.warm_caches else [summarize._CHUNK_CACHE, langid._CACHE]
+
+    stub = StubServer(latency=latency, jitter=args.jitter, seed=args.seed)
+    with stub as server, cold_caches(memo_caches):
+        search_google.SERPER_ENDPOINT = f"{server.base_url}/search"
+        search_google.SERPER_API_KEY = "offline-benchmark"
+        set_llm(ReplayLLM(server.base_url))
+        fetch_video = make_fetch_video(server.base_url)
+        translate_text = (FIXTURES / "translate_input.txt").read_text(encoding="utf-8")
+
+        pipelines = {
+            "scout": lambda: content_scout_agent(
+                "Trigonometry basics",
+                enrich=True,
+                fetch_video_fn=fetch_video,
+                use_cache=False,
+            ),
+            "translate": lambda: translate_and_simplify(
+                translate_text, target_language="hi", level="school", topic="Trigonometry"
+            ),
+            "translate_many": lambda: translate_many(
+                translate_text, CLASSROOM_TARGETS, topic="Trigonometry"
+            ),
+        }
+
+        results = {}
+        for name, fn in pipelines.items():
+            if args.only and name not in args.only:
+                continue
+            fn()  # warm-up: imports, connection pools, langdetect profiles
+            results[name] = measure(fn, args.requests, args.concurrency)
+            results[name].update(measure_allocations(fn, args.alloc_samples))
+        set_llm(None)
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_seconds": latency,
+            "jitter_seconds": args.jitter,
+            "seed": args.seed,
+            "llm_cache": args.llm_cache,
+            "warm_caches": args.warm_caches,
+        },
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "pipelines": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    parser.add_argument("--page-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--alloc-samples", type=int, default=3)
+    parser.add_argument("--llm-cache", action="store_true", help="keep the LLM response cache on")
+    parser.add_argument(
+        "--warm-caches",
+        action="store_true",
+        help="keep the chunk summary and language detection memos on",
+    )
+    parser.add_argument("--only", nargs="*", choices=["scout", "translate", "translate_many"])
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,150 @@
+"""Local stand-in for Serper, web pages, YouTube transcripts and the LLM."""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+_RESOURCE_RE = re.compile(r"RESOURCE \[(\d+)\]")
+_TARGET_RE = re.compile(r"TARGET \[(\d+)\]: language=(\S+), level=(\S+)")
+
+
+def llm_response_for(prompt: str, recorded: dict) -> dict:
+    """
+    Pick the recorded LLM response matching the kind of prompt we were sent.
+    """
+    if "RESOURCE [" in prompt:
+        return {
+            "results": [
+                dict(recorded["summary"], index=int(i)) for i in _RESOURCE_RE.findall(prompt)
+            ]
+        }
+    if "TARGET [" in prompt:
+        return {
+            "results": [
+                dict(recorded["translate"], target=int(i), language=language, level=level)
+                for i, language, level in _TARGET_RE.findall(prompt)
+            ]
+        }
+    if '"notes"' in prompt:
+        return recorded["notes"]
+    if "TARGET LANGUAGE" in prompt:
+        return recorded["translate"]
+    return recorded["summary"]
+
+
+class StubServer:
+    """
+    Threaded HTTP server replaying recorded fixtures with configurable
+    latency and jitter (seconds) per route kind.
+
+    Routes:
+    - ``POST /search``              recorded Serper JSON (links point back here)
+    - ``GET  /pages/<name>``        recorded HTML page
+    - ``GET  /transcripts/<id>``    recorded transcript JSON
+    - ``POST /llm``                 recorded model output for ``{"prompt": ...}``
+    """
+
+    def __init__(
+        self,
+        latency: Optional[dict] = None,
+        jitter: float = 0.0,
+        seed: int = 0,
+        fixtures: Path = FIXTURES,
+    ):
+        self.latency = {"search": 0.0, "page": 0.0, "transcript": 0.0, "llm": 0.0}
+        self.latency.update(latency or {})
+        self.jitter = jitter
+        self.fixtures = fixtures
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._llm = json.loads((fixtures / "llm_responses.json").read_text(encoding="utf-8"))
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self.base_url = ""
+
+    def _sleep(self, kind: str) -> None:
+        with self._rng_lock:
+            extra = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+        delay = self.latency.get(kind, 0.0) + extra
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def do_POST(self):
+                payload = self._body()
+                if self.path == "/search":
+                    server._sleep("search")
+                    raw = (server.fixtures / "serper_trigonometry.json").read_text(encoding="utf-8")
+                    body = raw.replace("{base}", server.base_url).encode("utf-8")
+                    return self._send(200, body, "application/json")
+                if self.path == "/llm":
+                    server._sleep("llm")
+                    prompt = json.loads(payload or b"{}").get("prompt", "")
+                    text = "```json\n" + json.dumps(
+                        llm_response_for(prompt, server._llm), ensure_ascii=False
+                    ) + "\n```"
+                    return self._send(200, text.encode("utf-8"), "text/plain; charset=utf-8")
+                self._send(404, b"not found", "text/plain")
+
+            def do_GET(self):
+                kind, _, name = self.path.lstrip("/").partition("/")
+                if kind == "pages":
+                    path = server.fixtures / "pages" / name
+                    content_type = "text/html; charset=utf-8"
+                    server._sleep("page")
+                elif kind == "transcripts":
+                    path = server.fixtures / "transcripts" / f"{name}.json"
+                    content_type = "application/json"
+                    server._sleep("transcript")
+                else:
+                    return self._send(404, b"not found", "text/plain")
+                if not path.is_file():
+                    return self._send(404, b"not found", "text/plain")
+                self._send(200, path.read_bytes(), content_type)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_port}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -1,5 +1,14 @@
 # Core module
 from .config import Config
-from .llm import LLMInterface
 
-__all__ = ["Config", "LLMInterface"]
+__all__ = ["Config", "GeminiLLM", "LLMInterface", "get_llm"]
+
+
+def __getattr__(name):
+    # The LLM wrapper (and asyncio under it) loads on first use, so modules
+    # that only need ``core.config`` stay cheap to import.
+    if name in ("GeminiLLM", "LLMInterface", "get_llm"):
+        from . import llm
+
+        return getattr(llm, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,80 @@
+"""Split long text into token-bounded chunks on paragraph/sentence boundaries."""
+
+import hashlib
+import re
+from typing import List
+
+from core.utils import estimate_tokens
+
+_PARAGRAPH_RE = re.compile(r"\n+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?।])\s+")
+
+
+def _hard_split(text: str, max_tokens: int) -> List[str]:
+    size = max_tokens * 4
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _units(text: str, max_tokens: int) -> List[str]:
+    """
+    Break text into paragraphs, then sentences, then fixed-size slices, until
+    every unit fits in ``max_tokens``.
+    """
+    units: List[str] = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                units.append(sentence)
+            else:
+                units.extend(_hard_split(sentence, max_tokens))
+    return units
+
+
+def _is_anchor(unit: str, cost: int, target: int) -> bool:
+    """
+    Content-defined cut point: a chunk ends after ``unit`` with probability
+    ``cost / target``, decided by the unit's own hash, so the decision
+    doesn't depend on anything before it.
+    """
+    digest = hashlib.blake2b(unit.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") / 2**64 < cost / target
+
+
+def chunk_text(text: str, max_tokens: int = 1500) -> List[str]:
+    """
+    Pack paragraphs (or sentences, for very long paragraphs) into chunks of
+    at most ``max_tokens`` estimated tokens.
+
+    Chunks end at hash-anchored units (about ``max_tokens / 2`` tokens apart
+    on average) or when the next unit would overflow. Because anchors depend
+    only on the unit itself, an edit moves boundaries only up to the next
+    anchor, and the rest of an edited page keeps its chunks (and their
+    cached summaries).
+    """
+    units = _units(text, max_tokens)
+    if sum(estimate_tokens(u) for u in units) <= max_tokens:
+        return ["\n".join(units)] if units else []
+
+    target = max(max_tokens // 2, 1)
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for unit in units:
+        cost = estimate_tokens(unit)
+        if current and used + cost > max_tokens:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        current.append(unit)
+        used += cost
+        if _is_anchor(unit, cost, target):
+            chunks.append("\n".join(current))
+            current, used = [], 0
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
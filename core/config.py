@@ -16,6 +16,97 @@ class Config:
     
     LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4")
     LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")  # openai | local
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+    
+    # LLM response cache (LLM_CACHE_SIZE=0 disables; set a path for the disk tier)
+    LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 1024))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+    LLM_CACHE_MAX_DISK_ENTRIES = int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", 100_000))
+    
+    # LLM retries and per-model circuit breakers (core/resilience.py)
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+    LLM_RETRY_ATTEMPTS = int(os.getenv("LLM_RETRY_ATTEMPTS", 3))
+    LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", 0.5))
+    LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", 8))
+    BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", 0.5))
+    BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", 5))
+    BREAKER_WINDOW = float(os.getenv("BREAKER_WINDOW", 60))
+    BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", 30))
+    
+    # Provider quotas enforced client-side (core/ratelimit.py; 0 = unlimited)
+    SERPER_REQUESTS_PER_MIN = float(os.getenv("SERPER_REQUESTS_PER_MIN", 300))
+    GEMINI_REQUESTS_PER_MIN = float(os.getenv("GEMINI_REQUESTS_PER_MIN", 1000))
+    GEMINI_TOKENS_PER_MIN = float(os.getenv("GEMINI_TOKENS_PER_MIN", 1_000_000))
+    
+    # Content scout enrichment
+    SCOUT_MAX_WORKERS = int(os.getenv("SCOUT_MAX_WORKERS", 4))
+    SCOUT_RESOURCE_TIMEOUT = float(os.getenv("SCOUT_RESOURCE_TIMEOUT", 30))
+    # Search hits are re-ranked on cheap features (agents/content_scout/ranking.py);
+    # with SCOUT_ENRICH_TOP_K > 0 only that many are fetched and summarized
+    SCOUT_RERANK = os.getenv("SCOUT_RERANK", "True").lower() == "true"
+    SCOUT_ENRICH_TOP_K = int(os.getenv("SCOUT_ENRICH_TOP_K", 0))
+    SCOUT_VIDEO_PREFERENCE = float(os.getenv("SCOUT_VIDEO_PREFERENCE", 0.0))
+    # Query phrasings sent concurrently per search and merged (1 = single query)
+    SCOUT_SEARCH_QUERIES = int(os.getenv("SCOUT_SEARCH_QUERIES", 1))
+    SCOUT_BATCH_SUMMARIES = os.getenv("SCOUT_BATCH_SUMMARIES", "True").lower() == "true"
+    SUMMARY_BATCH_TOKEN_BUDGET = int(os.getenv("SUMMARY_BATCH_TOKEN_BUDGET", 12000))
+    SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", 1200))
+    SUMMARY_MAX_CHUNKS = int(os.getenv("SUMMARY_MAX_CHUNKS", 24))
+    SUMMARY_CHUNK_CACHE_SIZE = int(os.getenv("SUMMARY_CHUNK_CACHE_SIZE", 4096))
+    # Near-duplicate pages share one summary (agents/content_scout/dedup.py);
+    # set DEDUP_INDEX_PATH to remember signatures across requests
+    SCOUT_DEDUP = os.getenv("SCOUT_DEDUP", "True").lower() == "true"
+    DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", 0.9))
+    DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", 50))
+    DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH")
+    DEDUP_INDEX_MAX_AGE = float(os.getenv("DEDUP_INDEX_MAX_AGE", 7 * 24 * 3600))
+    
+    # Multi-target translation (translate_many): prompt+output budget per call
+    TRANSLATE_BATCH_TOKEN_BUDGET = int(os.getenv("TRANSLATE_BATCH_TOKEN_BUDGET", 8000))
+    TRANSLATE_TARGET_TOKENS = int(os.getenv("TRANSLATE_TARGET_TOKENS", 900))
+    
+    # Shared HTTP transport (core/http_client.py)
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 32))
+    HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", 8))
+    
+    # content_scout_agent result cache (QUERY_CACHE_SIZE=0 disables)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 256))
+    QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", 6 * 3600))
+    QUERY_CACHE_PATH = os.getenv("QUERY_CACHE_PATH")
+    # TTL for empty results or ones with stub/missing summaries (0 = don't cache them)
+    QUERY_CACHE_NEGATIVE_TTL = float(os.getenv("QUERY_CACHE_NEGATIVE_TTL", 60))
+    
+    # HTML extraction: "lxml" (single-parse engine) or "readability"
+    EXTRACT_ENGINE = os.getenv("EXTRACT_ENGINE", "lxml")
+    EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", 2 * 1024 * 1024))
+    # Page downloads stop after this many bytes (nothing past EXTRACT_MAX_BYTES is parsed)
+    FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", EXTRACT_MAX_BYTES))
+    LANGID_CACHE_SIZE = int(os.getenv("LANGID_CACHE_SIZE", 4096))
+    # Worker processes for HTML parsing + language detection (0 = in-thread)
+    PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", 0))
+    
+    # Page fetch cache (disabled unless FETCH_CACHE_PATH is set)
+    FETCH_CACHE_PATH = os.getenv("FETCH_CACHE_PATH")
+    FETCH_CACHE_MAX_AGE = float(os.getenv("FETCH_CACHE_MAX_AGE", 3600))
+    FETCH_CACHE_MAX_ENTRIES = int(os.getenv("FETCH_CACHE_MAX_ENTRIES", 10000))
+    
+    # Conversation agent retrieval
+    RAG_CHUNK_TOKENS = int(os.getenv("RAG_CHUNK_TOKENS", 300))
+    RAG_INDEX_PATH = os.getenv("RAG_INDEX_PATH")
+    
+    # Background prefetch of syllabus topics (app/prefetch.py)
+    PREFETCH_QUEUE_PATH = os.getenv("PREFETCH_QUEUE_PATH", "data/prefetch.sqlite3")
+    PREFETCH_PROCESSES = int(os.getenv("PREFETCH_PROCESSES", 2))
+    PREFETCH_NUM_RESULTS = int(os.getenv("PREFETCH_NUM_RESULTS", 8))
+    PREFETCH_TRANSLATE_TOP = int(os.getenv("PREFETCH_TRANSLATE_TOP", 3))
+    PREFETCH_MAX_AGE = float(os.getenv("PREFETCH_MAX_AGE", 3 * 3600))
+    PREFETCH_REFRESH_INTERVAL = float(os.getenv("PREFETCH_REFRESH_INTERVAL", 300))
+    PREFETCH_MAX_ATTEMPTS = int(os.getenv("PREFETCH_MAX_ATTEMPTS", 3))
+    PREFETCH_QUOTA_SHARE = float(os.getenv("PREFETCH_QUOTA_SHARE", 0.5))
     
     FASTAPI_HOST = os.getenv("FASTAPI_HOST", "0.0.0.0")
     FASTAPI_PORT = int(os.getenv("FASTAPI_PORT", 8000))
@@ -0,0 +1,132 @@
+"""Shared HTTP transport: pooled keep-alive sessions, retries, per-host limits."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.config import Config
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Thin wrapper around a ``requests.Session`` shared by the Serper client and
+    the page fetcher.
+
+    - Connections are pooled and kept alive per host.
+    - Connection errors, and 429/5xx responses to idempotent requests, are
+      retried with exponential backoff (honouring ``Retry-After``). POSTs
+      come back as-is so callers can retry them through their rate limiter.
+    - At most ``per_host_limit`` requests run against any single host at once.
+    - Every request gets ``timeout`` unless the caller passes its own.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 32,
+        per_host_limit: int = 8,
+    ):
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = sem
+            return sem
+
+    @contextmanager
+    def host_slot(self, url: str) -> Iterator[None]:
+        """
+        Hold one of the host's concurrency slots for the duration of the block.
+        """
+        sem = self._host_limit(url)
+        with sem:
+            yield
+
+    def request(
+        self, method: str, url: str, timeout: Optional[float] = None, **kwargs
+    ) -> requests.Response:
+        with self.host_slot(url):
+            return self.session.request(
+                method, url, timeout=timeout or self.timeout, **kwargs
+            )
+
+    @contextmanager
+    def stream(
+        self, method: str, url: str, timeout: Optional[float] = None, **kwargs
+    ) -> Iterator[requests.Response]:
+        """
+        Send a request without reading the body. The host slot is held, and
+        the connection kept out of the pool, until the block exits.
+        """
+        with self.host_slot(url):
+            resp = self.session.request(
+                method, url, timeout=timeout or self.timeout, stream=True, **kwargs
+            )
+            try:
+                yield resp
+            finally:
+                resp.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_HTTP_CLIENT: Optional[HttpClient] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Return the process-wide HTTP client configured via ``Config.HTTP_*``.
+    """
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = HttpClient(
+                    timeout=Config.HTTP_TIMEOUT,
+                    max_retries=Config.HTTP_MAX_RETRIES,
+                    backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                    pool_maxsize=Config.HTTP_POOL_SIZE,
+                    per_host_limit=Config.HTTP_PER_HOST_LIMIT,
+                )
+    return _HTTP_CLIENT
@@ -0,0 +1,174 @@
+"""Incremental parser for a JSON object arriving in chunks from an LLM stream."""
+
+import json
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """
+    Feed it text chunks of one JSON object; it returns events as soon as
+    pieces of the object are complete:
+
+    - ``{"type": "field", "key": k, "value": v}`` when a top-level value ends;
+    - ``{"type": "item", "key": k, "index": i, "value": v}`` for each element
+      of a top-level array, before the array itself is closed.
+
+    Anything before the first ``{`` (e.g. a ```json fence) and after the
+    closing ``}`` is ignored.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # key | key_str | colon | value | in_value | comma
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.done = False
+        self.result: Dict[str, Any] = {}
+
+    def _field(self, events: List[Dict], raw: str) -> None:
+        value = json.loads(raw)
+        self.result[self._key] = value
+        events.append({"type": "field", "key": self._key, "value": value})
+
+    def _item(self, events: List[Dict], raw: str) -> None:
+        raw = raw.strip()
+        self._item_start = None
+        if not raw:
+            return
+        events.append(
+            {
+                "type": "item",
+                "key": self._array_key,
+                "index": self._item_index,
+                "value": json.loads(raw),
+            }
+        )
+        self._item_index += 1
+
+    def feed(self, chunk: str) -> List[Dict]:
+        events: List[Dict] = []
+        if self.done:
+            return events
+        self._text += chunk
+        text = self._text
+        in_array = lambda: self._depth == 2 and self._array_key is not None  # noqa: E731
+
+        i = self._pos
+        while i < len(text) and not self.done:
+            c = text[i]
+
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_str":
+                        self._key = json.loads(text[self._key_start : i + 1])
+                        self._expect = "colon"
+                    elif self._depth == 1 and self._expect == "in_value":
+                        self._field(events, text[self._value_start : i + 1])
+                        self._expect = "comma"
+                    elif in_array() and self._item_start is not None and text[self._item_start] == '"':
+                        self._item(events, text[self._item_start : i + 1])
+                i += 1
+                continue
+
+            if c in _WHITESPACE:
+                i += 1
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                    self._expect = "key_str"
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._expect = "in_value"
+                elif in_array() and self._item_start is None:
+                    self._item_start = i
+            elif self._depth == 1 and self._expect == "colon":
+                if c == ":":
+                    self._expect = "value"
+            elif self._depth == 1 and self._expect == "value":
+                self._value_start = i
+                self._expect = "in_value"
+                if c == "[":
+                    self._depth = 2
+                    self._array_key = self._key
+                    self._item_index = 0
+                    self._item_start = None
+                elif c == "{":
+                    self._depth = 2
+            elif c in "[{":
+                if in_array() and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif c in "]}":
+                if in_array() and c == "]":
+                    if self._item_start is not None:
+                        self._item(events, text[self._item_start : i])
+                    self._depth = 1
+                    self._array_key = None
+                    self._field(events, text[self._value_start : i + 1])
+                    self._expect = "comma"
+                elif self._depth == 1 and c == "}":
+                    if self._expect == "in_value":
+                        self._field(events, text[self._value_start : i])
+                    self._depth = 0
+                    self.done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 1 and self._expect == "in_value":
+                        self._field(events, text[self._value_start : i + 1])
+                        self._expect = "comma"
+                    elif in_array() and self._item_start is not None:
+                        self._item(events, text[self._item_start : i + 1])
+            elif c == ",":
+                if self._depth == 1 and self._expect == "in_value":
+                    self._field(events, text[self._value_start : i])
+                    self._expect = "key"
+                elif self._depth == 1 and self._expect == "comma":
+                    self._expect = "key"
+                elif in_array() and self._item_start is not None:
+                    self._item(events, text[self._item_start : i])
+            elif in_array() and self._item_start is None:
+                self._item_start = i  # number / true / false / null element
+            i += 1
+
+        self._pos = i
+        return events
+
+
+def events_from_result(result: Dict) -> List[Dict]:
+    """
+    The events an ``IncrementalJSONParser`` would have produced for an
+    already-complete object (used to replay cached or non-streamed results).
+    """
+    events: List[Dict] = []
+    for key, value in result.items():
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                events.append({"type": "item", "key": key, "index": index, "value": item})
+        events.append({"type": "field", "key": key, "value": value})
+    return events
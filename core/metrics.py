@@ -0,0 +1,279 @@
+"""Low-overhead counters and latency histograms with Prometheus text export."""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        return self._values.get(key, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0]
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1] += value
+
+    def count(self, **labels: str) -> int:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        series = self._series.get(key)
+        return sum(series[0]) if series else 0
+
+    def total(self, **labels: str) -> float:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        series = self._series.get(key)
+        return series[1] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {total:g}")
+            lines.append(f"{self.name}_count{plain} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "learning_helper_stage_seconds",
+    "Latency of pipeline stages (search, fetch, parse, language_detect, transcript, llm_call, json_parse).",
+    ("stage", "host", "model"),
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "learning_helper_stage_errors_total",
+    "Exceptions raised inside a pipeline stage.",
+    ("stage", "host", "model"),
+)
+STAGE_BYTES = REGISTRY.counter(
+    "learning_helper_stage_bytes_total",
+    "Bytes received per stage and host.",
+    ("stage", "host"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "learning_helper_llm_tokens_total",
+    "LLM tokens per model (kind=prompt|completion; estimated when the provider reports none).",
+    ("model", "kind"),
+)
+
+FETCH_SKIPPED = REGISTRY.counter(
+    "learning_helper_fetch_skipped_total",
+    "Pages not parsed because of their Content-Type or binary content.",
+    ("reason", "host"),
+)
+FETCH_TRUNCATED = REGISTRY.counter(
+    "learning_helper_fetch_truncated_total",
+    "Pages cut off at FETCH_MAX_BYTES and parsed from the part that was read.",
+    ("host",),
+)
+SCOUT_DUPLICATES = REGISTRY.counter(
+    "learning_helper_scout_duplicates_total",
+    "Resources given a near-duplicate's summary (source=content|index; index hits are not fetched).",
+    ("source",),
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "learning_helper_breaker_transitions_total",
+    "Circuit breaker state changes per breaker (state=open|half_open|closed).",
+    ("name", "state"),
+)
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+@contextmanager
+def timed(stage: str, host: str = "", model: str = "") -> Iterator[None]:
+    """
+    Time the enclosed block into ``learning_helper_stage_seconds`` and count
+    exceptions into ``learning_helper_stage_errors_total``. Cancellation and
+    generator close (``BaseException``s that aren't ``Exception``s) are not
+    errors.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage, host=host, model=model)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage, host=host, model=model)
+
+
+def timed_iter(items: Iterable[T], stage: str, host: str = "", model: str = "") -> Iterator[T]:
+    """
+    Yield from ``items``, timing only the time spent producing them (not the
+    consumer's between items) as one observation. Errors from ``items`` are
+    counted; the consumer closing early is not.
+    """
+    it = iter(items)
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                break
+            except Exception:
+                STAGE_ERRORS.inc(stage=stage, host=host, model=model)
+                raise
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+        STAGE_SECONDS.observe(elapsed, stage=stage, host=host, model=model)
+
+
+async def atimed_iter(
+    items: AsyncIterable[T], stage: str, host: str = "", model: str = ""
+) -> AsyncIterator[T]:
+    """Async variant of ``timed_iter``."""
+    it = items.__aiter__()
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await it.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception:
+                STAGE_ERRORS.inc(stage=stage, host=host, model=model)
+                raise
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        aclose = getattr(it, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        STAGE_SECONDS.observe(elapsed, stage=stage, host=host, model=model)
+
+
+def record_bytes(stage: str, n: int, host: str = "") -> None:
+    STAGE_BYTES.inc(n, stage=stage, host=host)
+
+
+def record_tokens(model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
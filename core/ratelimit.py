@@ -0,0 +1,343 @@
+"""Per-provider token buckets with priority scheduling for outbound API quota."""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.config import Config
+from core.resilience import DeadlineExceeded, time_left
+
+# Lower runs first. Unscoped calls (API handlers) count as interactive.
+INTERACTIVE = 0
+ENRICH = 1
+BACKGROUND = 2
+
+
+class RateLimitTimeout(DeadlineExceeded):
+    """Raised when quota did not free up before the caller's deadline."""
+
+
+class TokenBucket:
+    """
+    Refills at ``rate_per_min`` units per minute up to ``capacity`` (default:
+    one minute's worth). ``rate_per_min <= 0`` means unlimited. The level may
+    go negative through ``debit`` so usage reported after the fact still
+    slows later callers down.
+    """
+
+    def __init__(
+        self,
+        rate_per_min: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate_per_min / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_min
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if they are now)."""
+        if self.unlimited or amount <= 0:
+            return 0.0
+        self._refill()
+        # Oversized requests only need a full bucket, or they'd never run.
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self._level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited and amount > 0:
+            self._refill()
+            self._level -= min(amount, self.capacity)
+
+    def debit(self, amount: float) -> None:
+        if not self.unlimited and amount > 0:
+            self._refill()
+            self._level -= amount
+
+    @property
+    def level(self) -> Optional[float]:
+        if self.unlimited:
+            return None
+        self._refill()
+        return self._level
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min buckets for one provider, shared by threads
+    and coroutines.
+
+    Waiters are served strictly by ``(priority, arrival)``: only the head of
+    the queue may take quota, so a queued interactive call is never starved
+    by background work that arrived earlier.
+
+    ``BACKGROUND`` calls also draw on their own buckets holding
+    ``background_share`` of each rate, so background work can never use
+    more than that share and interactive traffic keeps the rest.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_min: float = 0,
+        tokens_per_min: float = 0,
+        background_share: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_min, clock=clock)
+        self.tokens = TokenBucket(tokens_per_min, clock=clock)
+        # (requests, tokens) buckets for BACKGROUND callers, if they get less than all.
+        self._background: Optional[Tuple[TokenBucket, TokenBucket]] = None
+        if 0 < background_share < 1:
+            self._background = (
+                TokenBucket(requests_per_min * background_share, clock=clock),
+                TokenBucket(tokens_per_min * background_share, clock=clock),
+            )
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        # Coroutines waiting in ``aacquire``, woken from any thread via their loop.
+        self._async_waiters: Dict[asyncio.Event, asyncio.AbstractEventLoop] = {}
+
+    def _buckets(self, priority: int) -> List[Tuple[TokenBucket, TokenBucket]]:
+        if priority >= BACKGROUND and self._background is not None:
+            return [(self.requests, self.tokens), self._background]
+        return [(self.requests, self.tokens)]
+
+    def _wait_time(self, tokens: float, priority: int) -> float:
+        return max(
+            max(requests.wait_time(1), token_bucket.wait_time(tokens))
+            for requests, token_bucket in self._buckets(priority)
+        )
+
+    def _take(self, tokens: float, priority: int) -> None:
+        for requests, token_bucket in self._buckets(priority):
+            requests.take(1)
+            token_bucket.take(tokens)
+
+    def _leave(self, ticket: Tuple[int, int]) -> None:
+        if self._queue and self._queue[0] == ticket:
+            heapq.heappop(self._queue)
+        else:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        self._cond.notify_all()
+        for event, loop in list(self._async_waiters.items()):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop already closed
+                self._async_waiters.pop(event, None)
+
+    def acquire(
+        self,
+        tokens: float = 0,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Block until one request and ``tokens`` tokens are available, then take
+        them. ``priority`` defaults to the current ``priority_scope``;
+        ``timeout`` defaults to the time left on the current deadline.
+        Raises ``RateLimitTimeout`` if it runs out first.
+        """
+        if self.requests.unlimited and self.tokens.unlimited:
+            return
+        priority = priority if priority is not None else current_priority()
+        timeout = timeout if timeout is not None else time_left()
+        give_up = time.monotonic() + timeout if timeout is not None else None
+
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._queue[0] == ticket:
+                        wait = self._wait_time(tokens, priority)
+                        if wait <= 0:
+                            self._take(tokens, priority)
+                            return
+                    if give_up is not None:
+                        remaining = give_up - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"{self.name} quota not available in time")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._leave(ticket)
+
+    async def aacquire(
+        self,
+        tokens: float = 0,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Async variant of ``acquire``. Coroutines join the same queue and
+        buckets as threads but wait on the event loop: the head sleeps until
+        its quota refills, the others until the queue changes.
+        """
+        if self.requests.unlimited and self.tokens.unlimited:
+            return
+        priority = priority if priority is not None else current_priority()
+        timeout = timeout if timeout is not None else time_left()
+        give_up = time.monotonic() + timeout if timeout is not None else None
+
+        changed = asyncio.Event()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._async_waiters[changed] = asyncio.get_running_loop()
+        try:
+            while True:
+                with self._cond:
+                    wait = None
+                    if self._queue[0] == ticket:
+                        wait = self._wait_time(tokens, priority)
+                        if wait <= 0:
+                            self._take(tokens, priority)
+                            return
+                    if give_up is not None:
+                        remaining = give_up - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"{self.name} quota not available in time")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    changed.clear()
+                try:
+                    await asyncio.wait_for(changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._async_waiters.pop(changed, None)
+                self._leave(ticket)
+
+    def debit(self, tokens: float, priority: Optional[int] = None) -> None:
+        """Charge tokens that were only known after the call (e.g. completion tokens)."""
+        priority = priority if priority is not None else current_priority()
+        with self._cond:
+            for _, token_bucket in self._buckets(priority):
+                token_bucket.debit(tokens)
+
+    def snapshot(self) -> Dict:
+        with self._cond:
+            return {
+                "requests_available": self.requests.level,
+                "tokens_available": self.tokens.level,
+                "waiting": len(self._queue),
+            }
+
+
+_LIMITERS: Dict[str, RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+_BACKGROUND_SHARE: Optional[float] = None
+
+
+def _limits_for(provider: str) -> Tuple[float, float]:
+    if provider == "serper":
+        return Config.SERPER_REQUESTS_PER_MIN, 0
+    if provider == "gemini":
+        return Config.GEMINI_REQUESTS_PER_MIN, Config.GEMINI_TOKENS_PER_MIN
+    return 0, 0
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Return the process-wide limiter for ``provider`` ("serper" or "gemini"),
+    built from ``Config`` on first use. Background work gets
+    ``Config.PREFETCH_QUOTA_SHARE`` of it unless ``set_background_share``
+    says otherwise.
+    """
+    limiter = _LIMITERS.get(provider)
+    if limiter is None:
+        with _LIMITERS_LOCK:
+            limiter = _LIMITERS.get(provider)
+            if limiter is None:
+                rpm, tpm = _limits_for(provider)
+                share = _BACKGROUND_SHARE if _BACKGROUND_SHARE is not None else Config.PREFETCH_QUOTA_SHARE
+                limiter = RateLimiter(
+                    provider, requests_per_min=rpm, tokens_per_min=tpm, background_share=share
+                )
+                _LIMITERS[provider] = limiter
+    return limiter
+
+
+def set_background_share(share: Optional[float]) -> None:
+    """
+    Override (or with None restore) the share of each provider's quota that
+    background work may use in this process; limiters are rebuilt on next use.
+    """
+    global _BACKGROUND_SHARE
+    with _LIMITERS_LOCK:
+        _BACKGROUND_SHARE = share
+        _LIMITERS.clear()
+
+
+def set_rate_limiter(provider: str, limiter: Optional[RateLimiter]) -> None:
+    """Swap or (with None) reset a provider's limiter, e.g. for tests."""
+    with _LIMITERS_LOCK:
+        if limiter is None:
+            _LIMITERS.pop(provider, None)
+        else:
+            _LIMITERS[provider] = limiter
+
+
+def rate_limiter_states() -> Dict[str, Dict]:
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+
+_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar("priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[int]:
+    """
+    Run the block at ``priority``; nested scopes can only lower urgency, so
+    enrichment inside a background job stays background.
+    """
+    priority = max(priority, _PRIORITY.get())
+    token = _PRIORITY.set(priority)
+    try:
+        yield priority
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+def bind_priority(fn: Callable) -> Callable:
+    """
+    Wrap ``fn`` to run in the caller's context, for work handed to thread
+    pools (which don't inherit context variables): its priority, and also
+    its ``deadline_scope``, so nested pools stay within the outer deadline.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # One copy per call: a Context can't be entered by two threads at once.
+        return context.copy().run(fn, *args, **kwargs)
+
+    return wrapper
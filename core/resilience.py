@@ -0,0 +1,400 @@
+"""Circuit breakers, jittered retries and deadline propagation for provider calls."""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Deque, Dict, Iterator, Optional, Tuple, TypeVar
+
+from core.config import Config
+from core.metrics import BREAKER_TRANSITIONS
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when there is no time left for another attempt."""
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    Closed: calls go through and outcomes are kept for ``window`` seconds.
+    Once at least ``min_calls`` outcomes are in the window and the failure
+    ratio reaches ``failure_rate``, the breaker opens and rejects calls. After
+    ``recovery_timeout`` it goes half-open and lets ``half_open_probes``
+    calls through: a success closes it again, a failure re-opens it.
+    Probes that end without an outcome (deadline, cancellation) give their
+    slot back with ``release``; slots held longer than ``recovery_timeout``
+    are reclaimed in case a caller never does.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        window: Optional[float] = None,
+        recovery_timeout: Optional[float] = None,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate if failure_rate is not None else Config.BREAKER_FAILURE_RATE
+        self.min_calls = min_calls if min_calls is not None else Config.BREAKER_MIN_CALLS
+        self.window = window if window is not None else Config.BREAKER_WINDOW
+        self.recovery_timeout = (
+            recovery_timeout if recovery_timeout is not None else Config.BREAKER_RECOVERY_TIMEOUT
+        )
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_at = 0.0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        BREAKER_TRANSITIONS.inc(name=self.name, state=state)
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == HALF_OPEN:
+            self._probes = 0
+        else:
+            self._outcomes.clear()
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        elif (
+            self._state == HALF_OPEN
+            and self._probes
+            and self._clock() - self._probe_at >= self.recovery_timeout
+        ):
+            self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims a probe slot when half-open)."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                self._probe_at = self._clock()
+                return True
+            return False
+
+    def release(self) -> None:
+        """
+        Give back a call allowed by ``allow`` that ended without a provider
+        outcome (our deadline, quota wait or the caller going away).
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+                return
+            now = self._clock()
+            self._outcomes.append((now, True))
+            self._trim(now)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._last_error = str(error) if error is not None else None
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            if self._state == OPEN:
+                return
+            now = self._clock()
+            self._outcomes.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            total = len(self._outcomes)
+            if total >= self.min_calls and failures / total >= self.failure_rate:
+                self._transition(OPEN)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            self._trim(self._clock())
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+            return {
+                "state": self._state,
+                "calls": len(self._outcomes),
+                "failures": failures,
+                "retry_in": retry_in,
+                "last_error": self._last_error,
+            }
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for ``name`` (e.g. ``"gemini:<model>"``)."""
+    breaker = _BREAKERS.get(name)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name)
+                _BREAKERS[name] = breaker
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict]:
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound everything called inside the block to ``seconds`` from now
+    (monotonic). Nested scopes can only shorten the outer deadline.
+    """
+    deadline = deadline_after(seconds)
+    token = _DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _DEADLINE.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    return _DEADLINE.get()
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """
+    Absolute deadline ``seconds`` from now, capped by the current scope's.
+    Use this instead of ``deadline_scope`` inside generators.
+    """
+    outer = _DEADLINE.get()
+    if seconds is None:
+        return outer
+    deadline = time.monotonic() + seconds
+    return min(deadline, outer) if outer is not None else deadline
+
+
+def time_left(deadline: Optional[float] = None) -> Optional[float]:
+    """Seconds until ``deadline`` (or the current scope's), None if unbounded."""
+    deadline = deadline if deadline is not None else _DEADLINE.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+# HTTP statuses worth retrying besides 5xx.
+RETRYABLE_STATUS = {408, 425, 429}
+
+
+def _status_code(e: BaseException) -> Optional[int]:
+    for source in (e, getattr(e, "response", None)):
+        for attr in ("code", "status_code"):
+            status = getattr(source, attr, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def is_transient(e: BaseException) -> bool:
+    """
+    Whether ``e`` is a provider hiccup worth retrying and counting against
+    its breaker: timeouts, connection errors, 429 and 5xx. Client errors
+    (other 4xx) and malformed responses (``ValueError``, e.g. JSON parse
+    errors) are not.
+    """
+    if isinstance(e, (TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(e)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    return not isinstance(e, ValueError)
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Full-jitter exponential backoff for the ``attempt``-th retry (0-based)."""
+    return rng() * min(max_delay, base_delay * (2 ** attempt))
+
+
+def retry_delay(
+    attempt: int,
+    deadline: Optional[float] = None,
+    attempts: Optional[int] = None,
+    rng: Callable[[], float] = random.random,
+) -> Optional[float]:
+    """
+    Delay before retrying after the ``attempt``-th failure (0-based), or None
+    when attempts are used up or the backoff would run past ``deadline``.
+    """
+    attempts = attempts if attempts is not None else Config.LLM_RETRY_ATTEMPTS
+    if attempt + 1 >= attempts:
+        return None
+    delay = backoff_delay(attempt, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY, rng)
+    left = time_left(deadline)
+    if left is not None and left <= delay:
+        return None
+    return delay
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    breaker: Optional[CircuitBreaker] = None,
+    attempts: Optional[int] = None,
+    deadline: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: Callable[[], float] = random.random,
+    retryable: Callable[[BaseException], bool] = is_transient,
+) -> T:
+    """
+    Call ``fn`` with up to ``attempts`` tries (default
+    ``Config.LLM_RETRY_ATTEMPTS``), sleeping a jittered backoff between them.
+
+    Each attempt is gated on ``breaker`` and its outcome recorded there. No
+    retry is started that could not finish its backoff before ``deadline``
+    (default: the enclosing ``deadline_scope``). Errors ``retryable`` rejects
+    (see ``is_transient``) are raised at once and not counted as failures.
+    """
+    attempts = attempts if attempts is not None else Config.LLM_RETRY_ATTEMPTS
+    deadline = deadline if deadline is not None else current_deadline()
+    attempt = 0
+    while True:
+        left = time_left(deadline)
+        if left is not None and left <= 0:
+            raise DeadlineExceeded("deadline passed before the call could be made")
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.name}")
+        try:
+            result = fn()
+        except DeadlineExceeded:
+            # Out of time on our side (e.g. waiting for quota), not a provider error.
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            if not retryable(e):
+                # The provider answered; the request or its output was bad.
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_failure(e)
+            delay = retry_delay(attempt, deadline, attempts, rng)
+            if delay is None:
+                raise
+            sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+async def acall_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    breaker: Optional[CircuitBreaker] = None,
+    attempts: Optional[int] = None,
+    deadline: Optional[float] = None,
+    rng: Callable[[], float] = random.random,
+    retryable: Callable[[BaseException], bool] = is_transient,
+) -> T:
+    """
+    Async variant of ``call_with_retry``.
+    """
+    attempts = attempts if attempts is not None else Config.LLM_RETRY_ATTEMPTS
+    deadline = deadline if deadline is not None else current_deadline()
+    attempt = 0
+    while True:
+        left = time_left(deadline)
+        if left is not None and left <= 0:
+            raise DeadlineExceeded("deadline passed before the call could be made")
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.name}")
+        try:
+            if left is not None:
+                result = await asyncio.wait_for(fn(), timeout=left)
+            else:
+                result = await fn()
+        except DeadlineExceeded:
+            # Out of time on our side (e.g. waiting for quota), not a provider error.
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception as e:
+            if not retryable(e):
+                # The provider answered; the request or its output was bad.
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record_failure(e)
+            delay = retry_delay(attempt, deadline, attempts, rng)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        except BaseException:
+            # e.g. the awaiting task was cancelled
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -14,3 +14,7 @@ def setup_logging(level: str = "INFO"):
 def truncate_text(text: str, max_length: int = 500) -> str:
     """Truncate text to specified length."""
     return text[:max_length] + "..." if len(text) > max_length else text
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting prompts (~4 characters per token)."""
+    return len(text) // 4 + 1
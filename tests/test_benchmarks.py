@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import run as bench
+
+
+def test_benchmark_harness_runs_offline_and_reports_percentiles(monkeypatch):
+    monkeypatch.setattr(bench.Config, "LLM_CACHE_SIZE", bench.Config.LLM_CACHE_SIZE)
+    monkeypatch.setattr(bench.Config, "FETCH_CACHE_PATH", bench.Config.FETCH_CACHE_PATH)
+    monkeypatch.setattr(bench.search_google, "SERPER_ENDPOINT", bench.search_google.SERPER_ENDPOINT)
+    monkeypatch.setattr(bench.search_google, "SERPER_API_KEY", bench.search_google.SERPER_API_KEY)
+
+    args = bench.argparse.Namespace(
+        requests=2,
+        concurrency=2,
+        search_latency=0.0,
+        page_latency=0.0,
+        llm_latency=0.0,
+        jitter=0.0,
+        seed=0,
+        alloc_samples=1,
+        llm_cache=False,
+        warm_caches=False,
+        only=None,
+    )
+    report = bench.run(args)
+
+    for name in ("scout", "translate"):
+        result = report["pipelines"][name]
+        assert result["errors"] == 0
+        assert result["throughput_rps"] > 0
+        assert set(result["latency_ms"]) == {"p50", "p95", "p99", "mean"}
+    assert report["peak_rss_kib"] > 0
+    assert report["settings"]["warm_caches"] is False
+    # The memo caches are switched back on afterwards.
+    assert bench.summarize._CHUNK_CACHE.max_entries == bench.Config.SUMMARY_CHUNK_CACHE_SIZE
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,134 @@
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.cache import LRUCache, SingleFlight, SQLiteCache, TieredCache, cache_key
+
+
+def test_cache_key_depends_on_every_part():
+    assert cache_key("m", "p") == cache_key("m", "p")
+    assert cache_key("m", "p") != cache_key("m2", "p")
+    assert cache_key("ab", "c") != cache_key("a", "bc")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.as_dict() == {"hits": 3, "misses": 1, "evictions": 1, "expirations": 0}
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+def test_sqlite_cache_persists_and_caps_size(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    cache.set("c", {"v": 3})
+    cache.close()
+
+    reopened = SQLiteCache(path)
+    assert len(reopened) == 2
+    assert reopened.get("a") is None
+    assert reopened.get("c") == {"v": 3}
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    disk.set("k", ["value"])
+    cache = TieredCache(LRUCache(), disk)
+
+    assert cache.get("k") == ["value"]
+    assert cache.memory.get("k") == ["value"]
+    assert cache.stats()["disk"]["hits"] == 1
+
+
+def test_tiered_cache_promotion_keeps_remaining_ttl(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    disk.set("k", "value", ttl=0.1)
+    cache = TieredCache(LRUCache(ttl=3600), disk)
+
+    assert cache.get("k") == "value"
+    time.sleep(0.12)
+    assert cache.memory.get("k") is None
+
+
+def test_sqlite_cache_batches_access_times_and_prunes_periodically(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, max_entries=2, prune_every=4)
+    indexes = {row[1] for row in sqlite3.connect(path).execute("PRAGMA index_list(cache)")}
+    assert {"cache_expires_at", "cache_accessed_at"} <= indexes
+
+    for key in "abc":
+        cache.set(key, key)
+    assert len(cache) == 3  # no prune yet
+    assert cache.get("a") == "a"  # touch kept in memory until the next prune
+    cache.set("d", "d")
+
+    assert len(cache) == 2
+    assert cache.get("a") == "a"
+    assert cache.get("d") == "d"
+    assert cache.stats.evictions == 2
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+    results = []
+
+    def compute():
+        calls.append(1)
+        release.wait()
+        return "value"
+
+    def worker():
+        results.append(flights.do("key", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("value", False)] + [("value", True)] * 4
+
+
+def test_single_flight_shares_exceptions_and_forgets_failed_keys():
+    flights = SingleFlight()
+
+    def boom():
+        raise RuntimeError("serper down")
+
+    with pytest.raises(RuntimeError):
+        flights.do("key", boom)
+    assert flights.do("key", lambda: "ok") == ("ok", False)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
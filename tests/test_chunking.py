@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.chunking import chunk_text
+from core.utils import estimate_tokens
+
+
+def test_chunk_text_keeps_short_text_in_one_chunk():
+    assert chunk_text("line one\nline two", max_tokens=100) == ["line one\nline two"]
+
+
+def test_chunk_text_respects_budget_and_paragraph_boundaries():
+    paragraphs = [f"Paragraph {i} " + "word " * 30 for i in range(10)]
+    chunks = chunk_text("\n".join(paragraphs), max_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 100 for c in chunks)
+    # No paragraph is cut in half.
+    assert "\n".join(chunks).split("\n") == [p.strip() for p in paragraphs]
+
+
+def test_chunk_text_splits_oversized_paragraph_on_sentences():
+    paragraph = " ".join(f"Sentence number {i} is here." for i in range(40))
+    chunks = chunk_text(paragraph, max_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(c.endswith(".") for c in chunks)
+    assert all(estimate_tokens(c) <= 40 for c in chunks)
+
+
+def test_editing_an_early_paragraph_keeps_later_chunks():
+    paragraphs = [f"Paragraph {i} covers idea {i * 7}. " + f"detail{i} " * 25 for i in range(40)]
+    before = chunk_text("\n".join(paragraphs), max_tokens=150)
+
+    paragraphs[1] = "This opening paragraph was rewritten with different words entirely."
+    after = chunk_text("\n".join(paragraphs), max_tokens=150)
+
+    assert len(before) >= 8
+    unchanged = set(before) & set(after)
+    assert len(unchanged) >= len(before) - 2
+    assert before[-1] in unchanged
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -1,4 +1,6 @@
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -7,8 +9,17 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from agents.content_scout.scout import content_scout_agent
+from agents.content_scout import scout
+from agents.content_scout.dedup import SignatureIndex, group_near_duplicates, set_signature_index, simhash
+from agents.content_scout.fanout import canonical_url, fuse_results, query_variants
+from agents.content_scout.ranking import rank_resources
+from agents.content_scout.query_cache import QueryCache, query_key, set_query_cache
+from agents.content_scout.schemas import Resource
+from agents.content_scout.scout import content_scout_agent, iter_content_scout
+from core.cache import LRUCache, TieredCache, cache_key
 from agents.content_scout.search_google import map_serper_to_resources
+from agents.content_scout.summarize import _CHUNK_CACHE, summarize_batch, summarize_long
+from core.chunking import chunk_text
 
 
 def test_map_serper_to_resources_maps_organic_and_videos():
@@ -106,5 +117,517 @@ def test_content_scout_agent_enriches_with_stubbed_fetch_and_summary():
     assert r.content_type == "concept_explanation"
 
 
+def _many_results(n: int):
+    def fake_search(_: str, __: int):
+        return {
+            "organic": [
+                {"title": f"Article {i}", "link": f"https://example.com/{i}"}
+                for i in range(n)
+            ]
+        }
+
+    return fake_search
+
+
+def _fake_summarize(text: str, topic: str, target_language: str, level_hint: str):
+    return f"Summary of {text}", level_hint, "concept_explanation"
+
+
+def test_content_scout_agent_concurrent_enrichment_keeps_rank_order():
+    def slow_fetch(url: str):
+        # Earlier results finish last to make completion order differ from rank.
+        i = int(url.rsplit("/", 1)[1])
+        time.sleep(0.02 * (5 - i))
+        return {"ok": True, "title": "", "text": url, "language": "en", "error": None}
+
+    resources = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(5),
+        fetch_fn=slow_fetch,
+        summarize_fn=_fake_summarize,
+        max_workers=5,
+    )
+
+    assert [r.url for r in resources] == [f"https://example.com/{i}" for i in range(5)]
+    assert all(r.short_summary == f"Summary of {r.url}" for r in resources)
+
+
+def test_content_scout_agent_drops_resources_past_deadline():
+    def fetch(url: str):
+        if url.endswith("/1"):
+            time.sleep(0.5)
+        return {"ok": True, "title": "", "text": url, "language": "en", "error": None}
+
+    started = time.monotonic()
+    resources = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(3),
+        fetch_fn=fetch,
+        summarize_fn=_fake_summarize,
+        max_workers=3,
+        resource_timeout=0.1,
+    )
+
+    assert time.monotonic() - started < 0.4
+    assert [r.url for r in resources] == ["https://example.com/0", "https://example.com/2"]
+
+
+def test_iter_content_scout_emits_raw_results_before_enriched_resources():
+    def fetch(url: str):
+        return {"ok": True, "title": "", "text": url, "language": "en", "error": None}
+
+    events = list(
+        iter_content_scout(
+            topic="recursion",
+            search_fn=_many_results(3),
+            fetch_fn=fetch,
+            summarize_fn=_fake_summarize,
+            max_workers=2,
+        )
+    )
+
+    assert events[0][0] == "results"
+    assert [r["url"] for r in events[0][1]["resources"]] == [
+        f"https://example.com/{i}" for i in range(3)
+    ]
+    assert events[0][1]["resources"][0]["short_summary"] is None
+    enriched = [payload for event, payload in events if event == "resource"]
+    assert sorted(p["index"] for p in enriched) == [0, 1, 2]
+    assert all(p["resource"]["short_summary"].startswith("Summary of") for p in enriched)
+    assert events[-1] == ("done", {"count": 3})
+
+
+def test_summarize_batch_packs_texts_and_falls_back_for_missing_items():
+    prompts = []
+
+    def fake_call(prompt: str, model=None):
+        prompts.append(prompt)
+        if "RESOURCE [" in prompt:
+            # Index 1 is missing and index 2 is malformed: both need a retry.
+            return {
+                "results": [
+                    {"index": 0, "short_summary": "zero", "estimated_level": "school",
+                     "content_type": "reference_docs"},
+                    {"index": 2, "short_summary": ""},
+                ]
+            }
+        return {"short_summary": "single", "estimated_level": "", "content_type": ""}
+
+    results = summarize_batch(
+        ["text zero", "text one", "text two"],
+        topic="recursion",
+        level_hint="beginner",
+        call_fn=fake_call,
+    )
+
+    assert results == [
+        ("zero", "school", "reference_docs"),
+        ("single", "beginner", "concept_explanation"),
+        ("single", "beginner", "concept_explanation"),
+    ]
+    assert len(prompts) == 3  # one batch call + two per-item fallbacks
+
+
+def test_summarize_batch_runs_fallbacks_concurrently():
+    # Both fallbacks must be in flight at once to get past the barrier.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_call(prompt: str, model=None):
+        if "RESOURCE [" in prompt:
+            return {"results": []}
+        barrier.wait()
+        return {"short_summary": "single", "estimated_level": "", "content_type": ""}
+
+    results = summarize_batch(["text zero", "text one"], topic="recursion", call_fn=fake_call)
+
+    assert [r[0] for r in results] == ["single", "single"]
+
+
+def test_summarize_batch_respects_token_budget():
+    prompts = []
+
+    def fake_call(prompt: str, model=None):
+        prompts.append(prompt)
+        return {"results": [
+            {"index": i, "short_summary": f"s{i}"} for i in range(4) if f"RESOURCE [{i}]" in prompt
+        ]}
+
+    results = summarize_batch(["x" * 400] * 4, topic="t", token_budget=250, call_fn=fake_call)
+
+    assert [r[0] for r in results] == ["s0", "s1", "s2", "s3"]
+    assert len(prompts) == 2
+
+
+def test_content_scout_agent_uses_batch_summarizer():
+    calls = []
+
+    def fake_batch(texts, topic, target_language, level_hint):
+        calls.append(list(texts))
+        return [(f"batch {t}", level_hint, "concept_explanation") for t in texts]
+
+    def fetch(url: str):
+        return {"ok": True, "title": "", "text": url, "language": "en", "error": None}
+
+    resources = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(3),
+        fetch_fn=fetch,
+        batch_summarize_fn=fake_batch,
+        max_workers=3,
+    )
+
+    assert len(calls) == 1
+    assert sorted(calls[0]) == [f"https://example.com/{i}" for i in range(3)]
+    assert [r.short_summary for r in resources] == [
+        f"batch https://example.com/{i}" for i in range(3)
+    ]
+
+
+def test_summarize_long_maps_chunks_and_only_redoes_changed_ones():
+    map_calls = []
+
+    def fake_call(prompt: str, model=None):
+        if "NOTES:" in prompt:
+            return {"short_summary": "reduced", "estimated_level": "college",
+                    "content_type": "step_by_step_tutorial"}
+        map_calls.append(prompt)
+        return {"notes": "notes"}
+
+    paragraphs = [f"Part {i}: " + "recursion detail " * 40 for i in range(6)]
+    result = summarize_long(
+        "\n".join(paragraphs), topic="long recursion", chunk_tokens=200, call_fn=fake_call
+    )
+    first_pass = len(map_calls)
+
+    assert result == ("reduced", "college", "step_by_step_tutorial")
+    assert first_pass > 1
+
+    paragraphs[-1] = "Part 5 was rewritten. " + "new words " * 40
+    summarize_long(
+        "\n".join(paragraphs), topic="long recursion", chunk_tokens=200, call_fn=fake_call
+    )
+    assert len(map_calls) == first_pass + 1
+
+    # An edit near the start only redoes the chunks up to the next anchor.
+    long_paragraphs = [f"Section {i} on recursion step {i * 3}. " + f"term{i} " * 30 for i in range(30)]
+    summarize_long("\n".join(long_paragraphs), topic="anchors", chunk_tokens=200, call_fn=fake_call)
+    first_pass = len(map_calls)
+    long_paragraphs[0] = "The introduction was edited."
+    summarize_long("\n".join(long_paragraphs), topic="anchors", chunk_tokens=200, call_fn=fake_call)
+    assert first_pass > 8
+    assert len(map_calls) - first_pass <= 2
+
+
+def test_summarize_long_never_caches_stub_chunk_notes():
+    from core.llm import _stub_response
+
+    paragraphs = [f"Outage {i}: " + "stub detail " * 40 for i in range(4)]
+    text = "\n".join(paragraphs)
+    reduce_prompts = []
+
+    def outage(prompt: str, model=None):
+        return _stub_response()
+
+    def healthy(prompt: str, model=None):
+        if "NOTES:" in prompt:
+            reduce_prompts.append(prompt)
+            return {"short_summary": "real", "estimated_level": "college", "content_type": "reference_docs"}
+        return {"notes": "real notes"}
+
+    summarize_long(text, topic="outage topic", chunk_tokens=200, call_fn=outage)
+    chunks = chunk_text(text, 200)
+    assert len(chunks) > 1
+    assert all(_CHUNK_CACHE.get(cache_key("chunk", "outage topic", c)) is None for c in chunks)
+
+    assert summarize_long(text, topic="outage topic", chunk_tokens=200, call_fn=healthy)[0] == "real"
+    assert "TODO" not in reduce_prompts[0] and "real notes" in reduce_prompts[0]
+
+
+def test_query_key_normalizes_topic_and_options():
+    assert query_key("Trig", "en", "beginner", 8, True, True, 3).endswith("|enrich-top3")
+    assert query_key("  Trigonometry   Basics ", "EN", "Beginner", 8, True, False) == (
+        "trigonometry basics|en|beginner|8|videos|search"
+    )
+
+
+def test_content_scout_agent_caches_default_pipeline_results(monkeypatch):
+    calls = []
+
+    def fake_search(query: str, num_results: int):
+        calls.append(query)
+        return {"organic": [{"title": "Trig", "link": "https://example.com/trig"}]}
+
+    monkeypatch.setattr(scout, "raw_web_search", fake_search)
+    cache = QueryCache(TieredCache(LRUCache()), ttl=60)
+    set_query_cache(cache)
+    try:
+        first = content_scout_agent("Trigonometry basics")
+        first[0].title = "mutated by caller"
+        second = content_scout_agent("trigonometry  BASICS")
+        content_scout_agent("Trigonometry basics", use_cache=False)
+    finally:
+        set_query_cache(None)
+
+    assert len(calls) == 2
+    assert second[0].title == "Trig"
+    key = query_key("Trigonometry basics", "en", "beginner", 8, True, False)
+    assert cache.stats()["keys"][key] == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_query_cache_does_not_keep_degraded_results():
+    cache = QueryCache(TieredCache(LRUCache()), ttl=3600)
+    calls = []
+
+    def compute(summary):
+        def _compute():
+            calls.append(summary)
+            return [Resource(title="T", url="https://a.com", type="article", short_summary=summary)]
+        return _compute
+
+    for summary in ("TODO", None):
+        cache.get_or_compute(f"k-{summary}", compute(summary), enriched=1)
+        cache.get_or_compute(f"k-{summary}", compute(summary), enriched=1)
+    cache.get_or_compute("empty", lambda: calls.append("empty") or [])
+    cache.get_or_compute("empty", lambda: calls.append("empty") or [])
+    cache.get_or_compute("good", compute("real"), enriched=1)
+    cache.get_or_compute("good", compute("real"), enriched=1)
+
+    assert calls == ["TODO", "TODO", None, None, "empty", "empty", "real"]
+
+
+def test_query_cache_keeps_unsummarized_non_english_pages_for_the_full_ttl():
+    cache = QueryCache(TieredCache(LRUCache()), ttl=3600)
+    resources = [
+        Resource(title="T", url="https://a.com", short_summary="real", language="en"),
+        Resource(title="त्रिकोणमिति", url="https://hi.example", raw_text="पाठ", language="hi"),
+    ]
+    cache.put("k", resources, enriched=2)
+
+    assert cache.cache.memory._data["scout:k"][1] - time.time() > 60
+
+
+def test_query_cache_keeps_degraded_results_for_the_negative_ttl():
+    cache = QueryCache(TieredCache(LRUCache()), ttl=3600, negative_ttl=60)
+    cache.put("k", [])
+
+    assert cache.cache.get("scout:k") == []
+    assert 0 < cache.cache.memory._data["scout:k"][1] - time.time() <= 60
+
+
+def _page(seed: int, words: int = 300) -> str:
+    return " ".join(f"word{(seed * 7919 + i * i) % 5000}" for i in range(words))
+
+
+MIRROR = _page(1)
+PAGES = {
+    "https://example.com/0": MIRROR,
+    "https://example.com/1": MIRROR.replace("word", "Word", 3) + " Mirrored from example.com.",
+    "https://example.com/2": _page(2),
+}
+
+
+def _fetch_pages(calls):
+    def fetch(url: str):
+        calls.append(url)
+        return {"ok": True, "title": "", "text": PAGES[url], "language": "en", "error": None}
+
+    return fetch
+
+
+def test_simhash_groups_mirrors_and_keeps_distinct_pages_apart():
+    signatures = [simhash(PAGES[f"https://example.com/{i}"]) for i in range(3)] + [simhash("too short")]
+    assert signatures[3] is None
+    assert group_near_duplicates(signatures) == [[0, 1], [2], [3]]
+    assert simhash(MIRROR) == signatures[0]  # stable, so it can be stored
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_content_scout_agent_summarizes_near_duplicates_once(batch):
+    summarized = []
+
+    def summarize(text, topic, target_language, level_hint):
+        summarized.append(text)
+        return f"summary {len(summarized)}", level_hint, "concept_explanation"
+
+    def batch_summarize(texts, topic, target_language, level_hint):
+        return [summarize(t, topic, target_language, level_hint) for t in texts]
+
+    resources = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(3),
+        fetch_fn=_fetch_pages([]),
+        batch_summarize_fn=batch_summarize if batch else None,
+        summarize_fn=None if batch else summarize,
+        max_workers=3,
+    )
+
+    assert len(summarized) == 2
+    first, mirror, other = resources
+    assert first.short_summary == mirror.short_summary != other.short_summary
+    # Whichever mirror was summarized first is the one the other points to.
+    assert sorted([first.duplicate_of or "", mirror.duplicate_of or ""]) in (["", first.url], ["", mirror.url])
+    assert other.duplicate_of is None
+
+
+def test_batch_dedup_keeps_the_best_ranked_copy_as_representative():
+    fetch_pages = _fetch_pages([])
+
+    def slow_first(url: str):
+        if url.endswith("/0"):
+            time.sleep(0.2)  # the mirror finishes fetching first
+        return fetch_pages(url)
+
+    def batch_summarize(texts, topic, target_language, level_hint):
+        return [(f"summary {k}", level_hint, "concept_explanation") for k in range(len(texts))]
+
+    first, mirror, _ = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(3),
+        fetch_fn=slow_first,
+        batch_summarize_fn=batch_summarize,
+        max_workers=3,
+    )
+
+    assert first.duplicate_of is None
+    assert mirror.duplicate_of == first.url
+
+
+def test_signature_index_skips_fetching_known_duplicates(tmp_path):
+    set_signature_index(SignatureIndex(str(tmp_path / "signatures.sqlite3")))
+    try:
+        for expected in (3, 2):
+            fetched = []
+            resources = content_scout_agent(
+                topic="recursion",
+                enrich=True,
+                search_fn=_many_results(3),
+                fetch_fn=_fetch_pages(fetched),
+                summarize_fn=_fake_summarize,
+                max_workers=2,
+            )
+            assert len(fetched) == expected
+            assert len(resources) == 3
+        # Second run: the mirror was matched from the index and never fetched.
+        assert "https://example.com/1" not in fetched
+        assert resources[1].duplicate_of == "https://example.com/0"
+        assert resources[1].raw_text == PAGES["https://example.com/0"]
+        assert resources[1].short_summary == resources[0].short_summary
+    finally:
+        set_signature_index(None)
+
+
+def test_rank_resources_scores_domain_topic_level_and_language():
+    data = {
+        "organic": [
+            {"title": "Top 10 celebrity diets", "link": "https://gossip.example/diets"},
+            {"title": "Trigonometry pins", "link": "https://www.pinterest.com/trig", "snippet": "trigonometry"},
+            {"title": "Advanced trigonometry proofs", "link": "https://math.example/proofs"},
+            {
+                "title": "Trigonometry basics",
+                "link": "https://www.khanacademy.org/math/trigonometry",
+                "snippet": "An introduction for beginners.",
+            },
+            {"title": "त्रिकोणमिति (Trigonometry) basics", "link": "https://hindi.example/trig"},
+        ]
+    }
+
+    ranked = rank_resources(map_serper_to_resources(data), "trigonometry basics", "beginner")
+    assert ranked[0].url == "https://www.khanacademy.org/math/trigonometry"
+    # Off-topic and low-quality domains drop below on-topic pages despite their search rank.
+    assert {r.url for r in ranked[-2:]} == {"https://gossip.example/diets", "https://www.pinterest.com/trig"}
+    assert ranked[0].score > ranked[1].score
+
+    english = {r.url: r.score for r in ranked}
+    ranked = rank_resources(map_serper_to_resources(data), "trigonometry basics", "beginner", language="hi")
+    hindi = next(r for r in ranked if r.url == "https://hindi.example/trig")
+    assert hindi.score == pytest.approx(english[hindi.url] + 0.4)
+
+    data = {"organic": data["organic"][3:4], "videos": [{"title": "Trigonometry basics", "link": "https://youtu.be/x"}]}
+    assert rank_resources(map_serper_to_resources(data), "trigonometry", video_preference=1.0)[0].type == "video"
+
+
+def test_content_scout_agent_enrich_top_k_only_fetches_best_results():
+    fetched = []
+
+    def fetch(url: str):
+        fetched.append(url)
+        return {"ok": True, "title": "", "text": url, "language": "en", "error": None}
+
+    resources = content_scout_agent(
+        topic="recursion",
+        enrich=True,
+        search_fn=_many_results(5),
+        fetch_fn=fetch,
+        summarize_fn=_fake_summarize,
+        enrich_top_k=2,
+    )
+
+    assert sorted(fetched) == ["https://example.com/0", "https://example.com/1"]
+    assert [r.url for r in resources] == [f"https://example.com/{i}" for i in range(5)]
+    assert [r.short_summary is not None for r in resources] == [True, True, False, False, False]
+
+
+def test_canonical_url_collapses_spellings_of_the_same_page():
+    assert canonical_url("http://www.Example.com/trig/?utm_source=x&b=2&a=1#top") == canonical_url(
+        "https://example.com/trig?a=1&b=2&fbclid=abc"
+    )
+    assert canonical_url("https://example.com/trig?page=2") != canonical_url("https://example.com/trig")
+    assert (
+        canonical_url("https://www.youtube.com/watch?v=abc123&t=30s&feature=share")
+        == canonical_url("https://youtu.be/abc123?si=xyz")
+        == "youtube:abc123"
+    )
+
+
+def test_query_variants_and_reciprocal_rank_fusion():
+    variants = query_variants("photosynthesis", "beginner", "hi", limit=4)
+    assert variants[0] == "photosynthesis tutorial for beginner students"
+    assert "photosynthesis in Hindi" in variants and len(set(variants)) == 4
+
+    fused = fuse_results(
+        [
+            {"organic": [{"link": "https://a.com"}, {"link": "http://www.b.com/"}]},
+            {"organic": [{"link": "https://b.com"}, {"link": "https://c.com"}]},
+        ],
+        num_results=2,
+    )
+    # b.com is 2nd and 1st in the two lists, so it beats a.com's single 1st place.
+    assert [item["link"] for item in fused["organic"]] == ["https://b.com", "https://a.com"]
+    assert fused["videos"] == []
+
+
+def test_content_scout_agent_fans_out_search_queries_concurrently():
+    queries = []
+
+    def slow_search(query: str, num_results: int):
+        queries.append(query)
+        time.sleep(0.2)
+        if "examples" in query:
+            raise RuntimeError("quota")
+        return {
+            "organic": [
+                {"title": f"{query} guide", "link": f"https://example.com/{len(query)}?utm_source=x"},
+                {"title": "Shared page", "link": "http://www.shared.example/page/"},
+            ]
+        }
+
+    start = time.perf_counter()
+    resources = content_scout_agent(
+        topic="recursion", enrich=False, search_fn=slow_search, search_queries=3
+    )
+    elapsed = time.perf_counter() - start
+
+    assert len(queries) == 3
+    assert elapsed < 0.4  # one search's latency, not three
+    urls = [r.url for r in resources]
+    assert urls.count("http://www.shared.example/page/") == 1
+    assert len(urls) == 3
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__]))
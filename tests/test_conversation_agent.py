@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.content_scout.schemas import Resource
+from agents.conversation_agent import HashingEmbedder, VectorStore, index_resources, retrieve
+
+
+def _resources():
+    return [
+        Resource(
+            title="Recursion",
+            url="https://example.com/recursion",
+            raw_text="Recursion is a function calling itself.\nEvery recursion needs a base case.",
+            language="en",
+        ),
+        Resource(
+            title="Trigonometry",
+            url="https://example.com/trig",
+            raw_text="Sine and cosine relate the angles of a right triangle to its sides.",
+            language="en",
+        ),
+    ]
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder(dim=64)
+    a = embedder.embed(["base case of recursion", ""])
+    b = HashingEmbedder(dim=64).embed(["base case of recursion"])
+
+    assert a.shape == (2, 64)
+    assert np.allclose(a[0], b[0])
+    assert np.isclose(np.linalg.norm(a[0]), 1.0)
+    assert not a[1].any()
+
+
+def test_vector_store_returns_most_similar_chunks():
+    store = VectorStore()
+    index_resources(store, _resources(), chunk_tokens=12)
+
+    hits = retrieve(store, "what is the base case in recursion?", k=2)
+
+    assert hits[0]["url"] == "https://example.com/recursion"
+    assert "base case" in hits[0]["text"]
+    assert hits[0]["score"] >= hits[1]["score"]
+
+
+def test_vector_store_delete_and_reindex():
+    store = VectorStore()
+    index_resources(store, _resources(), chunk_tokens=12)
+    before = len(store)
+
+    assert store.delete("https://example.com/trig") > 0
+    assert all(h["doc_id"] != "https://example.com/trig" for h in store.search("sine cosine", k=5))
+
+    # Re-adding a document replaces it and reuses the freed rows.
+    index_resources(store, _resources(), chunk_tokens=12)
+    assert len(store) == before
+
+
+def test_vector_store_persists_across_restarts(tmp_path):
+    path = str(tmp_path / "index")
+    store = VectorStore(path)
+    for i in range(1100):  # past the initial capacity to exercise growth
+        store.add(f"doc-{i}", [f"chunk number {i} about topic {i % 7}"])
+    store.close()
+
+    reopened = VectorStore(path)
+    assert len(reopened) == 1100
+    assert reopened.search("chunk number 1099", k=1)[0]["doc_id"] == "doc-1099"
+
+    with pytest.raises(ValueError):
+        VectorStore(path, embedder=HashingEmbedder(dim=32))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,282 @@
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.content_scout import fetch_clean
+from agents.content_scout.download import read_page, resolve_charset, sniff_binary
+from agents.content_scout.extract import extract_main_text
+from agents.content_scout.langid import detect_language, html_lang, normalize_language
+from agents.content_scout.parse_pool import ParsePool
+from agents.content_scout.fetch_cache import FetchCache
+
+PAGE = b"""<html><head><title>Recursion</title></head><body>
+<article><h1>Recursion</h1>
+<p>Recursion is when a function calls itself to solve a smaller version of the same problem.</p>
+<p>Every recursive function needs a base case that stops the calls, and a recursive case.</p>
+</article></body></html>"""
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=PAGE, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8", "replace")
+        self.headers = headers or {}
+        self.read = 0
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            self.read += len(self.content[i : i + chunk_size])
+            yield self.content[i : i + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    calls = []
+    responses = []
+
+    class FakeClient:
+        @contextmanager
+        def stream(self, method, url, timeout=None, headers=None):
+            calls.append(dict(headers or {}))
+            yield responses.pop(0)
+
+    monkeypatch.setattr(fetch_clean, "get_http_client", FakeClient)
+    return calls, responses
+
+
+def test_fresh_cache_entry_skips_network(tmp_path, fake_get):
+    calls, responses = fake_get
+    cache = FetchCache(str(tmp_path / "pages.sqlite3"), max_age=3600)
+    responses.append(FakeResponse(headers={"ETag": '"v1"'}))
+
+    first = fetch_clean.fetch_and_clean("https://example.com/r", cache=cache)
+    second = fetch_clean.fetch_and_clean("https://example.com/r", cache=cache)
+
+    assert first["ok"] and "base case" in first["text"]
+    assert second == first
+    assert len(calls) == 1
+
+
+def test_fetch_cache_evicts_the_oldest_pages_beyond_its_cap(tmp_path):
+    cache = FetchCache(str(tmp_path / "pages.sqlite3"), max_entries=2, prune_every=4)
+    for i in range(4):
+        cache.put(f"https://example.com/{i}", PAGE, {"ok": True})
+        time.sleep(0.001)
+
+    assert len(cache) == 2
+    assert cache.get("https://example.com/0") is None
+    assert cache.get("https://example.com/3").cleaned == {"ok": True}
+
+
+def test_stale_entry_is_revalidated_and_304_reuses_cleaned_text(tmp_path, fake_get, monkeypatch):
+    calls, responses = fake_get
+    cache = FetchCache(str(tmp_path / "pages.sqlite3"), max_age=0)
+    responses.append(
+        FakeResponse(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    )
+    first = fetch_clean.fetch_and_clean("https://example.com/r", cache=cache)
+
+    def no_parse(_):
+        raise AssertionError("unchanged pages must not be re-parsed")
+
+    monkeypatch.setattr(fetch_clean, "clean_html", no_parse)
+    responses.append(FakeResponse(status_code=304, content=b""))
+    responses.append(FakeResponse(content=PAGE))  # 200 with identical body
+
+    assert fetch_clean.fetch_and_clean("https://example.com/r", cache=cache) == first
+    assert calls[1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert fetch_clean.fetch_and_clean("https://example.com/r", cache=cache) == first
+
+
+
+def test_binary_and_non_html_responses_are_skipped_without_reading_the_body(fake_get):
+    _, responses = fake_get
+    pdf = FakeResponse(content=b"%PDF-1.7\n" + b"\x00" * 500_000, headers={"Content-Type": "application/pdf"})
+    responses.append(pdf)
+    result = fetch_clean.fetch_and_clean("https://example.com/paper.pdf")
+    assert not result["ok"]
+    assert result["error"] == "skipped: unsupported content type application/pdf"
+    assert pdf.read == 0
+
+    # Mislabelled binaries are caught by their magic bytes after the first chunk.
+    video = FakeResponse(content=b"\x00\x00\x00\x18ftypmp42" + b"\x01" * 500_000, headers={"Content-Type": "text/html"})
+    responses.append(video)
+    assert fetch_clean.fetch_and_clean("https://example.com/v")["error"] == "skipped: binary body (mp4)"
+    assert video.read < 500_000
+
+
+def test_read_page_caps_bytes_and_decodes_declared_charset_across_chunks():
+    text = "<html><body><p>" + "é" * 100_000 + "</p></body></html>"
+    resp = FakeResponse(
+        content=text.encode("cp1252"), headers={"Content-Type": "text/html; charset=windows-1252"}
+    )
+    page = read_page(resp, max_bytes=80_000)
+    assert page.truncated and len(page.body) == 80_000
+    assert page.encoding == "cp1252"
+    assert "\ufffd" not in page.text and page.text.count("é") > 79_000
+
+    utf8 = "<meta charset='utf-8'><p>" + "ह" * 30_000
+    page = read_page(FakeResponse(content=utf8.encode("utf-8"), headers={}), max_bytes=10**6)
+    assert page.text == utf8  # multi-byte characters split across chunk boundaries
+
+
+def test_sniffing_helpers():
+    assert sniff_binary(b"\x89PNG\r\n\x1a\n....") == "png"
+    assert sniff_binary(b"<!doctype html><html>") is None
+    assert resolve_charset("text/html", b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">') == "shift_jis"
+    assert resolve_charset("text/html; charset=bogus", b"<p>") == "utf-8"
+
+
+FIXTURE_PAGES = PROJECT_ROOT / "benchmarks" / "fixtures" / "pages"
+
+
+def test_extract_main_text_skips_navigation_and_comments():
+    html = (FIXTURE_PAGES / "right_triangles_divs.html").read_bytes()
+
+    title, text = extract_main_text(html)
+
+    assert title == "Solving Right Triangles Step by Step"
+    assert text.startswith("Solving Right Triangles Step by Step\nStep 0:")
+    assert "Category 1" not in text
+    assert "Comment number" not in text
+
+
+def test_extract_main_text_keeps_positive_containers_with_negative_classes():
+    para = "<p>Sine, cosine and tangent relate the angles of a right triangle to its sides, step by step.</p>"
+    links = "".join(f'<li><a href="/t{i}">Tag {i}</a></li>' for i in range(30))
+    html = (
+        "<html><head><title>Post</title></head><body>"
+        f'<div class="post-content has-social-share">{para * 6}</div>'
+        f'<ul class="sidebar">{links}</ul>'
+        "</body></html>"
+    ).encode()
+
+    _, text = extract_main_text(html)
+
+    assert text.startswith("Sine, cosine and tangent")
+    assert "Tag 1" not in text
+
+
+def test_extract_main_text_gives_up_when_the_pick_is_a_small_part_of_the_page():
+    para = "<p>Sine, cosine and tangent relate the angles of a right triangle to its sides, step by step.</p>"
+    prose = "Pythagoras holds for every right triangle and lets you find a missing side. " * 40
+    html = (
+        "<html><body>"
+        f"<div>{para * 3}</div>"
+        f"<div>{prose}</div>"
+        "</body></html>"
+    ).encode()
+
+    _, text = extract_main_text(html)
+
+    assert text == ""
+
+
+def test_extract_main_text_caps_input_bytes():
+    html = (FIXTURE_PAGES / "trig_reference.html").read_bytes()
+
+    _, full = extract_main_text(html)
+    _, capped = extract_main_text(html, max_bytes=len(html) // 2)
+
+    assert 0 < len(capped) < len(full)
+
+
+def test_clean_html_falls_back_to_readability_when_no_main_content(monkeypatch):
+    calls = []
+    original = fetch_clean._readability_extract
+
+    def spy(html):
+        calls.append(html)
+        return original(html)
+
+    monkeypatch.setattr(fetch_clean, "_readability_extract", spy)
+
+    result = fetch_clean.clean_html(PAGE.decode("utf-8"), engine="lxml")
+    assert result["ok"] and "base case" in result["text"]
+    assert len(calls) == 1  # too little text for the lxml engine
+
+    calls.clear()
+    html = (FIXTURE_PAGES / "trig_basics.html").read_text(encoding="utf-8")
+    assert "SOH CAH TOA" in fetch_clean.clean_html(html, engine="lxml")["text"]
+    assert calls == []
+
+
+def test_parse_pool_parses_raw_bytes_in_worker_process():
+    pool = ParsePool(processes=1)
+    try:
+        pool.warm()
+        html = (FIXTURE_PAGES / "trig_basics.html").read_bytes()
+        result = pool.parse(html, "utf-8", timeout=30)
+    finally:
+        pool.shutdown()
+
+    assert result["ok"]
+    assert result["title"] == "Trigonometry Basics for Beginners"
+    assert "SOH CAH TOA" in result["text"]
+    assert result["language"] == "en"
+
+
+def test_fetch_and_clean_offloads_parsing_to_pool(fake_get, monkeypatch):
+    _, responses = fake_get
+    seen = {}
+
+    class FakePool:
+        def parse(self, body, encoding=None, content_language=None, timeout=None):
+            seen["body"] = body
+            return {"ok": True, "title": "t", "text": "parsed", "language": "en", "error": None}
+
+    monkeypatch.setattr(fetch_clean, "get_parse_pool", FakePool)
+    responses.append(FakeResponse())
+
+    result = fetch_clean.fetch_and_clean("https://example.com/r", cache=None)
+
+    assert result["text"] == "parsed"
+    assert seen["body"] == PAGE
+
+
+def test_normalize_language_reduces_tags_to_primary_subtag():
+    assert normalize_language("en-US") == "en"
+    assert normalize_language("hi_IN") == "hi"
+    assert normalize_language("ta, en;q=0.5") == "ta"
+    assert normalize_language("und") is None
+    assert normalize_language("not a tag") is None
+
+
+def test_detect_language_trusts_declared_hints():
+    html = '<!DOCTYPE html><html class="x" lang="bn-IN"><head></head></html>'
+    assert html_lang(html) == "bn-IN"
+    assert detect_language("This text is English.", hints=(html_lang(html), None)) == "bn"
+    assert detect_language("This text is English.", hints=(None, "mr")) == "mr"
+
+
+def test_detect_language_is_stable_and_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = [
+        "Recursion is when a function calls itself to solve smaller problems of the same kind.",
+        "La récursivité est une méthode où une fonction s'appelle elle-même pour résoudre un problème.",
+        "Die Rekursion ist eine Technik, bei der sich eine Funktion selbst aufruft, um Probleme zu lösen.",
+    ] * 10
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(detect_language, texts))
+
+    assert results == ["en", "fr", "de"] * 10
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,106 @@
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agents.content_scout import search_google
+from core.http_client import HttpClient
+
+
+@pytest.fixture
+def server():
+    state = {"hits": 0, "active": 0, "peak": 0, "lock": threading.Lock()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with state["lock"]:
+                state["hits"] += 1
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                hits = state["hits"]
+            if self.path == "/flaky" and hits == 1:
+                status = 503
+            else:
+                status = 200
+                time.sleep(0.05)
+            with state["lock"]:
+                state["active"] -= 1
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def do_POST(self):
+            with state["lock"]:
+                state["hits"] += 1
+                hits = state["hits"]
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = b'{"organic": []}'
+            self.send_response(429 if hits == 1 else 200)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", state
+    httpd.shutdown()
+
+
+def test_http_client_retries_5xx(server):
+    base, state = server
+    client = HttpClient(backoff_factor=0)
+    resp = client.get(f"{base}/flaky")
+    assert resp.status_code == 200
+    assert state["hits"] == 2
+
+
+def test_http_client_leaves_post_retries_to_the_caller(server):
+    base, state = server
+    client = HttpClient(backoff_factor=0)
+    resp = client.post(f"{base}/search", json={})
+    assert resp.status_code == 429
+    assert state["hits"] == 1
+
+
+def test_serper_search_retries_429_through_the_rate_limiter(server, monkeypatch):
+    base, state = server
+    acquired = []
+    limiter = search_google.get_rate_limiter("serper")
+    monkeypatch.setattr(limiter, "acquire", lambda *a, **k: acquired.append(1))
+    monkeypatch.setattr(search_google, "SERPER_ENDPOINT", f"{base}/search")
+
+    assert search_google.raw_web_search("python", api_key="key") == {"organic": []}
+    assert state["hits"] == 2
+    assert len(acquired) == 2
+
+
+def test_http_client_limits_concurrency_per_host(server):
+    base, state = server
+    client = HttpClient(per_host_limit=2)
+    threads = [
+        threading.Thread(target=client.get, args=(f"{base}/page",)) for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert state["hits"] == 6
+    assert state["peak"] <= 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
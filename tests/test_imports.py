@@ -0,0 +1,95 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.import_time import FORBIDDEN, import_once
+
+
+def _modules_after(statement: str) -> set:
+    code = f"{statement}; import sys; print('\\n'.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return set(proc.stdout.split())
+
+
+# Runs first in the child: serves every FORBIDDEN module (and ``google``
+# itself when no real namespace package exists) as a permissive stub and
+# records the import, so the check holds whether or not the SDKs are installed.
+_RECORD_SDK_IMPORTS = """
+import importlib.abc, importlib.machinery, sys, types
+FORBIDDEN = {forbidden!r}
+imported = []
+
+class _Stub(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return type(name, (), {{"__init__": lambda self, *a, **k: None}})
+
+class _Finder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path, target=None):
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN):
+            imported.append(name)
+        elif name != "google" or importlib.machinery.PathFinder.find_spec(name, path):
+            return None
+        return importlib.machinery.ModuleSpec(name, self, is_package=True)
+
+    def create_module(self, spec):
+        return _Stub(spec.name)
+
+    def exec_module(self, module):
+        module.__path__ = []
+
+sys.meta_path.insert(0, _Finder())
+"""
+
+
+def _sdk_imports_during(statement: str) -> list:
+    code = _RECORD_SDK_IMPORTS.format(forbidden=FORBIDDEN) + f"{statement}\nprint('\\n'.join(imported))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return proc.stdout.split()
+
+
+def test_entry_points_do_not_import_optional_sdks():
+    assert _sdk_imports_during("import app.server, agents.content_scout") == []
+
+
+def test_sdk_import_guard_catches_eager_imports():
+    assert _sdk_imports_during("from google.adk.agents import Agent") == ["google.adk", "google.adk.agents"]
+    assert _sdk_imports_during("import google.genai") == ["google.genai"]
+
+
+def test_config_import_does_not_pull_in_the_llm_stack():
+    loaded = _modules_after("import core.config")
+    assert "core.llm" not in loaded
+    assert "asyncio" not in loaded
+
+
+def test_adk_agent_is_resolved_lazily():
+    import agents.content_scout as content_scout
+    from agents.content_scout import scout
+
+    # None without google-adk, an Agent with it; either way, no import-time build.
+    assert content_scout.content_scout_adk_agent is scout.content_scout_adk_agent
+    with pytest.raises(AttributeError):
+        scout.not_a_real_attribute
+
+
+def test_importtime_report_covers_the_module_subtree():
+    timings = import_once("core.config")
+    assert timings["core.config"]["cumulative_us"] > 0
+    assert "dotenv" in timings
+    assert "site" not in timings
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,287 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core import llm
+from core.cache import LRUCache, TieredCache
+from core.config import Config
+from core.json_stream import IncrementalJSONParser
+from core.llm import (
+    LLMInterface,
+    acall_llm_json,
+    call_llm_json,
+    get_llm,
+    llm_cache_stats,
+    set_llm,
+    set_llm_cache,
+    stream_llm_json,
+)
+from core.ratelimit import RateLimitTimeout
+from core.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    breaker_states,
+    call_with_retry,
+    reset_breakers,
+)
+
+
+class FakeLLM(LLMInterface):
+    def __init__(self):
+        self.prompts = []
+
+    def call_json(self, prompt, model=None):
+        self.prompts.append(prompt)
+        return {"echo": prompt, "model": model}
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(Config, "LLM_RETRY_BASE_DELAY", 0.0)
+    fake = FakeLLM()
+    set_llm(fake)
+    set_llm_cache(TieredCache(LRUCache(max_entries=16)))
+    yield fake
+    set_llm(None)
+    set_llm_cache(None)
+    reset_breakers()
+
+
+def test_call_llm_json_reuses_process_wide_backend(fake_llm):
+    assert call_llm_json("one") == {"echo": "one", "model": None}
+    assert call_llm_json("two", model="m") == {"echo": "two", "model": "m"}
+    assert get_llm() is fake_llm
+    assert fake_llm.prompts == ["one", "two"]
+
+
+def test_acall_llm_json_falls_back_to_thread_for_sync_backends(fake_llm):
+    result = asyncio.run(acall_llm_json("async prompt"))
+    assert result == {"echo": "async prompt", "model": None}
+
+
+def test_call_llm_json_serves_repeat_prompts_from_cache(fake_llm):
+    first = call_llm_json("same prompt")
+    first["echo"] = "mutated by caller"
+    second = call_llm_json("same prompt")
+
+    assert second == {"echo": "same prompt", "model": None}
+    assert fake_llm.prompts == ["same prompt"]
+    assert llm_cache_stats()["memory"]["hits"] == 1
+
+    call_llm_json("same prompt", model="other-model")
+    assert len(fake_llm.prompts) == 2
+
+
+def test_failed_calls_are_not_cached(fake_llm):
+    class Boom(LLMInterface):
+        def call_json(self, prompt, model=None):
+            raise RuntimeError("503")
+
+    set_llm(Boom())
+    stub = call_llm_json("prompt")
+    assert stub["short_summary"] == "TODO"
+    assert len(llm.get_llm_cache().memory) == 0
+
+
+def test_transient_failure_is_retried_and_does_not_disable_the_backend(fake_llm):
+    class Flaky(LLMInterface):
+        def __init__(self):
+            self.calls = 0
+
+        def call_json(self, prompt, model=None):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("503")
+            return {"ok": prompt}
+
+    flaky = Flaky()
+    set_llm(flaky)
+    assert call_llm_json("a") == {"ok": "a"}
+    assert call_llm_json("b") == {"ok": "b"}
+    assert flaky.calls == 3
+    (state,) = breaker_states().values()
+    assert state["state"] == CLOSED
+
+
+class _HTTPError(Exception):
+    def __init__(self, code):
+        super().__init__(str(code))
+        self.code = code
+
+
+@pytest.mark.parametrize(
+    "error, calls", [(ValueError("bad JSON"), 1), (_HTTPError(400), 1), (_HTTPError(429), 3)]
+)
+def test_only_transient_errors_are_retried_and_counted(error, calls):
+    breaker = CircuitBreaker("test", min_calls=10)
+    seen = []
+
+    def fn():
+        seen.append(1)
+        raise error
+
+    with pytest.raises(type(error)):
+        call_with_retry(fn, breaker=breaker, attempts=3, sleep=lambda s: None)
+
+    assert len(seen) == calls
+    assert breaker.snapshot()["failures"] == (calls if calls > 1 else 0)
+
+
+def test_gemini_request_is_bounded_by_the_remaining_deadline(monkeypatch):
+    requests = []
+
+    class Models:
+        def generate_content(self, model, contents, **options):
+            requests.append(options)
+            return type("Response", (), {"text": '{"ok": true}', "usage_metadata": None})()
+
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "key")
+    monkeypatch.setattr(Config, "LLM_TIMEOUT", 5.0)
+    backend = llm.GeminiLLM()
+    backend._client = type("Client", (), {"models": Models()})()
+    set_llm(backend)
+    set_llm_cache(None)
+    try:
+        assert call_llm_json("prompt") == {"ok": True}
+    finally:
+        set_llm(None)
+        reset_breakers()
+
+    timeout_ms = requests[0]["config"]["http_options"]["timeout"]
+    assert 4000 < timeout_ms <= 5000
+
+
+def test_circuit_breaker_opens_on_error_rate_and_recovers_after_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "test", failure_rate=0.5, min_calls=4, window=60, recovery_timeout=30, clock=lambda: now[0]
+    )
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record_success() if ok else breaker.record_failure(RuntimeError("503"))
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    now[0] = 31.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # a single probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 62.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["calls"] == 0
+
+
+def test_half_open_probe_is_released_when_it_ends_without_an_outcome(fake_llm):
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "probe", failure_rate=0.5, min_calls=1, window=60, recovery_timeout=30, clock=lambda: now[0]
+    )
+    breaker.record_failure()
+    now[0] = 31.0
+
+    def out_of_quota():
+        raise RateLimitTimeout("quota")
+
+    with pytest.raises(RateLimitTimeout):
+        call_with_retry(out_of_quota, breaker=breaker)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()  # the slot came back
+
+    # A probe whose caller vanished is reclaimed after recovery_timeout.
+    assert not breaker.allow()
+    now[0] = 62.0
+    assert breaker.allow()
+
+
+def test_closed_stream_releases_its_probe_and_deadlines_are_not_failures(fake_llm, monkeypatch):
+    class SlowStream(LLMInterface):
+        def stream_text(self, prompt, model=None):
+            yield '{"explanation": "hi",'
+            if prompt == "quota":
+                raise RateLimitTimeout("quota")
+            yield ' "n": 1}'
+
+    set_llm(SlowStream())
+    breaker = llm._breaker(None)
+    monkeypatch.setattr(breaker, "_state", HALF_OPEN)
+
+    stream = stream_llm_json("prompt")
+    next(stream)
+    stream.close()  # GeneratorExit inside the probe
+    assert breaker.allow()
+    breaker.release()
+
+    events = list(stream_llm_json("quota"))
+    assert events[-1]["value"]["short_summary"] == "TODO"
+    assert breaker.state == HALF_OPEN and breaker.snapshot()["failures"] == 0
+    assert breaker.allow()
+
+
+def test_clean_json_text_strips_markdown_fences():
+    assert llm._clean_json_text('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+
+
+def test_incremental_parser_emits_fields_and_items_across_chunk_boundaries():
+    raw = '```json\n{"explanation": "a, \\"b\\" [c]", "step_by_step": ["one", "two, three"], "n": 2}\n```'
+    parser = IncrementalJSONParser()
+    events = []
+    for i in range(0, len(raw), 3):
+        events.extend(parser.feed(raw[i : i + 3]))
+
+    assert parser.done
+    assert parser.result == {"explanation": 'a, "b" [c]', "step_by_step": ["one", "two, three"], "n": 2}
+    assert [(e["type"], e["key"], e.get("index")) for e in events] == [
+        ("field", "explanation", None),
+        ("item", "step_by_step", 0),
+        ("item", "step_by_step", 1),
+        ("field", "step_by_step", None),
+        ("field", "n", None),
+    ]
+
+
+def test_stream_llm_json_yields_events_before_the_response_completes(fake_llm):
+    class StreamingLLM(LLMInterface):
+        def __init__(self):
+            self.calls = 0
+            self.sent = []
+
+        def stream_text(self, prompt, model=None):
+            self.calls += 1
+            for chunk in ['{"explanation": "hi",', ' "step_by_step": ["a",', ' "b"]}']:
+                self.sent.append(chunk)
+                yield chunk
+
+    backend = StreamingLLM()
+    set_llm(backend)
+    stream = stream_llm_json("prompt")
+
+    first = next(stream)
+    assert first == {"type": "field", "key": "explanation", "value": "hi"}
+    assert len(backend.sent) == 1
+
+    rest = list(stream)
+    assert rest[-1] == {"type": "done", "value": {"explanation": "hi", "step_by_step": ["a", "b"]}}
+
+    # A repeat is replayed from the response cache as the same event shape.
+    replay = list(stream_llm_json("prompt"))
+    assert backend.calls == 1
+    assert replay == [first] + rest
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,62 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.metrics import Registry, STAGE_ERRORS, STAGE_SECONDS, timed, timed_iter
+
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    registry = Registry()
+    hist = registry.histogram("stage_seconds", "Stage latency.", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="fetch")
+    hist.observe(0.5, stage="fetch")
+    hist.observe(5.0, stage="fetch")
+
+    text = registry.render()
+
+    assert "# TYPE stage_seconds histogram" in text
+    assert 'stage_seconds_bucket{stage="fetch",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="fetch",le="1"} 2' in text
+    assert 'stage_seconds_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="fetch"} 3' in text
+
+
+def test_timed_records_latency_and_errors():
+    before = STAGE_SECONDS.count(stage="test_stage", host="h")
+    errors_before = STAGE_ERRORS.value(stage="test_stage", host="h")
+
+    with timed("test_stage", host="h"):
+        pass
+    with pytest.raises(ValueError):
+        with timed("test_stage", host="h"):
+            raise ValueError("boom")
+
+    assert STAGE_SECONDS.count(stage="test_stage", host="h") == before + 2
+    assert STAGE_ERRORS.value(stage="test_stage", host="h") == errors_before + 1
+
+
+def test_timed_iter_times_the_producer_and_ignores_an_early_close():
+    def produce():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    before = STAGE_SECONDS.total(stage="iter_stage")
+    items = timed_iter(produce(), "iter_stage")
+    assert next(items) == 0
+    time.sleep(0.2)  # consumer time is not the provider's
+    items.close()  # e.g. a client disconnect
+
+    assert STAGE_ERRORS.value(stage="iter_stage") == 0
+    assert STAGE_SECONDS.count(stage="iter_stage") == 1
+    assert STAGE_SECONDS.total(stage="iter_stage") - before < 0.1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import prefetch
+from app.prefetch import DONE, FAILED, QUEUED, JobQueue, PrefetchRunner, enqueue_topics
+from agents.content_scout.query_cache import QueryCache, get_query_cache, query_key, set_query_cache
+from agents.content_scout.scout import content_scout_agent
+from core.cache import LRUCache, TieredCache
+from core.config import Config
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    yield q
+    q.close()
+
+
+def test_job_queue_dedupes_retries_and_requeues_stale_jobs(queue, monkeypatch):
+    monkeypatch.setattr(Config, "PREFETCH_MAX_ATTEMPTS", 2)
+    assert enqueue_topics(queue, {"hi": {"beginner": ["trigonometry", "trigonometry"]}}) == 2
+    assert queue.counts() == {QUEUED: 1}
+
+    job = queue.claim()
+    assert (job["topic"], job["language"], job["level"]) == ("trigonometry", "hi", "beginner")
+    queue.enqueue("trigonometry", "hi", "beginner")  # running: left alone
+    assert queue.claim() is None
+
+    queue.fail(job["id"], "503")
+    assert queue.counts() == {QUEUED: 1}
+    assert queue.claim() is None  # backing off
+
+    queue._conn.execute("UPDATE jobs SET not_before = 0")
+    queue.fail(queue.claim()["id"], "503")
+    assert queue.counts() == {FAILED: 1}
+
+    queue.enqueue("trigonometry", "hi", "beginner")
+    queue.complete(queue.claim()["id"])
+    assert queue.requeue_stale(max_age=3600) == 0
+    assert queue.requeue_stale(max_age=-1) == 1
+    assert queue.counts() == {QUEUED: 1}
+
+
+def test_runner_stores_both_search_and_enriched_results_for_the_request_path(queue, monkeypatch):
+    set_query_cache(QueryCache(TieredCache(LRUCache(max_entries=16))))
+    search = [{"title": "T", "url": "https://a.com"}]
+    enriched = [{"title": "T", "url": "https://a.com", "short_summary": "s", "raw_text": "text"}]
+    monkeypatch.setattr(
+        prefetch, "compute_job", lambda job: {"search": search, "enriched": enriched, "translated": 1}
+    )
+    queue.enqueue("Trigonometry", "hi", "beginner", num_results=8)
+
+    try:
+        assert PrefetchRunner(queue, processes=0).run_once() == 1
+        assert queue.counts() == {DONE: 1}
+
+        def no_search(*args, **kwargs):
+            raise AssertionError("should be served from the prefetched cache")
+
+        monkeypatch.setattr("agents.content_scout.scout.search_resources", no_search)
+        got = content_scout_agent("trigonometry", language="hi", level="beginner", enrich=True)
+        assert got[0].short_summary == "s"
+        key = query_key("trigonometry", "hi", "beginner", 8, True, False)
+        assert get_query_cache().cache.get("scout:" + key)[0]["short_summary"] is None
+    finally:
+        set_query_cache(None)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
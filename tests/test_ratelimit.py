@@ -0,0 +1,153 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.ratelimit import (
+    BACKGROUND,
+    ENRICH,
+    INTERACTIVE,
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    bind_priority,
+    current_priority,
+    priority_scope,
+)
+from core.resilience import deadline_scope, time_left
+
+
+def test_token_bucket_refills_at_rate_and_caps_oversized_requests():
+    now = [0.0]
+    bucket = TokenBucket(60, capacity=10, clock=lambda: now[0])
+
+    bucket.take(10)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    now[0] = 3.0
+    assert bucket.wait_time(3) == 0
+    # Asking for more than the bucket can ever hold waits for a full bucket.
+    assert bucket.wait_time(50) == pytest.approx(7.0)
+
+    bucket.debit(20)
+    assert bucket.level == pytest.approx(-17.0)
+
+
+def test_interactive_waiters_are_served_before_earlier_background_ones():
+    limiter = RateLimiter("test", requests_per_min=600)
+    limiter.requests.debit(limiter.requests.capacity)  # start empty: one slot per 0.1s
+    order = []
+
+    def waiter(name, priority):
+        limiter.acquire(priority=priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=waiter, args=("background", BACKGROUND))]
+    threads[0].start()
+    time.sleep(0.02)
+    threads.append(threading.Thread(target=waiter, args=("interactive", INTERACTIVE)))
+    threads[1].start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert order == ["interactive", "background"]
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_acquire_gives_up_at_the_callers_deadline():
+    limiter = RateLimiter("test", requests_per_min=1)
+    limiter.acquire()
+
+    with deadline_scope(0.05), pytest.raises(RateLimitTimeout):
+        limiter.acquire()
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_background_callers_only_get_their_share_of_the_quota():
+    limiter = RateLimiter("test", requests_per_min=4, background_share=0.5)
+    limiter.acquire(priority=BACKGROUND)
+    limiter.acquire(priority=BACKGROUND)
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(priority=BACKGROUND, timeout=0.05)
+    # Interactive traffic still has the rest of the minute's quota.
+    limiter.acquire(priority=INTERACTIVE, timeout=0.05)
+    limiter.acquire(priority=INTERACTIVE, timeout=0.05)
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_aacquire_waits_on_the_event_loop_in_the_shared_queue(monkeypatch):
+    limiter = RateLimiter("test", requests_per_min=600)
+    limiter.requests.debit(limiter.requests.capacity)  # start empty: one slot per 0.1s
+    order = []
+
+    def no_threads(*args, **kwargs):
+        raise AssertionError("aacquire must not wait on a worker thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", no_threads)
+
+    def background():
+        limiter.acquire(priority=BACKGROUND)
+        order.append("thread")
+
+    async def main():
+        thread = threading.Thread(target=background)
+        thread.start()
+        await asyncio.sleep(0.02)
+        # Interactive coroutines overtake the queued background thread.
+        await asyncio.gather(*(limiter.aacquire(priority=INTERACTIVE) for _ in range(2)))
+        order.append("coroutines")
+        thread.join(timeout=5)
+
+    asyncio.run(main())
+    assert order == ["coroutines", "thread"]
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_aacquire_gives_up_at_the_timeout():
+    limiter = RateLimiter("test", requests_per_min=1)
+    limiter.acquire()
+
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(limiter.aacquire(timeout=0.05))
+    assert limiter.snapshot()["waiting"] == 0
+
+
+def test_nested_pools_keep_the_enclosing_deadline():
+    def inner(_):
+        return time_left()
+
+    def outer(_):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return list(pool.map(bind_priority(inner), range(2)))
+
+    with deadline_scope(5), ThreadPoolExecutor(max_workers=2) as pool:
+        lefts = [left for row in pool.map(bind_priority(outer), range(2)) for left in row]
+
+    assert len(lefts) == 4
+    assert all(left is not None and 0 < left <= 5 for left in lefts)
+
+
+def test_priority_scopes_only_lower_urgency_and_follow_work_into_threads():
+    seen = []
+    with priority_scope(BACKGROUND):
+        with priority_scope(ENRICH):
+            assert current_priority() == BACKGROUND
+        task = bind_priority(lambda: seen.append(current_priority()))
+    t = threading.Thread(target=task)
+    t.start()
+    t.join()
+
+    assert seen == [BACKGROUND]
+    assert current_priority() == INTERACTIVE
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,108 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.testclient import TestClient
+
+from app import server
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_search_stream_forwards_scout_events_as_sse(monkeypatch):
+    seen = {}
+
+    def fake_iter(**kwargs):
+        seen.update(kwargs)
+        yield "results", {"resources": [{"url": "https://a.com"}]}
+        yield "resource", {"index": 0, "resource": {"url": "https://a.com", "short_summary": "s"}}
+        yield "done", {"count": 1}
+
+    monkeypatch.setattr(server, "iter_content_scout", fake_iter)
+    client = TestClient(server.app)
+
+    resp = client.get("/api/search/stream", params={"query": "recursion", "language": "hi"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert seen["topic"] == "recursion"
+    assert seen["language"] == "hi"
+    assert [event for event, _ in _parse_sse(resp.text)] == ["results", "resource", "done"]
+
+
+def test_search_stream_queues_the_query_for_retrieval_indexing(monkeypatch, tmp_path):
+    from app.prefetch import RUNNING, JobQueue, set_job_queue
+    from core.config import Config
+
+    def fake_iter(**kwargs):
+        yield "done", {"count": 0}
+
+    monkeypatch.setattr(server, "iter_content_scout", fake_iter)
+    monkeypatch.setattr(Config, "RAG_INDEX_PATH", str(tmp_path / "index"))
+    queue = JobQueue(str(tmp_path / "queue.sqlite3"))
+    set_job_queue(queue)
+    client = TestClient(server.app)
+    try:
+        for _ in range(2):
+            client.get("/api/search/stream", params={"query": "recursion", "language": "hi"})
+        job = queue.claim()
+    finally:
+        set_job_queue(None)
+
+    assert (job["topic"], job["language"], job["num_results"]) == ("recursion", "hi", 8)
+    assert queue.claim() is None  # asked twice, queued once
+    assert queue.counts() == {RUNNING: 1}
+
+
+def test_simplify_stream_forwards_fields_and_items(monkeypatch):
+    from agents.translator_simplifier import SimplifiedContent
+
+    def fake_stream(text, target_language, level, topic):
+        yield {"type": "field", "key": "explanation", "value": "x"}
+        yield {"type": "item", "key": "step_by_step", "index": 0, "value": "s1"}
+        yield {
+            "type": "done",
+            "value": SimplifiedContent(
+                explanation="x", analogy=None, step_by_step=["s1"], keywords=[],
+                language=target_language, level=level,
+            ),
+        }
+
+    monkeypatch.setattr(server, "translate_and_simplify_stream", fake_stream)
+    client = TestClient(server.app)
+
+    resp = client.post("/api/simplify/stream", json={"text": "sine", "target_language": "ta"})
+
+    events = _parse_sse(resp.text)
+    assert [event for event, _ in events] == ["field", "item", "done"]
+    assert events[1][1]["value"] == "s1"
+    assert events[2][1]["language"] == "ta"
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    from core.metrics import timed
+
+    with timed("search", host="google.serper.dev"):
+        pass
+
+    resp = TestClient(server.app).get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'learning_helper_stage_seconds_count{stage="search",host="google.serper.dev",model=""}' in resp.text
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
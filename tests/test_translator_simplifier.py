@@ -7,7 +7,11 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from agents.translator_simplifier.translate import translate_and_simplify
+from agents.translator_simplifier.translate import (
+    translate_and_simplify,
+    translate_and_simplify_stream,
+    translate_many,
+)
 
 
 def test_translate_and_simplify_uses_call_fn():
@@ -66,5 +70,75 @@ def test_translate_and_simplify_empty_text_returns_empty_fields():
     assert result.keywords == []
 
 
+
+def test_translate_and_simplify_stream_normalizes_final_result():
+    def fake_stream(prompt):
+        assert "TARGET LANGUAGE: ta" in prompt
+        yield {"type": "field", "key": "explanation", "value": " e "}
+        yield {"type": "done", "value": {"explanation": " e ", "step_by_step": "a\nb"}}
+
+    events = list(translate_and_simplify_stream("text", target_language="ta", stream_fn=fake_stream))
+
+    assert events[0]["key"] == "explanation"
+    final = events[-1]["value"]
+    assert final.explanation == "e"
+    assert final.step_by_step == ["a", "b"]
+    assert final.language == "ta"
+
+
+
+def test_translate_many_groups_targets_and_retries_missing_ones_individually():
+    prompts = []
+
+    def fake_call(prompt, model=None):
+        prompts.append(prompt)
+        if "TARGETS:" in prompt:
+            # Answer every target but the last one in each group.
+            import re
+
+            found = re.findall(r"TARGET \[(\d+)\]: language=(\S+), level=(\S+)", prompt)
+            return {
+                "results": [
+                    {"target": int(i), "explanation": f"{lang}-{lvl}", "step_by_step": ["s"]}
+                    for i, lang, lvl in found[:-1]
+                ]
+            }
+        return {"explanation": "single", "step_by_step": []}
+
+    targets = [(lang, lvl) for lang in ("hi", "ta", "bn") for lvl in ("school", "college")]
+    out = translate_many(
+        "source text", targets + [("hi", "school")], topic="Trig", token_budget=2000, call_fn=fake_call
+    )
+
+    assert list(out) == targets  # order kept, duplicates dropped
+    multi = [p for p in prompts if "TARGETS:" in p]
+    assert len(multi) == 3  # budget fits two targets per call
+    assert all(p.count("source text") == 1 for p in multi)
+    assert out[("hi", "school")].explanation == "hi-school"
+    assert out[("hi", "college")].explanation == "single"
+    assert out[("hi", "college")].language == "hi"
+    assert out[("ta", "college")].level == "college"
+    assert len(prompts) == 6
+
+
+def test_translate_many_accepts_bracketed_target_numbers():
+    prompts = []
+
+    def fake_call(prompt, model=None):
+        prompts.append(prompt)
+        return {
+            "results": [
+                {"target": "[0]", "explanation": "hi text"},
+                {"target": "TARGET [1]", "explanation": "ta text"},
+            ]
+        }
+
+    out = translate_many("source text", [("hi", "school"), ("ta", "school")], call_fn=fake_call)
+
+    assert out[("hi", "school")].explanation == "hi text"
+    assert out[("ta", "school")].explanation == "ta text"
+    assert len(prompts) == 1
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__]))